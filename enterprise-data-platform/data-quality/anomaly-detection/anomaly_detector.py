@@ -9,16 +9,25 @@ Statistical anomaly detection with three tiers:
 Author: Godson Kurishinkal
 """
 
-from dataclasses import dataclass, field
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Union
 import logging
+import os
 
 import polars as pl
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 class AnomalyType(Enum):
     """Types of anomalies detected."""
@@ -37,7 +46,108 @@ class AnomalySeverity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Health score penalty per anomaly, by severity
+SEVERITY_WEIGHTS: Dict[AnomalySeverity, int] = {
+    AnomalySeverity.LOW: 1,
+    AnomalySeverity.MEDIUM: 5,
+    AnomalySeverity.HIGH: 15,
+    AnomalySeverity.CRITICAL: 50,
+}
+
+
+if NUMBA_AVAILABLE:
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _zscore_outlier_count(x, mean, std, threshold):
+        """Single pass over x returning (outlier count, max |z|)."""
+        count = 0
+        max_z = 0.0
+        for i in prange(x.shape[0]):
+            z = abs((x[i] - mean) / std)
+            if z > threshold:
+                count += 1
+            max_z = max(max_z, z)
+        return count, max_z
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mad_outlier_count(x, median, mad, threshold):
+        """Single pass over x counting |modified z| above threshold."""
+        cutoff = threshold * mad / 0.6745
+        count = 0
+        for i in prange(x.shape[0]):
+            if abs(x[i] - median) > cutoff:
+                count += 1
+        return count
+    
+    @njit(cache=True)
+    def _median(x):
+        """Median via np.partition (x must be non-empty)."""
+        n = x.shape[0]
+        half = n // 2
+        part = np.partition(x, half)
+        if n % 2:
+            return part[half]
+        return 0.5 * (part[half] + part[:half].max())
+    
+    @njit(cache=True)
+    def _median_abs_deviation(x):
+        """Return (median, MAD) using one scratch buffer for deviations."""
+        median = _median(x)
+        return median, _median(np.abs(x - median))
+    
+    @njit(fastmath=True, cache=True)
+    def _rolling_z_outliers(x, window, threshold, out_mask):
+        """
+        Flag values deviating from the previous `window` values by more
+        than threshold sample standard deviations.
+        
+        Keeps a running sum and sum of squares over a ring buffer, so the
+        whole series is scanned once in O(n).
+        """
+        buffer = np.empty(window)
+        total = 0.0
+        total_sq = 0.0
+        for i in range(x.shape[0]):
+            out_mask[i] = False
+            slot = i % window
+            if i >= window:
+                mean = total / window
+                var = (total_sq - total * mean) / (window - 1)
+                if var > 0.0:
+                    out_mask[i] = abs(x[i] - mean) / np.sqrt(var) > threshold
+                old = buffer[slot]
+                total -= old
+                total_sq -= old * old
+            buffer[slot] = x[i]
+            total += x[i]
+            total_sq += x[i] * x[i]
+
+
+def _stat_key(column: str, name: str) -> str:
+    """Alias for a per-column statistic in a fused aggregation."""
+    return f"{column}__{name}"
+
+
+def _map_tasks(func: Callable[[Any], List["Anomaly"]], tasks: List[Any]) -> List["Anomaly"]:
+    """
+    Apply func to each task and flatten the resulting anomaly lists.
+    
+    Multiple tasks run on a thread pool: Polars queries release the GIL,
+    so independent columns are processed concurrently. func must not
+    launch numba kernels, whose parallel loops hang at exit when started
+    from worker threads.
+    """
+    if len(tasks) <= 1:
+        results = [func(task) for task in tasks]
+    else:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(func, tasks))
+    
+    return [anomaly for result in results for anomaly in result]
+
+
+@dataclass(slots=True, frozen=True)
 class Anomaly:
     """Represents a single detected anomaly."""
     anomaly_id: str
@@ -51,10 +161,10 @@ class Anomaly:
     deviation_score: float = 0.0
     affected_records: int = 0
     sample_records: Optional[List[Dict]] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AnomalyReport:
     """Complete anomaly detection report."""
     table_name: str
@@ -65,6 +175,38 @@ class AnomalyReport:
     anomalies_by_severity: Dict[AnomalySeverity, int]
     anomalies: List[Anomaly]
     health_score: float  # 0-100
+    
+    def to_polars(self) -> pl.DataFrame:
+        """
+        Anomalies as a columnar DataFrame, one row per anomaly.
+        
+        Example:
+            report.to_polars().group_by("severity").len()
+            report.to_polars().write_parquet("anomalies.parquet")
+        """
+        anomalies = self.anomalies
+        return pl.DataFrame(
+            {
+                "anomaly_id": [a.anomaly_id for a in anomalies],
+                "anomaly_type": [a.anomaly_type.value for a in anomalies],
+                "severity": [a.severity.value for a in anomalies],
+                "column": [a.column for a in anomalies],
+                "detected_at": [a.detected_at for a in anomalies],
+                "description": [a.description for a in anomalies],
+                "affected_records": [a.affected_records for a in anomalies],
+                "deviation_score": [float(a.deviation_score) for a in anomalies],
+            },
+            schema={
+                "anomaly_id": pl.Utf8,
+                "anomaly_type": pl.Utf8,
+                "severity": pl.Utf8,
+                "column": pl.Utf8,
+                "detected_at": pl.Datetime("us"),
+                "description": pl.Utf8,
+                "affected_records": pl.Int64,
+                "deviation_score": pl.Float64,
+            },
+        )
 
 
 class TierOneValidator:
@@ -81,21 +223,22 @@ class TierOneValidator:
     def __init__(self, table_name: str):
         self.table_name = table_name
         self.logger = logging.getLogger(f"anomaly.tier1.{table_name}")
-        self.rules: Dict[str, Callable] = {}
+        self.rules: Dict[str, Tuple[str, tuple]] = {}
+        self.rule_exprs: Dict[str, Tuple[pl.Expr, str]] = {}
     
     def add_required_columns(self, columns: List[str]) -> "TierOneValidator":
         """Add required column check."""
-        self.rules["required_columns"] = lambda df: self._check_required(df, columns)
+        self.rules["required_columns"] = ("_check_required", (columns,))
         return self
     
     def add_positive_check(self, columns: List[str]) -> "TierOneValidator":
         """Add positive value check for numeric columns."""
-        self.rules["positive_values"] = lambda df: self._check_positive(df, columns)
+        self.rules["positive_values"] = ("_check_positive", (columns,))
         return self
     
     def add_non_future_date(self, columns: List[str]) -> "TierOneValidator":
         """Ensure date columns are not in the future."""
-        self.rules["non_future_dates"] = lambda df: self._check_non_future(df, columns)
+        self.rules["non_future_dates"] = ("_check_non_future", (columns,))
         return self
     
     def add_business_rule(
@@ -105,45 +248,97 @@ class TierOneValidator:
         description: str = "",
     ) -> "TierOneValidator":
         """Add custom business rule."""
-        self.rules[name] = lambda df: self._check_custom(df, condition, name, description)
+        self.rules[name] = ("_check_custom", (condition, name, description))
+        return self
+    
+    def add_business_rule_expr(
+        self, 
+        name: str, 
+        expr: pl.Expr,
+        description: str = "",
+    ) -> "TierOneValidator":
+        """
+        Add custom business rule as a Polars expression.
+        
+        The expression must evaluate to True for valid rows. All expression
+        rules are evaluated together in a single aggregation, unlike
+        callable rules which run one at a time.
+        
+        Example:
+            validator.add_business_rule_expr(
+                "ship_after_order", pl.col("ship_date") >= pl.col("order_date")
+            )
+        """
+        self.rule_exprs[name] = (expr, description)
         return self
     
-    def detect(self, df: pl.DataFrame) -> List[Anomaly]:
+    def missing_columns(self, schema: pl.Schema) -> List[str]:
+        """Required columns absent from the schema, in configuration order."""
+        _, (columns,) = self.rules.get("required_columns", (None, ([],)))
+        return [col for col in dict.fromkeys(columns) if col not in schema]
+    
+    def detect(
+        self, 
+        df: pl.DataFrame,
+        detected_at: Optional[datetime] = None,
+    ) -> List[Anomaly]:
         """Run all Tier 1 checks and return anomalies."""
         anomalies = []
+        detected_at = detected_at or datetime.utcnow()
         
-        for rule_name, check_func in self.rules.items():
+        # Rules are stored as (method name, args) and dispatched directly
+        for rule_name, (method, args) in self.rules.items():
             try:
-                rule_anomalies = check_func(df)
+                rule_anomalies = getattr(self, method)(df, *args, detected_at)
                 anomalies.extend(rule_anomalies)
             except Exception as e:
                 self.logger.error(f"Rule {rule_name} failed: {str(e)}")
         
+        if self.rule_exprs:
+            anomalies.extend(self._check_custom_exprs(df, detected_at))
+        
         return anomalies
     
-    def _check_required(self, df: pl.DataFrame, columns: List[str]) -> List[Anomaly]:
+    def _check_required(
+        self, 
+        df: pl.DataFrame, 
+        columns: List[str],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Check for null values in required columns."""
         anomalies = []
+        n = df.height
+        schema = df.schema
+        
+        # Null counts for every present column in one aggregation
+        present = list(dict.fromkeys(col for col in columns if col in schema))
+        null_counts = (
+            df.lazy()
+            .select([pl.col(col).null_count() for col in present])
+            .collect()
+            .row(0, named=True)
+        ) if present else {}
         
         for col in columns:
-            if col not in df.columns:
+            if col not in schema:
                 anomalies.append(Anomaly(
                     anomaly_id=f"validation_{col}_missing",
                     anomaly_type=AnomalyType.VALIDATION,
                     severity=AnomalySeverity.CRITICAL,
                     column=col,
-                    detected_at=datetime.utcnow(),
+                    detected_at=detected_at,
                     description=f"Required column '{col}' is missing from data",
                     value=None,
-                    affected_records=len(df),
+                    affected_records=n,
                 ))
                 continue
             
-            null_count = df[col].null_count()
+            null_count = null_counts[col]
             if null_count > 0:
+                null_pct = null_count / n
                 severity = (
-                    AnomalySeverity.CRITICAL if null_count / len(df) > 0.1
-                    else AnomalySeverity.HIGH if null_count / len(df) > 0.01
+                    AnomalySeverity.CRITICAL if null_pct > 0.1
+                    else AnomalySeverity.HIGH if null_pct > 0.01
                     else AnomalySeverity.MEDIUM
                 )
                 
@@ -152,57 +347,99 @@ class TierOneValidator:
                     anomaly_type=AnomalyType.VALIDATION,
                     severity=severity,
                     column=col,
-                    detected_at=datetime.utcnow(),
-                    description=f"Required column '{col}' has {null_count} null values ({null_count/len(df):.2%})",
+                    detected_at=detected_at,
+                    description=f"Required column '{col}' has {null_count} null values ({null_pct:.2%})",
                     value=null_count,
                     affected_records=null_count,
                 ))
         
         return anomalies
     
-    def _check_positive(self, df: pl.DataFrame, columns: List[str]) -> List[Anomaly]:
+    def _check_positive(
+        self, 
+        df: pl.DataFrame, 
+        columns: List[str],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Check for non-positive values."""
         anomalies = []
         
-        for col in columns:
-            if col not in df.columns:
-                continue
-            
-            negative_count = (df[col] < 0).sum()
+        # Negative counts for every present column in one aggregation
+        present = list(dict.fromkeys(col for col in columns if col in df.columns))
+        negative_counts = (
+            df.lazy()
+            .select([(pl.col(col) < 0).sum().alias(col) for col in present])
+            .collect()
+            .row(0, named=True)
+        ) if present else {}
+        
+        for col in present:
+            negative_count = negative_counts[col]
             if negative_count > 0:
-                samples = df.filter(pl.col(col) < 0)[col].head(5).to_list()
+                # One short-circuited plan for both the first value and the samples
+                samples = (
+                    df.lazy()
+                    .filter(pl.col(col) < 0)
+                    .select(pl.col(col))
+                    .head(5)
+                    .collect()
+                )
                 
                 anomalies.append(Anomaly(
                     anomaly_id=f"validation_{col}_negative",
                     anomaly_type=AnomalyType.VALIDATION,
                     severity=AnomalySeverity.HIGH,
                     column=col,
-                    detected_at=datetime.utcnow(),
+                    detected_at=detected_at,
                     description=f"Column '{col}' has {negative_count} negative values",
-                    value=samples[0] if samples else None,
+                    value=samples.item(0, 0),
                     affected_records=negative_count,
-                    metadata={"sample_values": samples},
+                    metadata={"sample_values": samples.to_series().to_list()},
                 ))
         
         return anomalies
     
-    def _check_non_future(self, df: pl.DataFrame, columns: List[str]) -> List[Anomaly]:
+    def _check_non_future(
+        self, 
+        df: pl.DataFrame, 
+        columns: List[str],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Check for future dates."""
         anomalies = []
-        today = datetime.now().date()
+        today_lit = pl.lit(detected_at.date(), dtype=pl.Date)
+        schema = df.schema
         
-        for col in columns:
-            if col not in df.columns:
-                continue
-            
-            future_count = (df[col] > today).sum()
+        # Only Date/Datetime columns can be compared against today
+        present = [
+            col 
+            for col in dict.fromkeys(columns) 
+            if col in schema and (schema[col] == pl.Date or isinstance(schema[col], pl.Datetime))
+        ]
+        
+        # Future-date counts for every present column in one aggregation;
+        # datetimes compare by their date, so earlier today is not future
+        future_counts = (
+            df.lazy()
+            .select([
+                (
+                    (pl.col(col).dt.date() if schema[col] != pl.Date else pl.col(col)) > today_lit
+                ).sum().alias(col)
+                for col in present
+            ])
+            .collect()
+            .row(0, named=True)
+        ) if present else {}
+        
+        for col in present:
+            future_count = future_counts[col]
             if future_count > 0:
                 anomalies.append(Anomaly(
                     anomaly_id=f"validation_{col}_future",
                     anomaly_type=AnomalyType.VALIDATION,
                     severity=AnomalySeverity.MEDIUM,
                     column=col,
-                    detected_at=datetime.utcnow(),
+                    detected_at=detected_at,
                     description=f"Column '{col}' has {future_count} future dates",
                     value=None,
                     affected_records=future_count,
@@ -216,6 +453,7 @@ class TierOneValidator:
         condition: Callable, 
         name: str,
         description: str,
+        detected_at: datetime,
     ) -> List[Anomaly]:
         """Run custom validation check."""
         try:
@@ -223,20 +461,63 @@ class TierOneValidator:
             invalid_count = (~is_valid).sum()
             
             if invalid_count > 0:
-                return [Anomaly(
-                    anomaly_id=f"validation_{name}",
-                    anomaly_type=AnomalyType.VALIDATION,
-                    severity=AnomalySeverity.MEDIUM,
-                    column=name,
-                    detected_at=datetime.utcnow(),
-                    description=description or f"Business rule '{name}' violated",
-                    value=None,
-                    affected_records=invalid_count,
-                )]
+                return [self._custom_anomaly(name, description, invalid_count, detected_at)]
         except Exception as e:
             self.logger.error(f"Custom check {name} failed: {str(e)}")
         
         return []
+    
+    def _check_custom_exprs(
+        self, 
+        df: pl.DataFrame, 
+        detected_at: datetime,
+    ) -> List[Anomaly]:
+        """
+        Evaluate all expression-based business rules in one aggregation.
+        
+        One broken rule (e.g. on a missing column) fails the whole query,
+        so on error each rule is evaluated on its own and only the rules
+        that fail again are dropped.
+        """
+        lf = df.lazy()
+        try:
+            invalid_counts = lf.select([
+                (~expr).sum().alias(name) 
+                for name, (expr, _) in self.rule_exprs.items()
+            ]).collect().row(0, named=True)
+        except Exception as e:
+            self.logger.warning(f"Fused business rules failed, evaluating individually: {str(e)}")
+            invalid_counts = {}
+            for name, (expr, _) in self.rule_exprs.items():
+                try:
+                    invalid_counts[name] = lf.select((~expr).sum()).collect().item()
+                except Exception as rule_error:
+                    self.logger.error(f"Business rule {name} failed: {str(rule_error)}")
+        
+        return [
+            self._custom_anomaly(name, description, invalid_counts[name], detected_at)
+            for name, (_, description) in self.rule_exprs.items()
+            if invalid_counts.get(name, 0) > 0
+        ]
+    
+    def _custom_anomaly(
+        self, 
+        name: str, 
+        description: str, 
+        invalid_count: int,
+        detected_at: datetime,
+    ) -> Anomaly:
+        """Build the anomaly for a violated business rule."""
+        return Anomaly(
+            anomaly_id=f"validation_{name}",
+            anomaly_type=AnomalyType.VALIDATION,
+            severity=AnomalySeverity.MEDIUM,
+            column=name,
+            detected_at=detected_at,
+            description=description or f"Business rule '{name}' violated",
+            value=None,
+            affected_records=invalid_count,
+        )
 
 
 class TierTwoOutlierDetector:
@@ -248,12 +529,24 @@ class TierTwoOutlierDetector:
     - Z-Score
     - Modified Z-Score (MAD)
     - Percentile thresholds
+    
+    With use_numba=True (requires the optional numba package), Z-score and
+    MAD checks run as JIT-compiled single-pass kernels over the raw column
+    buffer instead of Polars expressions.
+    
+    With streaming=True, the statistics and count queries run on Polars'
+    streaming engine, which bounds memory for very large inputs.
     """
     
-    def __init__(self, table_name: str):
+    def __init__(self, table_name: str, use_numba: bool = False, streaming: bool = False):
+        if use_numba and not NUMBA_AVAILABLE:
+            raise ImportError("numba is required for use_numba=True")
+        
         self.table_name = table_name
         self.logger = logging.getLogger(f"anomaly.tier2.{table_name}")
         self.columns: Dict[str, Dict] = {}
+        self.use_numba = use_numba
+        self.engine = "streaming" if streaming else "auto"
     
     def add_iqr_check(
         self, 
@@ -313,49 +606,298 @@ class TierTwoOutlierDetector:
         }
         return self
     
-    def detect(self, df: pl.DataFrame) -> List[Anomaly]:
-        """Run all Tier 2 checks and return anomalies."""
-        anomalies = []
+    def aggregations(self, columns: Collection[str]) -> List[pl.Expr]:
+        """
+        Statistics required by all checks on the given columns.
+        
+        Exposed so AnomalyDetector can fuse them with other tiers'
+        aggregations into a single query over the same data.
+        """
+        return [
+            expr
+            for column, config in self.columns.items()
+            if column in columns
+            for expr in self._stat_exprs(column, config)
+        ]
+    
+    def target_columns(
+        self, 
+        df: pl.DataFrame,
+        skip_columns: Collection[str] = (),
+    ) -> Dict[str, Dict]:
+        """Configured columns present in df with a numeric dtype, minus skip_columns."""
+        schema = df.schema
+        columns = {}
         
         for column, config in self.columns.items():
-            if column not in df.columns:
+            if column not in schema or column in skip_columns:
                 continue
-            
-            method = config["method"]
-            
-            if method == "iqr":
-                anomalies.extend(self._detect_iqr(df, column, config))
-            elif method == "zscore":
-                anomalies.extend(self._detect_zscore(df, column, config))
-            elif method == "mad":
-                anomalies.extend(self._detect_mad(df, column, config))
-            elif method == "percentile":
-                anomalies.extend(self._detect_percentile(df, column, config))
+            if not schema[column].is_numeric():
+                self.logger.debug(f"Skipping non-numeric column '{column}' ({schema[column]})")
+                continue
+            columns[column] = config
         
-        return anomalies
+        return columns
     
-    def _detect_iqr(self, df: pl.DataFrame, column: str, config: Dict) -> List[Anomaly]:
-        """Detect outliers using IQR method."""
-        q1 = df[column].quantile(0.25)
-        q3 = df[column].quantile(0.75)
+    def detect(
+        self, 
+        df: pl.DataFrame,
+        stats: Optional[Dict[str, Any]] = None,
+        detected_at: Optional[datetime] = None,
+        skip_columns: Collection[str] = (),
+    ) -> List[Anomaly]:
+        """
+        Run all Tier 2 checks and return anomalies.
+        
+        Statistics for every configured column are aggregated in a single
+        query; outlier counts are then computed in one more query against
+        the precomputed scalars, so each column is scanned twice regardless
+        of how many statistics its check needs.
+        
+        Args:
+            df: Data to analyze
+            stats: Precomputed results of aggregations(), if already collected
+            detected_at: Timestamp for all anomalies (defaults to now)
+            skip_columns: Columns to leave out (e.g. required columns missing from df)
+        """
+        columns = self.target_columns(df, skip_columns)
+        if not columns:
+            return []
+        
+        detected_at = detected_at or datetime.utcnow()
+        lf = df.lazy()
+        
+        # Pass 1: quantiles, mean/std, median/MAD for all columns at once
+        if stats is None:
+            stat_exprs = self.aggregations(columns)
+            stats = (
+                lf.select(stat_exprs).collect(engine=self.engine).row(0, named=True)
+                if stat_exprs else {}
+            )
+        
+        # Pass 2: outlier counts using the precomputed statistics
+        count_exprs = [
+            expr
+            for column, config in columns.items()
+            for expr in self._count_exprs(column, config, stats)
+        ]
+        counts = (
+            lf.select(count_exprs).collect(engine=self.engine).row(0, named=True) 
+            if count_exprs else {}
+        )
+        
+        # numba kernels run on this thread: prange kernels launched from
+        # worker threads hang at exit
+        if self.use_numba:
+            for column, config in columns.items():
+                if config["method"] in ("zscore", "mad"):
+                    stats, counts = self._kernel_counts(df, column, config, stats, counts)
+        
+        # Per-column follow-up work (sample queries) runs concurrently
+        return _map_tasks(
+            lambda task: self._detect_column(df, *task, stats, counts, detected_at),
+            list(columns.items()),
+        )
+    
+    def _detect_column(
+        self, 
+        df: pl.DataFrame, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
+        """Build a column's anomalies from the fused statistics and counts."""
+        method = config["method"]
+        
+        if method == "iqr":
+            return self._detect_iqr(df, column, config, stats, counts, detected_at)
+        elif method == "zscore":
+            return self._detect_zscore(column, config, stats, counts, detected_at)
+        elif method == "mad":
+            return self._detect_mad(column, config, stats, counts, detected_at)
+        elif method == "percentile":
+            return self._detect_percentile(column, config, stats, counts, detected_at)
+        
+        return []
+    
+    def _stat_exprs(self, column: str, config: Dict) -> List[pl.Expr]:
+        """Aggregation expressions needed by the column's outlier method."""
+        col = pl.col(column)
+        method = config["method"]
+        
+        if method in ("iqr", "percentile"):
+            # Both quantiles from one expression, so the column is sorted once
+            return [col.quantile(self._quantile_levels(config)).alias(_stat_key(column, "quantiles"))]
+        elif method == "zscore":
+            return [
+                col.mean().alias(_stat_key(column, "mean")),
+                col.std().alias(_stat_key(column, "std")),
+            ]
+        elif method == "mad":
+            if self.use_numba:
+                return []  # Computed by _median_abs_deviation
+            median = col.median()
+            return [
+                median.alias(_stat_key(column, "median")),
+                (col - median).abs().median().alias(_stat_key(column, "mad")),
+            ]
+        
+        return []
+    
+    def _quantile_levels(self, config: Dict) -> List[float]:
+        """Lower/upper quantile levels for IQR and percentile checks."""
+        if config["method"] == "iqr":
+            return [0.25, 0.75]
+        return [config["lower"], config["upper"]]
+    
+    def _quantiles(
+        self, 
+        column: str, 
+        stats: Dict[str, Any],
+    ) -> Optional[Tuple[float, float]]:
+        """Collected lower/upper quantile values, or None if undefined."""
+        quantiles = stats[_stat_key(column, "quantiles")]
+        if not quantiles or quantiles[0] is None or quantiles[1] is None:
+            return None
+        return quantiles[0], quantiles[1]
+    
+    def _bounds(
+        self, 
+        column: str, 
+        config: Dict, 
+        stats: Dict[str, Any],
+    ) -> Optional[Tuple[float, float]]:
+        """Lower/upper outlier bounds for IQR and percentile checks."""
+        quantiles = self._quantiles(column, stats)
+        if quantiles is None or config["method"] != "iqr":
+            return quantiles
+        
+        q1, q3 = quantiles
         iqr = q3 - q1
         multiplier = config["multiplier"]
+        return q1 - multiplier * iqr, q3 + multiplier * iqr
+    
+    def _outside_bounds(self, column: str, bounds: Tuple[float, float]) -> pl.Expr:
+        """Mask of values outside [lower, upper] as a single is_between kernel."""
+        lower_bound, upper_bound = bounds
+        return ~pl.col(column).is_between(lower_bound, upper_bound, closed="both")
+    
+    def _count_exprs(
+        self, 
+        column: str, 
+        config: Dict, 
+        stats: Dict[str, Any],
+    ) -> List[pl.Expr]:
+        """Outlier-count expressions built from precomputed statistics."""
+        col = pl.col(column)
+        method = config["method"]
+        
+        if method in ("iqr", "percentile"):
+            bounds = self._bounds(column, config, stats)
+            if bounds is None:
+                return []
+            is_outlier = self._outside_bounds(column, bounds)
+            return [is_outlier.sum().alias(_stat_key(column, "outliers"))]
         
-        lower_bound = q1 - multiplier * iqr
-        upper_bound = q3 + multiplier * iqr
+        elif method == "zscore":
+            mean = stats[_stat_key(column, "mean")]
+            std = stats[_stat_key(column, "std")]
+            if not std or self.use_numba:
+                return []
+            z_scores = ((col - mean) / std).abs()
+            return [
+                (z_scores > config["threshold"]).sum().alias(_stat_key(column, "outliers")),
+                z_scores.max().alias(_stat_key(column, "max_z")),
+            ]
         
-        is_outlier = (df[column] < lower_bound) | (df[column] > upper_bound)
-        outlier_count = is_outlier.sum()
+        elif method == "mad":
+            if self.use_numba:
+                return []
+            median = stats[_stat_key(column, "median")]
+            mad = stats[_stat_key(column, "mad")]
+            if not mad:
+                return []
+            # Modified Z-score: 0.6745 is the 0.75th quantile of the normal distribution.
+            # |0.6745 * (x - median) / mad| > threshold is folded into a scalar cutoff
+            # so each row needs one subtract, abs and compare.
+            cutoff = config["threshold"] * mad / 0.6745
+            return [
+                ((col - median).abs() > cutoff).sum().alias(_stat_key(column, "outliers")),
+            ]
+        
+        return []
+    
+    def _kernel_counts(
+        self, 
+        df: pl.DataFrame, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return stats/counts extended with numba results for a Z-score or MAD check."""
+        stats = dict(stats)
+        counts = dict(counts)
+        
+        values = df[column].drop_nulls().cast(pl.Float64).to_numpy()
+        if values.size == 0:
+            return stats, counts
+        
+        if config["method"] == "zscore":
+            std = stats[_stat_key(column, "std")]
+            if not std:
+                return stats, counts
+            outlier_count, max_z = _zscore_outlier_count(
+                values, stats[_stat_key(column, "mean")], std, config["threshold"]
+            )
+            counts[_stat_key(column, "outliers")] = int(outlier_count)
+            counts[_stat_key(column, "max_z")] = float(max_z)
+        
+        else:
+            median, mad = _median_abs_deviation(values)
+            stats[_stat_key(column, "median")] = float(median)
+            stats[_stat_key(column, "mad")] = float(mad)
+            if mad != 0:
+                outlier_count = _mad_outlier_count(values, median, mad, config["threshold"])
+                counts[_stat_key(column, "outliers")] = int(outlier_count)
+        
+        return stats, counts
+    
+    def _detect_iqr(
+        self, 
+        df: pl.DataFrame, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
+        """Detect outliers using IQR method."""
+        outlier_count = counts.get(_stat_key(column, "outliers"), 0)
         
         if outlier_count > 0:
-            outlier_values = df.filter(is_outlier)[column].to_list()
+            q1, q3 = self._quantiles(column, stats)
+            lower_bound, upper_bound = bounds = self._bounds(column, config, stats)
+            
+            # Only the first few outliers are kept, so stop the scan there
+            outlier_values = (
+                df.lazy()
+                .filter(self._outside_bounds(column, bounds))
+                .select(pl.col(column))
+                .head(10)
+                .collect()
+                .to_series()
+                .to_list()
+            )
             
             return [Anomaly(
                 anomaly_id=f"outlier_iqr_{column}",
                 anomaly_type=AnomalyType.OUTLIER,
                 severity=config["severity"],
                 column=column,
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"IQR outliers in '{column}': {outlier_count} values outside [{lower_bound:.2f}, {upper_bound:.2f}]",
                 value=outlier_values[0] if outlier_values else None,
                 expected_range=(lower_bound, upper_bound),
@@ -364,101 +906,100 @@ class TierTwoOutlierDetector:
                     "method": "iqr",
                     "q1": q1,
                     "q3": q3,
-                    "iqr": iqr,
-                    "sample_outliers": outlier_values[:10],
+                    "iqr": q3 - q1,
+                    "sample_outliers": outlier_values,
                 },
             )]
         
         return []
     
-    def _detect_zscore(self, df: pl.DataFrame, column: str, config: Dict) -> List[Anomaly]:
+    def _detect_zscore(
+        self, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Detect outliers using Z-score method."""
-        mean = df[column].mean()
-        std = df[column].std()
+        outlier_count = counts.get(_stat_key(column, "outliers"), 0)
         threshold = config["threshold"]
         
-        if std == 0:
-            return []
-        
-        z_scores = ((df[column] - mean) / std).abs()
-        is_outlier = z_scores > threshold
-        outlier_count = is_outlier.sum()
-        
         if outlier_count > 0:
             return [Anomaly(
                 anomaly_id=f"outlier_zscore_{column}",
                 anomaly_type=AnomalyType.OUTLIER,
                 severity=config["severity"],
                 column=column,
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"Z-score outliers in '{column}': {outlier_count} values with |z| > {threshold}",
                 value=None,
-                deviation_score=z_scores.filter(is_outlier).max(),
+                deviation_score=counts[_stat_key(column, "max_z")],
                 affected_records=outlier_count,
                 metadata={
                     "method": "zscore",
-                    "mean": mean,
-                    "std": std,
+                    "mean": stats[_stat_key(column, "mean")],
+                    "std": stats[_stat_key(column, "std")],
                     "threshold": threshold,
                 },
             )]
         
         return []
     
-    def _detect_mad(self, df: pl.DataFrame, column: str, config: Dict) -> List[Anomaly]:
+    def _detect_mad(
+        self, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Detect outliers using Modified Z-score (MAD) method."""
-        median = df[column].median()
-        mad = (df[column] - median).abs().median()
+        outlier_count = counts.get(_stat_key(column, "outliers"), 0)
         threshold = config["threshold"]
         
-        if mad == 0:
-            return []
-        
-        # Modified Z-score: 0.6745 is the 0.75th quantile of the normal distribution
-        modified_z = 0.6745 * (df[column] - median) / mad
-        is_outlier = modified_z.abs() > threshold
-        outlier_count = is_outlier.sum()
-        
         if outlier_count > 0:
             return [Anomaly(
                 anomaly_id=f"outlier_mad_{column}",
                 anomaly_type=AnomalyType.OUTLIER,
                 severity=config["severity"],
                 column=column,
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"MAD outliers in '{column}': {outlier_count} values with modified z > {threshold}",
                 value=None,
                 affected_records=outlier_count,
                 metadata={
                     "method": "mad",
-                    "median": median,
-                    "mad": mad,
+                    "median": stats[_stat_key(column, "median")],
+                    "mad": stats[_stat_key(column, "mad")],
                 },
             )]
         
         return []
     
-    def _detect_percentile(self, df: pl.DataFrame, column: str, config: Dict) -> List[Anomaly]:
+    def _detect_percentile(
+        self, 
+        column: str, 
+        config: Dict,
+        stats: Dict[str, Any],
+        counts: Dict[str, Any],
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Detect outliers using percentile thresholds."""
+        outlier_count = counts.get(_stat_key(column, "outliers"), 0)
         lower = config["lower"]
         upper = config["upper"]
         
-        lower_bound = df[column].quantile(lower)
-        upper_bound = df[column].quantile(upper)
-        
-        is_outlier = (df[column] < lower_bound) | (df[column] > upper_bound)
-        outlier_count = is_outlier.sum()
-        
         if outlier_count > 0:
             return [Anomaly(
                 anomaly_id=f"outlier_percentile_{column}",
                 anomaly_type=AnomalyType.OUTLIER,
                 severity=config["severity"],
                 column=column,
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"Percentile outliers in '{column}': {outlier_count} values outside [{lower:.0%}, {upper:.0%}]",
                 value=None,
-                expected_range=(lower_bound, upper_bound),
+                expected_range=self._bounds(column, config, stats),
                 affected_records=outlier_count,
                 metadata={
                     "method": "percentile",
@@ -479,12 +1020,20 @@ class TierThreeVolatilityAnalyzer:
     - Trend deviations
     - Volume anomalies
     - Missing expected data
+    
+    With use_numba=True (requires the optional numba package), rolling
+    checks run as a JIT-compiled single-pass online-variance kernel
+    instead of Polars rolling windows.
     """
     
-    def __init__(self, table_name: str):
+    def __init__(self, table_name: str, use_numba: bool = False):
+        if use_numba and not NUMBA_AVAILABLE:
+            raise ImportError("numba is required for use_numba=True")
+        
         self.table_name = table_name
         self.logger = logging.getLogger(f"anomaly.tier3.{table_name}")
         self.checks: List[Dict] = []
+        self.use_numba = use_numba
     
     def add_spike_detection(
         self,
@@ -497,7 +1046,7 @@ class TierThreeVolatilityAnalyzer:
         self.checks.append({
             "type": "spike",
             "column": column,
-            "threshold_pct": threshold_pct,
+            "spike_pct": threshold_pct,
             "date_column": date_column,
             "severity": severity,
         })
@@ -514,7 +1063,26 @@ class TierThreeVolatilityAnalyzer:
         self.checks.append({
             "type": "drop",
             "column": column,
-            "threshold_pct": threshold_pct,
+            "drop_pct": threshold_pct,
+            "date_column": date_column,
+            "severity": severity,
+        })
+        return self
+    
+    def add_change_detection(
+        self,
+        column: str,
+        spike_pct: float = 200.0,
+        drop_pct: float = 50.0,
+        date_column: str = "date",
+        severity: AnomalySeverity = AnomalySeverity.HIGH,
+    ) -> "TierThreeVolatilityAnalyzer":
+        """Detect sudden spikes and drops in one check compared to previous period."""
+        self.checks.append({
+            "type": "change",
+            "column": column,
+            "spike_pct": spike_pct,
+            "drop_pct": drop_pct,
             "date_column": date_column,
             "severity": severity,
         })
@@ -554,111 +1122,154 @@ class TierThreeVolatilityAnalyzer:
         })
         return self
     
+    def aggregations(self, columns: Collection[str]) -> List[pl.Expr]:
+        """
+        Column sums required by spike/drop checks on the given columns.
+        
+        Exposed so AnomalyDetector can fuse them with other tiers'
+        aggregations into a single query over the same data.
+        """
+        needed = dict.fromkeys(
+            check["column"] 
+            for check in self.checks 
+            if check["type"] in ("spike", "drop", "change")
+        )
+        return [
+            pl.col(column).sum().alias(_stat_key(column, "sum"))
+            for column in needed
+            if column in columns
+        ]
+    
     def detect(
         self, 
         df: pl.DataFrame, 
         historical_df: Optional[pl.DataFrame] = None,
+        current: Optional[Dict[str, Any]] = None,
+        historical: Optional[Dict[str, Any]] = None,
+        detected_at: Optional[datetime] = None,
+        skip_columns: Collection[str] = (),
     ) -> List[Anomaly]:
-        """Run all Tier 3 checks."""
-        anomalies = []
+        """
+        Run all Tier 3 checks.
         
-        for check in self.checks:
-            check_type = check["type"]
-            
-            if check_type == "spike":
-                anomalies.extend(self._detect_spike(df, historical_df, check))
-            elif check_type == "drop":
-                anomalies.extend(self._detect_drop(df, historical_df, check))
-            elif check_type == "volume":
-                anomalies.extend(self._detect_volume(df, check))
-            elif check_type == "rolling":
-                anomalies.extend(self._detect_rolling(df, check))
+        Args:
+            df: Current data to analyze
+            historical_df: Historical data for comparison
+            current: Precomputed results of aggregations() on df
+            historical: Precomputed results of aggregations() on historical_df
+            detected_at: Timestamp for all anomalies (defaults to now)
+            skip_columns: Columns whose checks are skipped
+        """
+        detected_at = detected_at or datetime.utcnow()
+        checks = [check for check in self.checks if check.get("column") not in skip_columns]
         
-        return anomalies
+        if historical_df is not None:
+            if current is None:
+                current = self._collect_sums(df)
+            if historical is None:
+                historical = self._collect_sums(historical_df)
+        
+        return [
+            anomaly
+            for check in checks
+            for anomaly in self._run_check(df, historical_df, check, current, historical, detected_at)
+        ]
     
-    def _detect_spike(
+    def _run_check(
         self, 
         df: pl.DataFrame, 
         historical_df: Optional[pl.DataFrame],
         check: Dict,
+        current: Optional[Dict[str, Any]],
+        historical: Optional[Dict[str, Any]],
+        detected_at: datetime,
     ) -> List[Anomaly]:
-        """Detect sudden value spikes."""
-        column = check["column"]
-        threshold = check["threshold_pct"]
+        """Dispatch a single Tier 3 check."""
+        check_type = check["type"]
         
-        if historical_df is None or column not in df.columns:
-            return []
-        
-        current_value = df[column].sum()
-        historical_value = historical_df[column].sum() if column in historical_df.columns else 0
-        
-        if historical_value == 0:
-            return []
-        
-        change_pct = ((current_value - historical_value) / historical_value) * 100
-        
-        if change_pct > threshold:
-            return [Anomaly(
-                anomaly_id=f"volatility_spike_{column}",
-                anomaly_type=AnomalyType.VOLATILITY,
-                severity=check["severity"],
-                column=column,
-                detected_at=datetime.utcnow(),
-                description=f"Sudden spike in '{column}': +{change_pct:.1f}% (threshold: {threshold}%)",
-                value=current_value,
-                deviation_score=change_pct,
-                metadata={
-                    "current_value": current_value,
-                    "historical_value": historical_value,
-                    "change_pct": change_pct,
-                },
-            )]
+        if check_type in ("spike", "drop", "change"):
+            return self._detect_change(df, historical_df, check, current, historical, detected_at)
+        elif check_type == "volume":
+            return self._detect_volume(df, check, detected_at)
+        elif check_type == "rolling":
+            return self._detect_rolling(df, check, detected_at)
         
         return []
     
-    def _detect_drop(
+    def _collect_sums(self, df: pl.DataFrame) -> Dict[str, Any]:
+        """Collect all spike/drop sums for a DataFrame in one query."""
+        exprs = self.aggregations(df.columns)
+        if not exprs:
+            return {}
+        return df.lazy().select(exprs).collect().row(0, named=True)
+    
+    def _detect_change(
         self, 
         df: pl.DataFrame, 
         historical_df: Optional[pl.DataFrame],
         check: Dict,
+        current: Optional[Dict[str, Any]],
+        historical: Optional[Dict[str, Any]],
+        detected_at: datetime,
     ) -> List[Anomaly]:
-        """Detect sudden value drops."""
+        """Detect sudden value spikes and/or drops from one change computation."""
         column = check["column"]
-        threshold = check["threshold_pct"]
         
         if historical_df is None or column not in df.columns:
             return []
         
-        current_value = df[column].sum()
-        historical_value = historical_df[column].sum() if column in historical_df.columns else 0
+        current_value = current[_stat_key(column, "sum")]
+        historical_value = historical.get(_stat_key(column, "sum"), 0)
         
         if historical_value == 0:
             return []
         
-        change_pct = ((historical_value - current_value) / historical_value) * 100
+        change_pct = ((current_value - historical_value) / historical_value) * 100
+        metadata = {
+            "current_value": current_value,
+            "historical_value": historical_value,
+            "change_pct": change_pct,
+        }
+        anomalies = []
         
-        if change_pct > (100 - threshold):
-            return [Anomaly(
-                anomaly_id=f"volatility_drop_{column}",
+        spike_pct = check.get("spike_pct")
+        if spike_pct is not None and change_pct > spike_pct:
+            anomalies.append(Anomaly(
+                anomaly_id=f"volatility_spike_{column}",
                 anomaly_type=AnomalyType.VOLATILITY,
                 severity=check["severity"],
                 column=column,
-                detected_at=datetime.utcnow(),
-                description=f"Sudden drop in '{column}': -{change_pct:.1f}% (threshold: {100-threshold}%)",
+                detected_at=detected_at,
+                description=f"Sudden spike in '{column}': +{change_pct:.1f}% (threshold: {spike_pct}%)",
                 value=current_value,
                 deviation_score=change_pct,
-                metadata={
-                    "current_value": current_value,
-                    "historical_value": historical_value,
-                    "change_pct": -change_pct,
-                },
-            )]
+                metadata=metadata,
+            ))
         
-        return []
+        drop_pct = check.get("drop_pct")
+        if drop_pct is not None and -change_pct > (100 - drop_pct):
+            anomalies.append(Anomaly(
+                anomaly_id=f"volatility_drop_{column}",
+                anomaly_type=AnomalyType.VOLATILITY,
+                severity=check["severity"],
+                column=column,
+                detected_at=detected_at,
+                description=f"Sudden drop in '{column}': {change_pct:.1f}% (threshold: {100-drop_pct}%)",
+                value=current_value,
+                deviation_score=-change_pct,
+                metadata=metadata,
+            ))
+        
+        return anomalies
     
-    def _detect_volume(self, df: pl.DataFrame, check: Dict) -> List[Anomaly]:
+    def _detect_volume(
+        self, 
+        df: pl.DataFrame, 
+        check: Dict,
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Check record volume is within expected range."""
-        count = len(df)
+        count = df.height
         expected_min = check["expected_min"]
         expected_max = check["expected_max"]
         
@@ -668,7 +1279,7 @@ class TierThreeVolatilityAnalyzer:
                 anomaly_type=AnomalyType.MISSING,
                 severity=check["severity"],
                 column="_record_count",
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"Record count ({count}) below expected minimum ({expected_min})",
                 value=count,
                 expected_range=(expected_min, expected_max),
@@ -683,7 +1294,7 @@ class TierThreeVolatilityAnalyzer:
                 anomaly_type=AnomalyType.VOLATILITY,
                 severity=check["severity"],
                 column="_record_count",
-                detected_at=datetime.utcnow(),
+                detected_at=detected_at,
                 description=f"Record count ({count}) above expected maximum ({expected_max})",
                 value=count,
                 expected_range=(expected_min, expected_max),
@@ -694,11 +1305,64 @@ class TierThreeVolatilityAnalyzer:
         
         return []
     
-    def _detect_rolling(self, df: pl.DataFrame, check: Dict) -> List[Anomaly]:
+    def _detect_rolling(
+        self, 
+        df: pl.DataFrame, 
+        check: Dict,
+        detected_at: datetime,
+    ) -> List[Anomaly]:
         """Detect deviations from rolling average."""
-        # Implementation for rolling average deviation detection
+        column = check["column"]
+        date_column = check["date_column"]
+        window = check["window_size"]
+        threshold = check["threshold_std"]
+        
+        if column not in df.columns or window < 2:
+            return []
+        
         # Requires time-series ordered data
-        return []
+        ordered = df.lazy()
+        if date_column in df.columns:
+            ordered = ordered.sort(date_column)
+        ordered = ordered.filter(pl.col(column).is_not_null())
+        
+        if self.use_numba:
+            ordered = ordered.collect()
+            values = ordered[column].cast(pl.Float64).to_numpy()
+            mask = np.empty(values.shape[0], dtype=np.bool_)
+            _rolling_z_outliers(values, window, threshold, mask)
+            outliers = ordered.filter(pl.Series(mask))
+        else:
+            previous = pl.col(column).shift(1)
+            mean = previous.rolling_mean(window)
+            std = previous.rolling_std(window)
+            outliers = ordered.filter(
+                (std > 0) & ((pl.col(column) - mean).abs() / std > threshold)
+            ).collect()
+        
+        outlier_count = outliers.height
+        if outlier_count == 0:
+            return []
+        
+        samples = outliers.head(10)
+        sample_values = samples[column].to_list()
+        
+        return [Anomaly(
+            anomaly_id=f"volatility_rolling_{column}",
+            anomaly_type=AnomalyType.VOLATILITY,
+            severity=check["severity"],
+            column=column,
+            detected_at=detected_at,
+            description=f"Found {outlier_count} values in '{column}' beyond {threshold} std of the {window}-period rolling average",
+            value=sample_values[0],
+            affected_records=outlier_count,
+            metadata={
+                "window_size": window,
+                "threshold_std": threshold,
+                "sample_values": sample_values,
+                "sample_dates": samples[date_column].to_list() if date_column in df.columns else [],
+            },
+        )]
 
 
 class AnomalyDetector:
@@ -725,11 +1389,17 @@ class AnomalyDetector:
             raise DataQualityError("Critical anomalies detected")
     """
     
-    def __init__(self, table_name: str):
+    def __init__(
+        self, 
+        table_name: str, 
+        use_numba: bool = False,
+        streaming: bool = False,
+    ):
         self.table_name = table_name
         self.tier1 = TierOneValidator(table_name)
-        self.tier2 = TierTwoOutlierDetector(table_name)
-        self.tier3 = TierThreeVolatilityAnalyzer(table_name)
+        self.tier2 = TierTwoOutlierDetector(table_name, use_numba=use_numba, streaming=streaming)
+        self.tier3 = TierThreeVolatilityAnalyzer(table_name, use_numba=use_numba)
+        self.streaming = streaming
         self.logger = logging.getLogger(f"anomaly.{table_name}")
     
     def detect(
@@ -749,56 +1419,110 @@ class AnomalyDetector:
         """
         all_anomalies = []
         
+        # One timestamp for the whole run, shared by every anomaly
+        detected_at = datetime.utcnow()
+        
         # Tier 1: Validation
-        tier1_anomalies = self.tier1.detect(df)
+        tier1_anomalies = self.tier1.detect(df, detected_at=detected_at)
         all_anomalies.extend(tier1_anomalies)
         self.logger.info(f"Tier 1 (Validation): {len(tier1_anomalies)} anomalies")
         
+        # Required columns missing from the data are skipped downstream
+        missing_cols = set(self.tier1.missing_columns(df.schema))
+        
+        # Tier 2/3 aggregations, collected together in one batch
+        current_stats, historical_stats = self._collect_stats(df, historical_df, missing_cols)
+        
         # Tier 2: Outliers
-        tier2_anomalies = self.tier2.detect(df)
+        tier2_anomalies = self.tier2.detect(
+            df, 
+            stats=current_stats, 
+            detected_at=detected_at,
+            skip_columns=missing_cols,
+        )
         all_anomalies.extend(tier2_anomalies)
         self.logger.info(f"Tier 2 (Outliers): {len(tier2_anomalies)} anomalies")
         
         # Tier 3: Volatility
-        tier3_anomalies = self.tier3.detect(df, historical_df)
+        tier3_anomalies = self.tier3.detect(
+            df, 
+            historical_df, 
+            current=current_stats, 
+            historical=historical_stats,
+            detected_at=detected_at,
+            skip_columns=missing_cols,
+        )
         all_anomalies.extend(tier3_anomalies)
         self.logger.info(f"Tier 3 (Volatility): {len(tier3_anomalies)} anomalies")
         
         # Build report
-        report = self._build_report(df, all_anomalies)
+        report = self._build_report(df, all_anomalies, detected_at)
         
         return report
     
-    def _build_report(self, df: pl.DataFrame, anomalies: List[Anomaly]) -> AnomalyReport:
+    def _collect_stats(
+        self, 
+        df: pl.DataFrame,
+        historical_df: Optional[pl.DataFrame],
+        skip_columns: Collection[str] = (),
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Collect Tier 2 and Tier 3 aggregations with a single collect_all.
+        
+        Every statistic over the current data is fused into one lazy
+        select, so Polars scans each column once and evaluates the
+        expressions in parallel; the historical sums run in the same batch.
+        With streaming enabled the batch runs on the streaming engine.
+        """
+        current_columns = [col for col in df.columns if col not in skip_columns]
+        current_exprs = (
+            self.tier2.aggregations(self.tier2.target_columns(df, skip_columns)) 
+            + self.tier3.aggregations(current_columns)
+        )
+        historical_exprs = (
+            self.tier3.aggregations(historical_df.columns) 
+            if historical_df is not None else []
+        )
+        
+        queries = []
+        if current_exprs:
+            queries.append(df.lazy().select(current_exprs))
+        if historical_exprs:
+            queries.append(historical_df.lazy().select(historical_exprs))
+        
+        engine = "streaming" if self.streaming else "auto"
+        results = iter(pl.collect_all(queries, engine=engine) if queries else [])
+        
+        current = next(results).row(0, named=True) if current_exprs else {}
+        historical = next(results).row(0, named=True) if historical_exprs else {}
+        
+        return current, historical if historical_df is not None else None
+    
+    def _build_report(
+        self, 
+        df: pl.DataFrame, 
+        anomalies: List[Anomaly],
+        detected_at: datetime,
+    ) -> AnomalyReport:
         """Build comprehensive anomaly report."""
-        # Count by type
-        by_type = {}
-        for atype in AnomalyType:
-            by_type[atype] = sum(1 for a in anomalies if a.anomaly_type == atype)
+        # Count by type and severity without a scan per enum member
+        type_counts = Counter(a.anomaly_type for a in anomalies)
+        severity_counts = Counter(a.severity for a in anomalies)
         
-        # Count by severity
-        by_severity = {}
-        for sev in AnomalySeverity:
-            by_severity[sev] = sum(1 for a in anomalies if a.severity == sev)
+        by_type = {atype: type_counts.get(atype, 0) for atype in AnomalyType}
+        by_severity = {sev: severity_counts.get(sev, 0) for sev in AnomalySeverity}
         
         # Calculate health score (100 = perfect, 0 = critical issues)
-        severity_weights = {
-            AnomalySeverity.LOW: 1,
-            AnomalySeverity.MEDIUM: 5,
-            AnomalySeverity.HIGH: 15,
-            AnomalySeverity.CRITICAL: 50,
-        }
-        
         penalty = sum(
-            by_severity[sev] * severity_weights[sev] 
+            severity_counts[sev] * SEVERITY_WEIGHTS[sev] 
             for sev in AnomalySeverity
         )
         health_score = max(0, 100 - penalty)
         
         return AnomalyReport(
             table_name=self.table_name,
-            detection_timestamp=datetime.utcnow(),
-            total_records=len(df),
+            detection_timestamp=detected_at,
+            total_records=df.height,
             total_anomalies=len(anomalies),
             anomalies_by_type=by_type,
             anomalies_by_severity=by_severity,
@@ -7,12 +7,16 @@ Supports schema, range, referential, and custom validations.
 Author: Godson Kurishinkal
 """
 
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+import functools
 import logging
+import operator
+import time
 
 import polars as pl
 
@@ -38,7 +42,39 @@ class RuleType(Enum):
     FRESHNESS = "freshness"
 
 
-@dataclass
+# Quality score weight of each rule by severity
+_WEIGHTS: Dict[RuleSeverity, int] = {
+    RuleSeverity.CRITICAL: 10,
+    RuleSeverity.ERROR: 5,
+    RuleSeverity.WARNING: 2,
+    RuleSeverity.INFO: 1,
+}
+
+# Severities whose row-level violations quarantine a row
+_HARD_SEVERITIES = (RuleSeverity.CRITICAL, RuleSeverity.ERROR)
+
+# Rule indicators packed per quarantine bit lane (one UInt64 column)
+_LANE_BITS = 64
+
+
+def _values_as_dtype_of(values: pl.Series, column: str) -> pl.Expr:
+    """
+    values cast to the dtype of column, as an is_in operand.
+    
+    is_in needs matching dtypes, and a non-strict cast alone would
+    truncate (2.5 would match 2 in an Int64 column), so values that do
+    not survive the round trip back to their own dtype are dropped.
+    """
+    cast = pl.lit(values).cast(pl.dtype_of(column), strict=False)
+    return cast.filter(cast.cast(values.dtype, strict=False) == pl.lit(values)).implode()
+
+
+def _pct(invalid: float, total: int) -> float:
+    """Percentage of invalid records, 0 for an empty frame."""
+    return invalid / total * 100 if total else 0.0
+
+
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     """Result of a single validation rule execution."""
     rule_name: str
@@ -53,9 +89,10 @@ class ValidationResult:
     message: str
     sample_invalid: Optional[List[Any]] = None
     execution_time_ms: float = 0.0
+    skipped: bool = False  # Not executed (fail_fast after a critical failure)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """Complete validation report for a dataset."""
     table_name: str
@@ -69,11 +106,21 @@ class ValidationReport:
     critical_failures: int = 0
     error_failures: int = 0
     warning_failures: int = 0
+    # Row-level quarantine, filled when requested (see validate_and_split)
+    quarantine_mask: Optional[pl.Series] = None
+    quarantine_bits: Optional[pl.DataFrame] = None
+    quarantine_rules: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationRule:
-    """Definition of a validation rule."""
+    """
+    Definition of a validation rule.
+    
+    CUSTOM rules take either check_expr, a Polars expression that is True
+    for valid rows and is evaluated in the fused query, or custom_check,
+    a Python callable run on its own (legacy form).
+    """
     name: str
     rule_type: RuleType
     column: Optional[str] = None
@@ -82,6 +129,21 @@ class ValidationRule:
     params: Dict[str, Any] = field(default_factory=dict)
     description: str = ""
     custom_check: Optional[Callable[[pl.DataFrame], pl.Series]] = None
+    check_expr: Optional[pl.Expr] = None
+    allowed_series: Optional[pl.Series] = field(default=None, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_sql(cls, name: str, expression: str, **kwargs: Any) -> "ValidationRule":
+        """
+        Build a CUSTOM rule from a SQL boolean expression.
+        
+        Keeps rules fully declarative (e.g. loaded from YAML/JSON) while
+        still being evaluated in the fused query.
+        
+        Example:
+            ValidationRule.from_sql("ship_after_order", "ship_date >= order_date")
+        """
+        return cls(name, RuleType.CUSTOM, check_expr=pl.sql_expr(expression), **kwargs)
 
 
 class ValidationEngine:
@@ -115,18 +177,46 @@ class ValidationEngine:
         self.table_name = table_name
         self.logger = logging.getLogger(f"validation.{table_name}")
         self.rules: List[ValidationRule] = []
-        self._reference_data: Dict[str, Set] = {}
+        self._reference_data: Dict[str, pl.Series] = {}
+        self._compiled: Optional[Callable[..., ValidationReport]] = None
     
     def add_rule(self, rule: ValidationRule) -> "ValidationEngine":
         """Add a single validation rule."""
+        self._prepare_rule(rule)
         self.rules.append(rule)
+        self._compiled = None
         return self
     
     def add_rules(self, rules: List[ValidationRule]) -> "ValidationEngine":
         """Add multiple validation rules."""
+        for rule in rules:
+            self._prepare_rule(rule)
         self.rules.extend(rules)
+        self._compiled = None
         return self
     
+    def _prepare_rule(self, rule: ValidationRule) -> None:
+        """
+        One-time work done when a rule is added rather than per batch.
+        
+        PATTERN rules are test-compiled here by Polars' Rust regex engine,
+        the one that evaluates them, so an invalid pattern fails at
+        configuration time. Polars caches the compiled regex per query,
+        so the fused expression only needs the pattern string.
+        """
+        if rule.rule_type is RuleType.PATTERN:
+            pattern = rule.params.get("pattern", ".*")
+            try:
+                pl.select(pl.lit("").str.contains(pattern))
+            except pl.exceptions.ComputeError as e:
+                raise ValueError(f"Invalid pattern for rule {rule.name}: {e}") from e
+        elif rule.rule_type is RuleType.ALLOWED_VALUES:
+            rule.allowed_series = self._allowed_series(rule)
+    
+    def _allowed_series(self, rule: ValidationRule) -> pl.Series:
+        """Allowed values of a rule as a Series; mixed types are widened."""
+        return pl.Series(rule.name, list(set(rule.params.get("values", []))), strict=False)
+    
     def register_reference_data(
         self, 
         ref_name: str, 
@@ -144,121 +234,665 @@ class ValidationEngine:
         if isinstance(values, pl.DataFrame):
             if column is None:
                 raise ValueError("Column must be specified for DataFrame reference")
-            self._reference_data[ref_name] = set(values[column].to_list())
+            self._reference_data[ref_name] = values[column].unique()
         elif isinstance(values, pl.Series):
-            self._reference_data[ref_name] = set(values.to_list())
-        elif isinstance(values, list):
-            self._reference_data[ref_name] = set(values)
+            self._reference_data[ref_name] = values.unique()
         else:
-            self._reference_data[ref_name] = values
+            self._reference_data[ref_name] = pl.Series(ref_name, list(values)).unique()
         
+        # Referential expressions embed the reference values
+        self._compiled = None
         return self
     
-    def validate(self, df: pl.DataFrame) -> ValidationReport:
+    def validate(
+        self, 
+        df: Union[pl.DataFrame, pl.LazyFrame], 
+        fail_fast: bool = False,
+        quarantine: bool = False,
+    ) -> ValidationReport:
         """
         Execute all validation rules against the DataFrame.
         
+        The counts behind every built-in rule are computed in one fused
+        lazy query, so each column is scanned once however many rules
+        reference it. Custom rules, and any rule whose expression cannot
+        be built, run individually. Queries use the streaming engine, so
+        a LazyFrame (e.g. from pl.scan_parquet) is validated without
+        loading it into memory; callable custom rules still collect it.
+        Rules the frame's schema cannot satisfy (see check_feasibility)
+        are not executed and are reported as failures at their severity.
+        
         Args:
-            df: DataFrame to validate
+            df: DataFrame or LazyFrame to validate
+            fail_fast: Run CRITICAL rules first and skip all other rules
+                if any of them fails
+            quarantine: Also compute the per-row quarantine mask of the
+                CRITICAL/ERROR row-level rules in the fused pass
             
         Returns:
-            ValidationReport with detailed results
+            ValidationReport with detailed results, in rule order
         """
-        results = []
-        total_records = len(df)
+        return self._validate(df, fail_fast, self._fused_exprs(), quarantine)
+    
+    def validate_and_split(
+        self, 
+        df: Union[pl.DataFrame, pl.LazyFrame], 
+        fail_fast: bool = False,
+    ) -> Tuple[pl.DataFrame, pl.DataFrame, ValidationReport]:
+        """
+        Validate and split the batch into clean and quarantined rows.
+        
+        A row is quarantined when it violates any CRITICAL or ERROR rule
+        that can be evaluated per row (all but UNIQUE's first occurrence,
+        COMPLETENESS and callable custom rules). Rules skipped by
+        fail_fast quarantine nothing. The violating rules of each row are
+        in report.quarantine_bits. A LazyFrame is collected to produce
+        the partitions.
+        
+        Returns:
+            Tuple of (clean, quarantined, report)
+        """
+        report = self.validate(df, fail_fast=fail_fast, quarantine=True)
+        if report.quarantine_mask is None:
+            raise DataQualityError("Quarantine mask could not be computed; see the log")
+        
+        frame = df.collect() if isinstance(df, pl.LazyFrame) else df
+        mask = report.quarantine_mask
+        return frame.filter(mask.not_()), frame.filter(mask), report
+    
+    def compile(self) -> Callable[..., ValidationReport]:
+        """
+        Specialize the engine to its current ruleset.
         
-        for rule in self.rules:
-            start_time = datetime.utcnow()
+        Builds the fused count expressions once and returns a function
+        with the signature of validate() that reuses them, for a fixed
+        ruleset applied to many batches. The function is cached until
+        rules or reference data are added; rules appended to self.rules
+        directly are not picked up by an already compiled function.
+        
+        Example:
+            validate_batch = engine.compile()
+            for batch in batches:
+                report = validate_batch(batch)
+        """
+        if self._compiled is None:
+            fused = self._fused_exprs()
             
-            try:
-                result = self._execute_rule(rule, df)
-                result.execution_time_ms = (
-                    datetime.utcnow() - start_time
-                ).total_seconds() * 1000
-                results.append(result)
-                
-            except Exception as e:
-                self.logger.error(f"Rule execution failed: {rule.name} - {str(e)}")
-                results.append(ValidationResult(
-                    rule_name=rule.name,
-                    rule_type=rule.rule_type,
-                    column=rule.column,
-                    severity=rule.severity,
-                    passed=False,
-                    total_records=total_records,
-                    valid_records=0,
-                    invalid_records=total_records,
-                    invalid_percentage=100.0,
-                    message=f"Rule execution error: {str(e)}",
-                ))
-        
-        # Calculate summary statistics
-        passed_rules = sum(1 for r in results if r.passed)
-        failed_rules = len(results) - passed_rules
-        critical_failures = sum(1 for r in results if not r.passed and r.severity == RuleSeverity.CRITICAL)
-        error_failures = sum(1 for r in results if not r.passed and r.severity == RuleSeverity.ERROR)
-        warning_failures = sum(1 for r in results if not r.passed and r.severity == RuleSeverity.WARNING)
-        
-        # Calculate quality score (weighted by severity)
-        quality_score = self._calculate_quality_score(results)
+            def compiled(
+                df: Union[pl.DataFrame, pl.LazyFrame], 
+                fail_fast: bool = False,
+                quarantine: bool = False,
+            ) -> ValidationReport:
+                return self._validate(df, fail_fast, fused, quarantine)
+            
+            self._compiled = compiled
+        
+        return self._compiled
+    
+    def _validate(
+        self, 
+        df: Union[pl.DataFrame, pl.LazyFrame], 
+        fail_fast: bool,
+        fused: Dict[int, pl.Expr],
+        quarantine: bool = False,
+    ) -> ValidationReport:
+        """Run the rules given their prebuilt fused count expressions."""
+        # Every check runs as a lazy query; wrapping an eager frame is free
+        lf = df.lazy()
+        if isinstance(df, pl.DataFrame):
+            total_records = df.height
+        else:
+            total_records = lf.select(pl.len()).collect(engine="streaming").item()
+        validation_timestamp = datetime.utcnow()
+        
+        # Rules that cannot run on this schema fail up front, unexecuted
+        schema = lf.collect_schema()
+        infeasible = self._validate_rules_against_schema(schema)
+        results_by_index: Dict[int, ValidationResult] = {
+            index: self._infeasible_result(self.rules[index], reason, total_records)
+            for index, reason in infeasible.items()
+        }
+        runnable = [i for i in range(len(self.rules)) if i not in infeasible]
+        
+        # Read only the columns the rules use; pushed down into scans
+        projection = self._projection(schema, runnable)
+        if projection is not None:
+            lf = lf.select(projection)
+        
+        if fail_fast:
+            critical = [i for i in runnable if self.rules[i].severity is RuleSeverity.CRITICAL]
+            others = [i for i in runnable if self.rules[i].severity is not RuleSeverity.CRITICAL]
+            phases = [critical, others]
+        else:
+            phases = [runnable]
+        
+        # An infeasible critical rule is a critical failure
+        halted = fail_fast and any(
+            self.rules[index].severity is RuleSeverity.CRITICAL for index in infeasible
+        )
+        
+        # Quarantine lanes ride along with the first fused query
+        quarantine_indices: List[int] = []
+        lanes: List[pl.Expr] = []
+        if quarantine:
+            quarantine_indices, lanes = self._quarantine_lanes(runnable)
+        quarantine_rules = [self.rules[index].name for index in quarantine_indices]
+        quarantine_bits = None
+        
+        for phase in phases:
+            if halted:
+                for index in phase:
+                    results_by_index[index] = self._skipped_result(self.rules[index], total_records)
+                continue
+            
+            counts, bits = self._collect_counts(lf, phase, fused, lanes)
+            if lanes:
+                quarantine_bits, lanes = bits, []
+            results_by_index.update(self._run_callable_rules(lf, schema, phase, total_records))
+            for index in phase:
+                result = results_by_index.get(index)
+                if result is None:
+                    result = self._run_rule(self.rules[index], lf, schema, counts.get(index), total_records)
+                    results_by_index[index] = result
+                halted = halted or (
+                    fail_fast and not result.passed and result.severity is RuleSeverity.CRITICAL
+                )
+        
+        results = [results_by_index[index] for index in range(len(self.rules))]
+        
+        # Summary statistics and severity-weighted quality score in one pass
+        passed_rules = 0
+        failures = {severity: 0 for severity in RuleSeverity}
+        total_weight = 0
+        weighted_score = 0.0
+        
+        for result in results:
+            if result.skipped:
+                continue
+            
+            weight = _WEIGHTS[result.severity]
+            total_weight += weight
+            # Score for each rule: % valid records
+            if result.total_records > 0:
+                weighted_score += weight * (result.valid_records / result.total_records)
+            
+            if result.passed:
+                passed_rules += 1
+            else:
+                failures[result.severity] += 1
+        
+        failed_rules = sum(failures.values())
+        quality_score = weighted_score / total_weight if total_weight > 0 else 1.0
+        
+        quarantine_mask = None
+        if quarantine:
+            if lanes:
+                # Every phase was skipped; evaluate the lanes on their own
+                quarantine_bits = self._collect_counts(lf, [], fused, lanes)[1]
+            if quarantine_bits is not None:
+                # Rules skipped by fail_fast never ran; clear their bits
+                skipped_bits = [
+                    bit for bit, index in enumerate(quarantine_indices)
+                    if results_by_index[index].skipped
+                ]
+                if skipped_bits:
+                    quarantine_bits = self._clear_bits(quarantine_bits, skipped_bits)
+                quarantine_mask = quarantine_bits.select(
+                    pl.any_horizontal(pl.all() != 0).alias("quarantined")
+                ).to_series()
+            elif not quarantine_rules:
+                quarantine_mask = pl.repeat(False, total_records, eager=True).alias("quarantined")
         
         report = ValidationReport(
             table_name=self.table_name,
-            validation_timestamp=datetime.utcnow(),
+            validation_timestamp=validation_timestamp,
             total_rules=len(self.rules),
             passed_rules=passed_rules,
             failed_rules=failed_rules,
             total_records=total_records,
             overall_quality_score=quality_score,
             results=results,
-            critical_failures=critical_failures,
-            error_failures=error_failures,
-            warning_failures=warning_failures,
+            critical_failures=failures[RuleSeverity.CRITICAL],
+            error_failures=failures[RuleSeverity.ERROR],
+            warning_failures=failures[RuleSeverity.WARNING],
+            quarantine_mask=quarantine_mask,
+            quarantine_bits=quarantine_bits,
+            quarantine_rules=quarantine_rules,
         )
         
         self.logger.info(
-            f"Validation complete: {passed_rules}/{len(self.rules)} rules passed, "
-            f"quality score: {quality_score:.2%}"
+            "Validation complete: %d/%d rules passed, quality score: %.2f%%",
+            passed_rules, len(self.rules), quality_score * 100,
         )
         
         return report
     
-    def _execute_rule(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
-        """Execute a single validation rule."""
-        total_records = len(df)
+    def _run_rule(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame, 
+        schema: pl.Schema,
+        count: Optional[int],
+        total_records: int,
+    ) -> ValidationResult:
+        """Execute one rule, timing it and turning errors into a failed result."""
+        start_ns = time.perf_counter_ns()
         
-        if rule.rule_type == RuleType.NOT_NULL:
-            return self._check_not_null(rule, df)
+        try:
+            result = self._execute_rule(rule, lf, schema, total_records, count)
+            return replace(result, execution_time_ms=(time.perf_counter_ns() - start_ns) / 1e6)
+            
+        except Exception as e:
+            self.logger.error("Rule execution failed: %s - %s", rule.name, e, exc_info=True)
+            return ValidationResult(
+                rule_name=rule.name,
+                rule_type=rule.rule_type,
+                column=rule.column,
+                severity=rule.severity,
+                passed=False,
+                total_records=total_records,
+                valid_records=0,
+                invalid_records=total_records,
+                invalid_percentage=100.0,
+                message=f"Rule execution error: {str(e)}",
+            )
+    
+    def check_feasibility(self, schema: Mapping[str, pl.DataType]) -> List[str]:
+        """
+        Review the rules against a schema without any data, e.g. in CI.
         
-        elif rule.rule_type == RuleType.UNIQUE:
-            return self._check_unique(rule, df)
+        Args:
+            schema: Column names to dtypes (df.schema or a literal dict)
+            
+        Returns:
+            One "rule_name: reason" entry per rule that cannot run
+        """
+        return [
+            f"{self.rules[index].name}: {reason}"
+            for index, reason in self._validate_rules_against_schema(schema).items()
+        ]
+    
+    def _validate_rules_against_schema(self, schema: Mapping[str, pl.DataType]) -> Dict[int, str]:
+        """
+        Find rules that cannot run on the schema.
         
-        elif rule.rule_type == RuleType.RANGE:
-            return self._check_range(rule, df)
+        Checks that the columns a rule reads exist, that RANGE columns are
+        numeric or temporal and PATTERN columns are strings, and that
+        REFERENTIAL rules name registered reference data.
         
-        elif rule.rule_type == RuleType.PATTERN:
-            return self._check_pattern(rule, df)
+        Returns:
+            Mapping of rule index to the reason it is infeasible
+        """
+        infeasible = {}
         
-        elif rule.rule_type == RuleType.ALLOWED_VALUES:
-            return self._check_allowed_values(rule, df)
+        for index, rule in enumerate(self.rules):
+            # Callable custom rules may use any column; rule.column is a label
+            if rule.rule_type is RuleType.CUSTOM and rule.check_expr is None:
+                continue
+            
+            missing = [col for col in self._rule_columns(rule) if col not in schema]
+            if missing:
+                infeasible[index] = f"missing column(s) {', '.join(missing)}"
+                continue
+            
+            if rule.rule_type is RuleType.RANGE:
+                dtype = schema[rule.column]
+                if not (dtype.is_numeric() or dtype.is_temporal()):
+                    infeasible[index] = f"range check on non-numeric column {rule.column} ({dtype})"
+            
+            elif rule.rule_type is RuleType.PATTERN:
+                dtype = schema[rule.column]
+                if dtype != pl.String:
+                    infeasible[index] = f"pattern check on non-string column {rule.column} ({dtype})"
+            
+            elif rule.rule_type is RuleType.REFERENTIAL:
+                ref_name = rule.params.get("reference")
+                if ref_name not in self._reference_data:
+                    infeasible[index] = f"reference data not registered: {ref_name}"
         
-        elif rule.rule_type == RuleType.REFERENTIAL:
-            return self._check_referential(rule, df)
+        return infeasible
+    
+    def _infeasible_result(
+        self, 
+        rule: ValidationRule, 
+        reason: str,
+        total_records: int,
+    ) -> ValidationResult:
+        """Failed result for a rule that cannot run on the frame's schema."""
+        return ValidationResult(
+            rule_name=rule.name,
+            rule_type=rule.rule_type,
+            column=rule.column,
+            severity=rule.severity,
+            passed=False,
+            total_records=total_records,
+            valid_records=0,
+            invalid_records=total_records,
+            invalid_percentage=100.0,
+            message=f"Rule infeasible: {reason}",
+        )
+    
+    def _projection(self, schema: pl.Schema, indices: List[int]) -> Optional[List[str]]:
+        """
+        Columns read by the given rules, in schema order, or None when a
+        rule may read any column (completeness and callable custom rules).
+        """
+        needed = set()
         
-        elif rule.rule_type == RuleType.COMPLETENESS:
-            return self._check_completeness(rule, df)
+        for index in indices:
+            rule = self.rules[index]
+            if rule.rule_type is RuleType.COMPLETENESS:
+                return None
+            if rule.rule_type is RuleType.CUSTOM and rule.check_expr is None:
+                return None
+            needed.update(self._rule_columns(rule))
         
-        elif rule.rule_type == RuleType.CUSTOM:
-            return self._check_custom(rule, df)
+        return [col for col in schema.names() if col in needed]
+    
+    def _run_callable_rules(
+        self, 
+        lf: pl.LazyFrame, 
+        schema: pl.Schema,
+        indices: List[int],
+        total_records: int,
+    ) -> Dict[int, ValidationResult]:
+        """
+        Run the Python-callable CUSTOM rules among the given ones concurrently.
         
-        else:
+        They are the only rules left outside the fused query and are
+        independent; Polars releases the GIL inside their operations.
+        Workers are capped since Polars runs on its own thread pool.
+        
+        Returns:
+            Mapping of rule index to its result
+        """
+        callables = [
+            index for index in indices
+            if self.rules[index].rule_type is RuleType.CUSTOM
+            and self.rules[index].check_expr is None
+            and self.rules[index].custom_check is not None
+        ]
+        if len(callables) < 2:
+            return {}  # Not worth a pool; run inline with the other rules
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(callables))) as pool:
+            futures = {
+                index: pool.submit(self._run_rule, self.rules[index], lf, schema, None, total_records)
+                for index in callables
+            }
+        
+        return {index: future.result() for index, future in futures.items()}
+    
+    def _skipped_result(self, rule: ValidationRule, total_records: int) -> ValidationResult:
+        """Placeholder for a rule not executed because validation halted."""
+        return ValidationResult(
+            rule_name=rule.name,
+            rule_type=rule.rule_type,
+            column=rule.column,
+            severity=rule.severity,
+            passed=False,
+            total_records=total_records,
+            valid_records=0,
+            invalid_records=0,
+            invalid_percentage=0.0,
+            message="Skipped after critical failure",
+            skipped=True,
+        )
+    
+    def _fused_exprs(self) -> Dict[int, pl.Expr]:
+        """
+        Build the count expression of every fusable rule.
+        
+        Returns:
+            Mapping of rule index to its aliased count expression
+        """
+        fused = {}
+        
+        for index, rule in enumerate(self.rules):
+            try:
+                expr = self._count_expr(rule)
+            except Exception:
+                continue  # Reported when the rule is executed on its own
+            if expr is not None:
+                fused[index] = expr.alias(f"__rule_{index}")
+        
+        return fused
+    
+    def _collect_counts(
+        self, 
+        lf: pl.LazyFrame, 
+        indices: List[int],
+        fused: Dict[int, pl.Expr],
+        lanes: Sequence[pl.Expr] = (),
+    ) -> Tuple[Dict[int, int], Optional[pl.DataFrame]]:
+        """
+        Evaluate the count expressions of the given fusable rules in one query.
+        
+        Args:
+            lanes: Per-row quarantine bit expressions, collected together
+                with the counts so the frame is scanned in the same pass
+        
+        Returns:
+            Mapping of rule index to its count, and the quarantine bits
+            (None without lanes). Rules missing from the mapping are
+            evaluated on their own by _execute_rule.
+        """
+        # Rules on missing columns were already set aside as infeasible
+        exprs = {index: fused[index] for index in indices if index in fused}
+        
+        queries = []
+        if exprs:
+            queries.append(lf.select(list(exprs.values())))
+        if lanes:
+            queries.append(lf.select(lanes))
+        if not queries:
+            return {}, None
+        
+        try:
+            frames = pl.collect_all(queries, engine="streaming")
+        except Exception as e:
+            # One bad rule (e.g. a type error) fails the whole query;
+            # fall back to per-rule execution to isolate it
+            self.logger.warning("Fused validation failed, running rules individually: %s", e)
+            return {}, None
+        
+        counts = dict(zip(exprs, frames[0].row(0), strict=True)) if exprs else {}
+        return counts, frames[-1] if lanes else None
+    
+    def _quarantine_lanes(self, indices: List[int]) -> Tuple[List[str], List[pl.Expr]]:
+        """
+        Build the packed per-row violation bits of the hard rules.
+        
+        Bit j of lane k is set when a row violates quarantine rule
+        64 * k + j, so up to 64 rules share one UInt64 column.
+        
+        Returns:
+            Indices of the quarantine rules in bit order, and one UInt64
+            expression per lane
+        """
+        indices_in_lanes = []
+        masks = []
+        
+        for index in indices:
+            rule = self.rules[index]
+            if rule.severity not in _HARD_SEVERITIES:
+                continue
+            try:
+                mask = self._violation_expr(rule)
+            except Exception:
+                continue  # Reported when the rule is executed
+            if mask is not None:
+                indices_in_lanes.append(index)
+                masks.append(mask)
+        
+        lanes = []
+        for lane, start in enumerate(range(0, len(masks), _LANE_BITS)):
+            bits = [
+                mask.cast(pl.UInt64) * pl.lit(1 << bit, dtype=pl.UInt64)
+                for bit, mask in enumerate(masks[start:start + _LANE_BITS])
+            ]
+            lanes.append(pl.sum_horizontal(bits).alias(f"__quarantine_bits_{lane}"))
+        
+        return indices_in_lanes, lanes
+    
+    def _clear_bits(self, bits: pl.DataFrame, positions: List[int]) -> pl.DataFrame:
+        """Quarantine bits with the given rule positions zeroed in every row."""
+        masks = [(1 << _LANE_BITS) - 1] * bits.width
+        for position in positions:
+            lane, bit = divmod(position, _LANE_BITS)
+            masks[lane] &= ~(1 << bit)
+        
+        return bits.select([
+            pl.col(name) & pl.lit(mask, dtype=pl.UInt64)
+            for name, mask in zip(bits.columns, masks, strict=True)
+        ])
+    
+    def _violation_expr(self, rule: ValidationRule) -> Optional[pl.Expr]:
+        """
+        Per-row mask of the records a rule counts as invalid. None for
+        rules without a row-level notion (completeness, callables).
+        """
+        if rule.rule_type is RuleType.NOT_NULL:
+            return pl.col(rule.column).is_null()
+        
+        elif rule.rule_type is RuleType.UNIQUE:
+            cols = rule.columns or [rule.column]
+            key = pl.col(cols[0]) if len(cols) == 1 else pl.struct(cols)
+            # Only repeats are invalid, matching the duplicate count
+            return key.is_first_distinct().not_()
+        
+        elif rule.rule_type is RuleType.RANGE:
+            valid = self._range_expr(rule)
+            return None if valid is None else valid.not_().fill_null(False)
+        
+        elif rule.rule_type is RuleType.PATTERN:
+            pattern = rule.params.get("pattern", ".*")
+            return pl.col(rule.column).str.contains(pattern).fill_null(False).not_()
+        
+        elif rule.rule_type in (RuleType.ALLOWED_VALUES, RuleType.REFERENTIAL):
+            return self._membership_expr(rule).not_().fill_null(False)
+        
+        elif rule.rule_type is RuleType.CUSTOM and rule.check_expr is not None:
+            return rule.check_expr.not_().fill_null(False)
+        
+        return None
+    
+    def _rule_columns(self, rule: ValidationRule) -> List[str]:
+        """Columns a rule reads (COMPLETENESS reads all and lists none)."""
+        if rule.check_expr is not None:
+            return rule.check_expr.meta.root_names()
+        return rule.columns or ([rule.column] if rule.column else [])
+    
+    def _count_expr(self, rule: ValidationRule) -> Optional[pl.Expr]:
+        """
+        Scalar expression behind a rule's result: the number of invalid
+        records, or of null cells for completeness. None for custom rules.
+        """
+        if rule.rule_type is RuleType.NOT_NULL:
+            return pl.col(rule.column).null_count()
+        
+        elif rule.rule_type is RuleType.UNIQUE:
+            cols = rule.columns or [rule.column]
+            # Count distinct keys without materializing a deduplicated frame
+            key = pl.col(cols[0]) if len(cols) == 1 else pl.struct(cols)
+            return pl.len() - key.n_unique()
+        
+        elif rule.rule_type is RuleType.RANGE:
+            valid = self._range_expr(rule)
+            return pl.lit(0) if valid is None else valid.not_().sum()
+        
+        elif rule.rule_type is RuleType.PATTERN:
+            pattern = rule.params.get("pattern", ".*")
+            return pl.col(rule.column).str.contains(pattern).fill_null(False).not_().sum()
+        
+        elif rule.rule_type in (RuleType.ALLOWED_VALUES, RuleType.REFERENTIAL):
+            return self._membership_expr(rule).not_().sum()
+        
+        elif rule.rule_type is RuleType.COMPLETENESS:
+            return pl.sum_horizontal(pl.all().null_count())
+        
+        elif rule.rule_type is RuleType.CUSTOM and rule.check_expr is not None:
+            return rule.check_expr.not_().sum()
+        
+        return None
+    
+    def _range_expr(self, rule: ValidationRule) -> Optional[pl.Expr]:
+        """Validity mask for range rules, None when no bound is set."""
+        conditions = []
+        if rule.params.get("min") is not None:
+            conditions.append(pl.col(rule.column) >= rule.params["min"])
+        if rule.params.get("max") is not None:
+            conditions.append(pl.col(rule.column) <= rule.params["max"])
+        
+        if not conditions:
+            return None
+        
+        return functools.reduce(operator.and_, conditions)
+    
+    def _membership_expr(self, rule: ValidationRule) -> pl.Expr:
+        """Validity mask for allowed-values and referential rules."""
+        if rule.rule_type is RuleType.ALLOWED_VALUES:
+            # Rules appended to self.rules directly were never prepared
+            allowed = rule.allowed_series
+            if allowed is None:
+                allowed = self._allowed_series(rule)
+            return pl.col(rule.column).is_in(_values_as_dtype_of(allowed, rule.column))
+        
+        ref_name = rule.params.get("reference")
+        if ref_name not in self._reference_data:
+            raise ValueError(f"Reference data not found: {ref_name}")
+        
+        return pl.col(rule.column).is_in(_values_as_dtype_of(self._reference_data[ref_name], rule.column))
+    
+    def _rule_count(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame, 
+        count: Optional[int],
+    ) -> int:
+        """Fused count for the rule, or evaluate its expression alone."""
+        if count is not None:
+            return int(count)
+        return int(lf.select(self._count_expr(rule)).collect(engine="streaming").item())
+    
+    def _execute_rule(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        schema: pl.Schema,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
+        """
+        Execute a single validation rule.
+        
+        Args:
+            rule: Rule to execute
+            lf: Frame to validate, as a lazy query
+            schema: Schema of the frame, resolved once per validate() call
+            total_records: Row count of the frame, fixed for the validate() call
+            count: Precomputed result of the rule's count expression, if fused
+        """
+        if rule.rule_type is RuleType.COMPLETENESS:
+            # The only check that needs the schema: cells = rows x columns
+            return self._check_completeness(rule, lf, schema, total_records, count)
+        
+        handler = self._DISPATCH.get(rule.rule_type)
+        if handler is None:
             raise ValueError(f"Unknown rule type: {rule.rule_type}")
+        return handler(self, rule, lf, total_records, count)
     
-    def _check_not_null(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_not_null(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check for null values in a column."""
         col = rule.column
-        null_count = df[col].null_count()
-        valid_count = len(df) - null_count
+        null_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - null_count
         
         return ValidationResult(
             rule_name=rule.name,
@@ -266,19 +900,25 @@ class ValidationEngine:
             column=col,
             severity=rule.severity,
             passed=null_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=null_count,
-            invalid_percentage=(null_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(null_count, total_records),
             message=f"{null_count} null values found" if null_count > 0 else "No null values",
         )
     
-    def _check_unique(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_unique(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check for duplicate values."""
         cols = rule.columns or [rule.column]
         
-        duplicate_count = len(df) - len(df.unique(subset=cols))
-        valid_count = len(df) - duplicate_count
+        duplicate_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - duplicate_count
         
         return ValidationResult(
             rule_name=rule.name,
@@ -286,37 +926,29 @@ class ValidationEngine:
             column=", ".join(cols),
             severity=rule.severity,
             passed=duplicate_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=duplicate_count,
-            invalid_percentage=(duplicate_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(duplicate_count, total_records),
             message=f"{duplicate_count} duplicate records found" if duplicate_count > 0 else "All records unique",
         )
     
-    def _check_range(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_range(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check if values are within a specified range."""
         col = rule.column
         min_val = rule.params.get("min")
         max_val = rule.params.get("max")
         
-        conditions = []
-        if min_val is not None:
-            conditions.append(pl.col(col) >= min_val)
-        if max_val is not None:
-            conditions.append(pl.col(col) <= max_val)
-        
-        if conditions:
-            combined = conditions[0]
-            for c in conditions[1:]:
-                combined = combined & c
-            
-            invalid_count = (~combined).sum()
-        else:
-            invalid_count = 0
-        
-        valid_count = len(df) - invalid_count
+        invalid_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - invalid_count
         
-        range_str = f"[{min_val or '-∞'}, {max_val or '∞'}]"
+        range_str = f"[{'-∞' if min_val is None else min_val}, {'∞' if max_val is None else max_val}]"
         
         return ValidationResult(
             rule_name=rule.name,
@@ -324,21 +956,24 @@ class ValidationEngine:
             column=col,
             severity=rule.severity,
             passed=invalid_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=invalid_count,
-            invalid_percentage=(invalid_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(invalid_count, total_records),
             message=f"{invalid_count} values outside range {range_str}" if invalid_count > 0 else f"All values within {range_str}",
         )
     
-    def _check_pattern(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_pattern(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check if string values match a regex pattern."""
         col = rule.column
-        pattern = rule.params.get("pattern", ".*")
-        
-        matches = df[col].str.contains(pattern).fill_null(False)
-        invalid_count = (~matches).sum()
-        valid_count = len(df) - invalid_count
+        invalid_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - invalid_count
         
         return ValidationResult(
             rule_name=rule.name,
@@ -346,24 +981,35 @@ class ValidationEngine:
             column=col,
             severity=rule.severity,
             passed=invalid_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=invalid_count,
-            invalid_percentage=(invalid_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(invalid_count, total_records),
             message=f"{invalid_count} values don't match pattern" if invalid_count > 0 else "All values match pattern",
         )
     
-    def _check_allowed_values(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_allowed_values(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check if values are in allowed set."""
         col = rule.column
-        allowed = set(rule.params.get("values", []))
+        invalid_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - invalid_count
         
-        is_valid = df[col].is_in(list(allowed))
-        invalid_count = (~is_valid).sum()
-        valid_count = len(df) - invalid_count
-        
-        # Get sample of invalid values
-        invalid_values = df.filter(~is_valid)[col].unique().head(5).to_list()
+        # Sample invalid values only when there are any (clean data skips the scan)
+        invalid_values = None
+        if invalid_count > 0:
+            invalid_values = (
+                lf.filter(self._membership_expr(rule).not_())
+                .select(pl.col(col).unique(maintain_order=False).head(5))
+                .collect(engine="streaming")
+                .to_series()
+                .to_list()
+            )
         
         return ValidationResult(
             rule_name=rule.name,
@@ -371,26 +1017,25 @@ class ValidationEngine:
             column=col,
             severity=rule.severity,
             passed=invalid_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=invalid_count,
-            invalid_percentage=(invalid_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(invalid_count, total_records),
             message=f"{invalid_count} invalid values" if invalid_count > 0 else "All values allowed",
-            sample_invalid=invalid_values if invalid_count > 0 else None,
+            sample_invalid=invalid_values,
         )
     
-    def _check_referential(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_referential(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check referential integrity against registered reference data."""
         col = rule.column
-        ref_name = rule.params.get("reference")
-        
-        if ref_name not in self._reference_data:
-            raise ValueError(f"Reference data not found: {ref_name}")
-        
-        valid_values = self._reference_data[ref_name]
-        is_valid = df[col].is_in(list(valid_values))
-        invalid_count = (~is_valid).sum()
-        valid_count = len(df) - invalid_count
+        invalid_count = self._rule_count(rule, lf, count)
+        valid_count = total_records - invalid_count
         
         return ValidationResult(
             rule_name=rule.name,
@@ -398,19 +1043,26 @@ class ValidationEngine:
             column=col,
             severity=rule.severity,
             passed=invalid_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=invalid_count,
-            invalid_percentage=(invalid_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(invalid_count, total_records),
             message=f"{invalid_count} orphan records" if invalid_count > 0 else "All references valid",
         )
     
-    def _check_completeness(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
+    def _check_completeness(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        schema: pl.Schema,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
         """Check overall completeness of the dataset."""
         threshold = rule.params.get("threshold", 0.95)  # 95% completeness required
         
-        total_cells = len(df) * len(df.columns)
-        null_cells = df.null_count().sum_horizontal()[0]
+        total_cells = total_records * len(schema)
+        null_cells = self._rule_count(rule, lf, count)
         completeness = 1 - (null_cells / total_cells) if total_cells > 0 else 1
         
         return ValidationResult(
@@ -419,22 +1071,32 @@ class ValidationEngine:
             column=None,
             severity=rule.severity,
             passed=completeness >= threshold,
-            total_records=len(df),
-            valid_records=int(completeness * len(df)),
-            invalid_records=int((1 - completeness) * len(df)),
+            total_records=total_records,
+            valid_records=int(completeness * total_records),
+            invalid_records=int((1 - completeness) * total_records),
             invalid_percentage=(1 - completeness) * 100,
             message=f"Completeness: {completeness:.2%} (threshold: {threshold:.0%})",
         )
     
-    def _check_custom(self, rule: ValidationRule, df: pl.DataFrame) -> ValidationResult:
-        """Execute custom validation function."""
-        if rule.custom_check is None:
-            raise ValueError("Custom rule must have custom_check function")
+    def _check_custom(
+        self, 
+        rule: ValidationRule, 
+        lf: pl.LazyFrame,
+        total_records: int,
+        count: Optional[int] = None,
+    ) -> ValidationResult:
+        """Execute custom validation expression or function."""
+        if rule.check_expr is not None:
+            invalid_count = self._rule_count(rule, lf, count)
+        elif rule.custom_check is not None:
+            # Custom check should return a boolean Series; it needs the
+            # frame materialized, so prefer check_expr for lazy input
+            is_valid = rule.custom_check(lf.collect())
+            invalid_count = int(is_valid.not_().sum())
+        else:
+            raise ValueError("Custom rule must have check_expr or custom_check")
         
-        # Custom check should return a boolean Series
-        is_valid = rule.custom_check(df)
-        invalid_count = (~is_valid).sum()
-        valid_count = len(df) - invalid_count
+        valid_count = total_records - invalid_count
         
         return ValidationResult(
             rule_name=rule.name,
@@ -442,38 +1104,24 @@ class ValidationEngine:
             column=rule.column,
             severity=rule.severity,
             passed=invalid_count == 0,
-            total_records=len(df),
+            total_records=total_records,
             valid_records=valid_count,
             invalid_records=invalid_count,
-            invalid_percentage=(invalid_count / len(df) * 100) if len(df) > 0 else 0,
+            invalid_percentage=_pct(invalid_count, total_records),
             message=rule.description or f"{invalid_count} records failed custom check",
         )
     
-    def _calculate_quality_score(self, results: List[ValidationResult]) -> float:
-        """Calculate weighted quality score based on rule results."""
-        if not results:
-            return 1.0
-        
-        # Weights by severity
-        weights = {
-            RuleSeverity.CRITICAL: 10,
-            RuleSeverity.ERROR: 5,
-            RuleSeverity.WARNING: 2,
-            RuleSeverity.INFO: 1,
-        }
-        
-        total_weight = 0
-        weighted_score = 0
-        
-        for result in results:
-            weight = weights[result.severity]
-            total_weight += weight
-            
-            # Score for each rule: % valid records
-            rule_score = result.valid_records / result.total_records if result.total_records > 0 else 0
-            weighted_score += weight * rule_score
-        
-        return weighted_score / total_weight if total_weight > 0 else 1.0
+    # Check method of each rule type, used by _execute_rule
+    # (COMPLETENESS also takes the schema and is called directly)
+    _DISPATCH: Dict[RuleType, Callable[..., ValidationResult]] = {
+        RuleType.NOT_NULL: _check_not_null,
+        RuleType.UNIQUE: _check_unique,
+        RuleType.RANGE: _check_range,
+        RuleType.PATTERN: _check_pattern,
+        RuleType.ALLOWED_VALUES: _check_allowed_values,
+        RuleType.REFERENTIAL: _check_referential,
+        RuleType.CUSTOM: _check_custom,
+    }
 
 
 class DataQualityError(Exception):
@@ -8,11 +8,22 @@ Author: Godson Kurishinkal
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from collections import deque
+from typing import (
+    Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+)
+import asyncio
+import functools
+import importlib.util
+import json
 import logging
+import math
+import os
+import re
 import time
 
 import polars as pl
@@ -38,6 +49,93 @@ class PaginationType(Enum):
     LINK = "link"  # Following Link headers
 
 
+# rel="next" target of an RFC 5988 Link header; commas inside <...> are legal
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>[^,]*?rel\s*=\s*"?next"?', re.IGNORECASE)
+
+
+def _compile_path(path: Optional[Union[str, Sequence[str]]]) -> Tuple[str, ...]:
+    """Keys of a response path; empty for the whole response."""
+    if not path:
+        return ()
+    if isinstance(path, str):
+        return tuple(path.split("."))
+    return tuple(path)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After value (delay-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _compile_getter(keys: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """
+    Build a getter for a fixed response path, unrolled into straight-line code.
+    
+    Returns the value at the path, or None where it breaks off (a missing
+    key or a non-dict). Generated once per extractor; it avoids the loop
+    and per-key bookkeeping of a generic walk on every page.
+    """
+    lines = ["def get(value):"]
+    for key in keys:
+        lines += [
+            "    if not isinstance(value, dict):",
+            "        return None",
+            f"    value = value.get({key!r})",
+        ]
+    lines.append("    return value")
+    
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["get"]
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Holds up to capacity tokens, refilled at rate tokens per second;
+    each request takes one. Allows bursts up to capacity without a
+    fixed gap between requests, then throttles to the sustained rate.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    async def acquire(self) -> None:
+        """Take a token, waiting for the refill if the bucket is empty."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                # The token that accrued while sleeping is taken right away
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+            self._tokens -= 1
+    
+    def refund(self) -> None:
+        """Return a token for a request the server rejected unprocessed (429)."""
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+
 @dataclass
 class APIConfig(ExtractorConfig):
     """Configuration for API extraction."""
@@ -56,8 +154,11 @@ class APIConfig(ExtractorConfig):
     oauth2_token_url: Optional[str] = None
     oauth2_client_id: Optional[str] = None
     oauth2_client_secret: Optional[str] = None
+    # JSON file keeping OAuth2 tokens (keyed by client_id) across runs
+    token_cache_path: Optional[Path] = None
     
     # Request settings
+    http2: bool = True  # Multiplex pages over one connection (needs h2)
     headers: Dict[str, str] = field(default_factory=dict)
     params: Dict[str, Any] = field(default_factory=dict)
     body: Optional[Dict[str, Any]] = None
@@ -70,19 +171,44 @@ class APIConfig(ExtractorConfig):
     page_param: str = "page"
     cursor_param: str = "cursor"
     limit_param: str = "limit"
+    max_concurrency: int = 8  # In-flight page requests once the total is known
     
     # Response parsing
-    data_path: str = "data"  # JSON path to data array
-    total_path: Optional[str] = "total"  # JSON path to total count
-    cursor_response_path: Optional[str] = "next_cursor"
+    # "orjson", "stdlib", or "polars": records are parsed by Polars' JSON
+    # reader straight into a DataFrame, never becoming Python dicts (needs
+    # a data_path of at most one key and no response_handler)
+    json_backend: str = "orjson"
+    # Infer the schema from this many records of the first page and build
+    # later pages against it, skipping per-page inference. A page with a
+    # key missing from the sample or a value of another type is inferred
+    # from all its records instead, with a warning. None infers every page
+    # from all its records.
+    schema_sample_size: Optional[int] = None
+    # Paths are dot notation ("results.items") or a list of keys
+    data_path: Union[str, Sequence[str]] = "data"  # JSON path to data array
+    total_path: Optional[Union[str, Sequence[str]]] = "total"  # JSON path to total count
+    cursor_response_path: Optional[Union[str, Sequence[str]]] = "next_cursor"
     
-    # Rate limiting
+    # Rate limiting (token bucket: bursts up to burst_capacity, then
+    # requests_per_second sustained)
     requests_per_second: float = 10.0
+    burst_capacity: int = 20
     rate_limit_header: str = "X-RateLimit-Remaining"
     retry_after_header: str = "Retry-After"
+    max_429_retries: int = 5  # Per request, before failing the attempt
     
     # Custom response handler
     response_handler: Optional[Callable] = None
+    
+    # Response paths split into keys once, not on every page
+    _data_keys: Tuple[str, ...] = field(init=False, repr=False, default=())
+    _total_keys: Tuple[str, ...] = field(init=False, repr=False, default=())
+    _cursor_keys: Tuple[str, ...] = field(init=False, repr=False, default=())
+    
+    def __post_init__(self) -> None:
+        self._data_keys = _compile_path(self.data_path)
+        self._total_keys = _compile_path(self.total_path)
+        self._cursor_keys = _compile_path(self.cursor_response_path)
 
 
 class APIExtractor(BaseExtractor):
@@ -94,6 +220,7 @@ class APIExtractor(BaseExtractor):
     - Various pagination strategies (offset, page, cursor, Link headers)
     - Rate limiting with automatic backoff
     - Nested JSON response parsing
+    - Concurrent page fetching (async) when the total count is known
     
     Example:
         config = APIConfig(
@@ -110,7 +237,7 @@ class APIExtractor(BaseExtractor):
         )
         
         extractor = APIExtractor(config)
-        df = extractor.extract()
+        df = extractor.extract()  # or: await extractor.extract_async()
         extractor.write_to_bronze(df)
     """
     
@@ -118,18 +245,85 @@ class APIExtractor(BaseExtractor):
         super().__init__(config)
         self.api_config = config
         self._session = None
-        self._last_request_time = 0.0
+        self._rate_limiter = None
+        self._refresh_lock = None
         self._oauth_token = None
-        self._oauth_expires_at = 0.0
+        self._oauth_refresh_token = None
+        self._oauth_expires_at = 0.0  # Wall clock, as persisted
+        self._oauth_valid_until = 0.0  # Monotonic, with a minute's margin
+        self._orjson = None
+        self._native_json = False
+        self._send = None
+        self._page_schema = None
+        # Kept off APIConfig so configs stay picklable
+        self._get_data = _compile_getter(config._data_keys)
+        self._get_total = _compile_getter(config._total_keys)
+        self._get_cursor = _compile_getter(config._cursor_keys)
+    
+    def extract(self) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """
+        Extract synchronously by running extract_async() in a new event loop.
+        
+        Use extract_async() when an event loop is already running.
+        """
+        return asyncio.run(self.extract_async())
     
     def _connect(self) -> None:
         """Initialize HTTP session with authentication."""
         import httpx
         
-        self._session = httpx.Client(
+        # Without the optional h2 package httpx cannot speak HTTP/2
+        http2 = self.api_config.http2 and importlib.util.find_spec("h2") is not None
+        if self.api_config.http2 and not http2:
+            self.logger.warning("h2 is not installed, falling back to HTTP/1.1")
+        
+        # One pooled client for the whole extraction: pages reuse its
+        # keep-alive (or multiplexed HTTP/2) connections
+        self._session = httpx.AsyncClient(
             timeout=httpx.Timeout(self.config.timeout_seconds),
             follow_redirects=True,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=30.0,
+            ),
+        )
+        # Per extraction: the bucket's lock belongs to the running event loop
+        self._rate_limiter = TokenBucket(
+            self.api_config.requests_per_second,
+            self.api_config.burst_capacity,
         )
+        self._refresh_lock = asyncio.Lock()
+        
+        json_backend = self.api_config.json_backend
+        if json_backend == "polars":
+            self._native_json = (
+                len(self.api_config._data_keys) <= 1
+                and self.api_config.response_handler is None
+            )
+            if not self._native_json:
+                self.logger.warning(
+                    "Polars JSON decoding needs a data_path of at most one key "
+                    "and no response_handler, using orjson"
+                )
+                json_backend = "orjson"
+        
+        if json_backend == "orjson":
+            try:
+                import orjson
+                self._orjson = orjson
+            except ImportError:
+                self.logger.warning("orjson is not installed, using stdlib json")
+        
+        # Resolve the HTTP verb once instead of on every request
+        method = self.api_config.method.upper()
+        if method == "GET":
+            self._send = self._session.get
+        elif method == "POST":
+            self._send = functools.partial(self._session.post, json=self.api_config.body)
+        else:
+            raise ExtractionError(f"Unsupported HTTP method: {self.api_config.method}")
         
         # Set up authentication
         self._setup_authentication()
@@ -145,144 +339,441 @@ class APIExtractor(BaseExtractor):
     
     def _setup_authentication(self) -> None:
         """Configure authentication based on auth_type."""
-        if self.api_config.auth_type == AuthType.API_KEY:
-            self._session.headers[self.api_config.api_key_header] = self.api_config.api_key
-            
-        elif self.api_config.auth_type == AuthType.BASIC:
-            import base64
-            credentials = f"{self.api_config.username}:{self.api_config.password}"
-            encoded = base64.b64encode(credentials.encode()).decode()
-            self._session.headers["Authorization"] = f"Basic {encoded}"
-            
-        elif self.api_config.auth_type == AuthType.BEARER:
-            self._session.headers["Authorization"] = f"Bearer {self.api_config.bearer_token}"
-            
-        elif self.api_config.auth_type == AuthType.OAUTH2:
-            self._refresh_oauth_token()
+        setup = self._AUTH_SETUP.get(self.api_config.auth_type)
+        if setup is not None:
+            setup(self)
     
-    def _refresh_oauth_token(self) -> None:
-        """Obtain or refresh OAuth2 token."""
-        if time.time() < self._oauth_expires_at - 60:  # 60 second buffer
-            return
+    def _setup_api_key(self) -> None:
+        """API key header."""
+        self._session.headers[self.api_config.api_key_header] = self.api_config.api_key
+    
+    def _setup_basic(self) -> None:
+        """HTTP Basic authorization header."""
+        import base64
+        credentials = f"{self.api_config.username}:{self.api_config.password}"
+        encoded = base64.b64encode(credentials.encode()).decode()
+        self._session.headers["Authorization"] = f"Basic {encoded}"
+    
+    def _setup_bearer(self) -> None:
+        """Static bearer token header."""
+        self._session.headers["Authorization"] = f"Bearer {self.api_config.bearer_token}"
+    
+    def _setup_oauth2(self) -> None:
+        """OAuth2 auth flow, starting from a cached token if one is valid."""
+        self._session.auth = self._oauth2_auth()
+        if not self._oauth_token_valid():
+            self._load_cached_token()
+    
+    def _oauth2_auth(self) -> Any:
+        """
+        httpx auth flow attaching the current OAuth2 token to each request.
         
+        The token is refreshed when near expiry, and once more if the API
+        rejects it with 401 (revoked before its stated expiry).
+        """
         import httpx
         
-        response = httpx.post(
-            self.api_config.oauth2_token_url,
-            data={
-                "grant_type": "client_credentials",
-                "client_id": self.api_config.oauth2_client_id,
-                "client_secret": self.api_config.oauth2_client_secret,
-            },
+        extractor = self
+        
+        class OAuth2Auth(httpx.Auth):
+            async def async_auth_flow(self, request):
+                await extractor._refresh_oauth_token()
+                token = extractor._oauth_token
+                request.headers["Authorization"] = f"Bearer {token}"
+                response = yield request
+                
+                if response.status_code == 401:
+                    # Concurrent pages may already have replaced the token
+                    if extractor._oauth_token == token:
+                        extractor._oauth_valid_until = 0.0
+                    await extractor._refresh_oauth_token()
+                    request.headers["Authorization"] = f"Bearer {extractor._oauth_token}"
+                    yield request
+        
+        return OAuth2Auth()
+    
+    def _oauth_token_valid(self) -> bool:
+        """Whether the current token is usable for at least another minute."""
+        return time.monotonic() < self._oauth_valid_until
+    
+    def _set_oauth_token(
+        self, 
+        access_token: str, 
+        expires_at: float, 
+        refresh_token: Optional[str] = None
+    ) -> None:
+        """Install a token expiring at expires_at (epoch seconds)."""
+        self._oauth_token = access_token
+        self._oauth_expires_at = expires_at
+        self._oauth_valid_until = time.monotonic() + (expires_at - time.time()) - 60
+        if refresh_token:
+            self._oauth_refresh_token = refresh_token
+    
+    def _read_token_cache(self) -> Dict[str, Any]:
+        """All cached tokens, or empty if the cache is missing or unreadable."""
+        try:
+            with open(self.api_config.token_cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _load_cached_token(self) -> None:
+        """Reuse this client's token (or refresh token) from an earlier run."""
+        if not self.api_config.token_cache_path:
+            return
+        
+        cached = self._read_token_cache().get(self.api_config.oauth2_client_id)
+        if not cached:
+            return
+        
+        self._set_oauth_token(
+            cached.get("access_token"),
+            cached.get("expires_at", 0.0),
+            cached.get("refresh_token"),
         )
+        self.logger.info("Loaded cached OAuth2 token")
+    
+    def _store_token(self) -> None:
+        """Persist the current token; replaced atomically so readers never see a partial file."""
+        path = Path(self.api_config.token_cache_path)
+        cache = self._read_token_cache()
+        cache[self.api_config.oauth2_client_id] = {
+            "access_token": self._oauth_token,
+            "expires_at": self._oauth_expires_at,
+            "refresh_token": self._oauth_refresh_token,
+        }
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    
+    async def _refresh_oauth_token(self) -> None:
+        """
+        Obtain or refresh OAuth2 token.
+        
+        Concurrent page requests finding the token expired queue on a
+        lock; the first refreshes it and the rest see the new token, so
+        the identity provider gets one request instead of one per page.
+        """
+        if self._oauth_token_valid():
+            return
+        
+        async with self._refresh_lock:
+            if not self._oauth_token_valid():
+                await self._fetch_oauth_token()
+    
+    async def _fetch_oauth_token(self) -> None:
+        """
+        Request a new OAuth2 token.
+        
+        Uses the refresh token grant when a refresh token is held, falling
+        back to the client credentials grant if it is rejected.
+        """
+        import httpx
+        
+        credentials = {
+            "client_id": self.api_config.oauth2_client_id,
+            "client_secret": self.api_config.oauth2_client_secret,
+        }
+        
+        # Separate client: the session's JSON content type and stale
+        # Authorization header must not reach the token endpoint
+        async with httpx.AsyncClient(timeout=httpx.Timeout(self.config.timeout_seconds)) as client:
+            response = None
+            if self._oauth_refresh_token:
+                response = await client.post(
+                    self.api_config.oauth2_token_url,
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": self._oauth_refresh_token,
+                        **credentials,
+                    },
+                )
+                if response.is_error:
+                    self.logger.info("OAuth2 refresh token rejected, re-authenticating")
+                    self._oauth_refresh_token = None
+                    response = None
+            
+            if response is None:
+                response = await client.post(
+                    self.api_config.oauth2_token_url,
+                    data={"grant_type": "client_credentials", **credentials},
+                )
         response.raise_for_status()
         
         token_data = response.json()
-        self._oauth_token = token_data["access_token"]
-        self._oauth_expires_at = time.time() + token_data.get("expires_in", 3600)
-        
-        self._session.headers["Authorization"] = f"Bearer {self._oauth_token}"
+        self._set_oauth_token(
+            token_data["access_token"],
+            time.time() + token_data.get("expires_in", 3600),
+            token_data.get("refresh_token"),
+        )
+        if self.api_config.token_cache_path:
+            self._store_token()
         self.logger.info("OAuth2 token refreshed")
     
-    def _extract(self) -> pl.DataFrame:
+    def _extract(self) -> Union[pl.DataFrame, pl.LazyFrame]:
         """Fetch all pages and combine into single DataFrame."""
-        all_data = []
-        page_count = 0
-        
-        if self.api_config.pagination_type == PaginationType.NONE:
-            # Single request
-            data = self._make_request()
-            all_data = self._extract_data_from_response(data)
-        
-        elif self.api_config.pagination_type == PaginationType.OFFSET:
-            all_data = self._paginate_offset()
+        return asyncio.run(self._extract_async())
+    
+    async def _extract_async(self) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """
+        Fetch all pages and combine into single DataFrame.
         
-        elif self.api_config.pagination_type == PaginationType.PAGE:
-            all_data = self._paginate_page()
+        With stream_to_bronze, pages are written to the Bronze file as
+        they arrive and a LazyFrame scanning it is returned instead.
+        """
+        self._page_schema = None
         
-        elif self.api_config.pagination_type == PaginationType.CURSOR:
-            all_data = self._paginate_cursor()
+        if self.config.stream_to_bronze:
+            return await self._stream_to_bronze(self._pages())
         
-        elif self.api_config.pagination_type == PaginationType.LINK:
-            all_data = self._paginate_link()
+        frames = [frame async for frame in self._pages()]
         
-        if not all_data:
+        if not frames:
             self.logger.warning("API returned no data")
             return pl.DataFrame()
         
-        # Convert to Polars DataFrame
-        return pl.DataFrame(all_data)
+        # Pages may differ in keys or inferred types; align them by name
+        # and widen to a common supertype
+        return pl.concat(frames, how="diagonal_relaxed", rechunk=True)
     
-    def _paginate_offset(self) -> List[Dict]:
-        """Handle offset-based pagination."""
-        all_data = []
-        offset = 0
-        page_count = 0
+    def _pages(self) -> AsyncIterator[pl.DataFrame]:
+        """Non-empty pages, in order, for the configured pagination type."""
+        paginator = self._PAGINATORS.get(self.api_config.pagination_type)
+        if paginator is None:
+            raise ExtractionError(
+                f"Unsupported pagination type: {self.api_config.pagination_type}"
+            )
+        return paginator(self)
+    
+    def _page_frame(self, data: Union[List[Dict], pl.DataFrame]) -> pl.DataFrame:
+        """
+        Convert one page of records to a DataFrame.
         
-        while True:
-            params = {
+        Pages are converted as they arrive so only one page of Python
+        dicts is alive at a time; each page's schema is inferred from all
+        its rows, or reused from the first page (see schema_sample_size).
+        """
+        if isinstance(data, pl.DataFrame):
+            return data  # Decoded natively (json_backend="polars")
+        
+        if self._page_schema is not None:
+            frame = self._frame_with_schema(data, self._page_schema)
+            if frame is not None:
+                return frame
+            self.logger.warning(
+                "Page does not match the sampled schema; inferring it from all records"
+            )
+            return pl.from_dicts(data, infer_schema_length=None)
+        
+        sample_size = self.api_config.schema_sample_size
+        frame = pl.from_dicts(data, infer_schema_length=sample_size)
+        
+        # An all-null sample column has no type yet; keep inferring until
+        # every column has one
+        if sample_size and pl.Null not in frame.schema.dtypes():
+            self._page_schema = frame.schema
+        return frame
+    
+    @staticmethod
+    def _frame_with_schema(data: List[Dict], schema: pl.Schema) -> Optional[pl.DataFrame]:
+        """
+        Build a page against a known schema, or None if it would lose data.
+        
+        pl.from_dicts with a schema drops unknown keys and truncates values
+        (1.7 into Int64 becomes 1), so columns are built as strict Series,
+        which raise on any value that does not fit the dtype.
+        """
+        names = set(schema.names())
+        if not all(map(names.issuperset, data)):
+            return None  # A record has a key outside the schema
+        
+        try:
+            return pl.DataFrame([
+                pl.Series(name, [record.get(name) for record in data], dtype=dtype, strict=True)
+                for name, dtype in schema.items()
+            ])
+        except (TypeError, pl.exceptions.PolarsError):
+            return None
+    
+    async def _paginate_none(self) -> AsyncIterator[pl.DataFrame]:
+        """Single request."""
+        data = self._extract_data_from_response(await self._make_request())
+        if len(data) > 0:
+            yield self._page_frame(data)
+    
+    async def _paginate_offset(self) -> AsyncIterator[pl.DataFrame]:
+        """
+        Handle offset-based pagination.
+        
+        When the first response reports the total count, the remaining
+        pages are fetched concurrently; otherwise pages are walked serially.
+        """
+        def params_for(offset: int) -> Dict[str, Any]:
+            return {
                 **self.api_config.params,
                 self.api_config.offset_param: offset,
                 self.api_config.limit_param: self.api_config.page_size,
             }
+        
+        response = await self._make_request(params=params_for(0))
+        data = self._extract_data_from_response(response)
+        
+        if len(data) == 0:
+            return
+        
+        yield self._page_frame(data)
+        total_records = len(data)
+        self.logger.info(f"Page 1: fetched {len(data)} records, total: {total_records}")
+        
+        if len(data) < self.api_config.page_size:
+            return  # Last page
+        
+        n_pages = self._known_page_count(response)
+        if n_pages is not None:
+            async for frame in self._fetch_concurrently(
+                [params_for(page * self.api_config.page_size) for page in range(1, n_pages)]
+            ):
+                total_records += frame.height
+                yield frame
+            self.logger.info(f"Fetched {n_pages} pages concurrently, total: {total_records}")
+            return
+        
+        offset = len(data)
+        page_count = 1
+        
+        while True:
+            if self.api_config.max_pages and page_count >= self.api_config.max_pages:
+                self.logger.warning(f"Max pages limit ({self.api_config.max_pages}) reached")
+                break
             
-            response = self._make_request(params=params)
+            response = await self._make_request(params=params_for(offset))
             data = self._extract_data_from_response(response)
             
-            if not data:
+            if len(data) == 0:
                 break
             
-            all_data.extend(data)
+            yield self._page_frame(data)
+            total_records += len(data)
             offset += len(data)
             page_count += 1
             
-            self.logger.info(f"Page {page_count}: fetched {len(data)} records, total: {len(all_data)}")
+            self.logger.info(f"Page {page_count}: fetched {len(data)} records, total: {total_records}")
             
             # Check limits
             if len(data) < self.api_config.page_size:
                 break  # Last page
-            
-            if self.api_config.max_pages and page_count >= self.api_config.max_pages:
-                self.logger.warning(f"Max pages limit ({self.api_config.max_pages}) reached")
-                break
-        
-        return all_data
     
-    def _paginate_page(self) -> List[Dict]:
-        """Handle page-number based pagination."""
-        all_data = []
-        page = 1
+    async def _paginate_page(self) -> AsyncIterator[pl.DataFrame]:
+        """
+        Handle page-number based pagination.
         
-        while True:
-            params = {
+        Like offset pagination, remaining pages are fetched concurrently
+        when the first response reports the total count.
+        """
+        def params_for(page: int) -> Dict[str, Any]:
+            return {
                 **self.api_config.params,
                 self.api_config.page_param: page,
                 self.api_config.limit_param: self.api_config.page_size,
             }
+        
+        response = await self._make_request(params=params_for(1))
+        data = self._extract_data_from_response(response)
+        
+        if len(data) == 0:
+            return
+        
+        yield self._page_frame(data)
+        total_records = len(data)
+        self.logger.info(f"Page 1: fetched {len(data)} records, total: {total_records}")
+        
+        if len(data) < self.api_config.page_size:
+            return
+        
+        n_pages = self._known_page_count(response)
+        if n_pages is not None:
+            async for frame in self._fetch_concurrently(
+                [params_for(page) for page in range(2, n_pages + 1)]
+            ):
+                total_records += frame.height
+                yield frame
+            self.logger.info(f"Fetched {n_pages} pages concurrently, total: {total_records}")
+            return
+        
+        page = 1
+        
+        while True:
+            if self.api_config.max_pages and page >= self.api_config.max_pages:
+                break
             
-            response = self._make_request(params=params)
+            page += 1
+            response = await self._make_request(params=params_for(page))
             data = self._extract_data_from_response(response)
             
-            if not data:
+            if len(data) == 0:
                 break
             
-            all_data.extend(data)
+            yield self._page_frame(data)
+            total_records += len(data)
             
-            self.logger.info(f"Page {page}: fetched {len(data)} records, total: {len(all_data)}")
+            self.logger.info(f"Page {page}: fetched {len(data)} records, total: {total_records}")
             
             if len(data) < self.api_config.page_size:
                 break
-            
-            if self.api_config.max_pages and page >= self.api_config.max_pages:
-                break
-            
-            page += 1
+    
+    def _known_page_count(self, response: Any) -> Optional[int]:
+        """Total number of pages from the response's total count, if reported."""
+        total = self._get_total(response)
+        if isinstance(total, str) and total.isdigit():
+            total = int(total)  # Some APIs report counts as strings
+        if not isinstance(total, int) or isinstance(total, bool):
+            return None
         
-        return all_data
+        n_pages = math.ceil(total / self.api_config.page_size)
+        if self.api_config.max_pages:
+            n_pages = min(n_pages, self.api_config.max_pages)
+        return n_pages
     
-    def _paginate_cursor(self) -> List[Dict]:
+    async def _fetch_concurrently(
+        self, 
+        params_list: List[Dict[str, Any]]
+    ) -> AsyncIterator[pl.DataFrame]:
+        """
+        Fetch pages concurrently, yielding them in request order.
+        
+        At most max_concurrency pages are held at once, whether in flight
+        or waiting for an earlier page. Empty pages (records deleted since
+        the total was read) are skipped.
+        """
+        async def fetch(params: Dict[str, Any]) -> Optional[pl.DataFrame]:
+            response = await self._make_request(params=params)
+            data = self._extract_data_from_response(response)
+            return self._page_frame(data) if len(data) > 0 else None
+        
+        pending = deque()
+        try:
+            for params in params_list:
+                if len(pending) >= self.api_config.max_concurrency:
+                    frame = await pending.popleft()
+                    if frame is not None:
+                        yield frame
+                pending.append(asyncio.ensure_future(fetch(params)))
+            
+            while pending:
+                frame = await pending.popleft()
+                if frame is not None:
+                    yield frame
+        finally:
+            # On failure or early exit, don't leave requests running
+            for task in pending:
+                task.cancel()
+    
+    async def _paginate_cursor(self) -> AsyncIterator[pl.DataFrame]:
         """Handle cursor-based pagination."""
-        all_data = []
         cursor = None
         page_count = 0
         
@@ -295,20 +786,17 @@ class APIExtractor(BaseExtractor):
             if cursor:
                 params[self.api_config.cursor_param] = cursor
             
-            response = self._make_request(params=params)
+            response = await self._make_request(params=params)
             data = self._extract_data_from_response(response)
             
-            if not data:
+            if len(data) == 0:
                 break
             
-            all_data.extend(data)
+            yield self._page_frame(data)
             page_count += 1
             
             # Get next cursor
-            cursor = self._get_nested_value(
-                response, 
-                self.api_config.cursor_response_path
-            )
+            cursor = self._get_cursor(response)
             
             self.logger.info(f"Page {page_count}: fetched {len(data)} records")
             
@@ -317,21 +805,18 @@ class APIExtractor(BaseExtractor):
             
             if self.api_config.max_pages and page_count >= self.api_config.max_pages:
                 break
-        
-        return all_data
     
-    def _paginate_link(self) -> List[Dict]:
+    async def _paginate_link(self) -> AsyncIterator[pl.DataFrame]:
         """Handle Link header based pagination (RFC 5988)."""
-        all_data = []
         url = f"{self.api_config.base_url}{self.api_config.endpoint}"
         page_count = 0
         
         while url:
-            response = self._make_request(full_url=url)
+            response = await self._make_request(full_url=url)
             data = self._extract_data_from_response(response["body"])
             
-            if data:
-                all_data.extend(data)
+            if len(data) > 0:
+                yield self._page_frame(data)
             
             page_count += 1
             self.logger.info(f"Page {page_count}: fetched {len(data)} records")
@@ -341,96 +826,153 @@ class APIExtractor(BaseExtractor):
             
             if self.api_config.max_pages and page_count >= self.api_config.max_pages:
                 break
-        
-        return all_data
     
-    def _make_request(
+    async def _make_request(
         self, 
         params: Optional[Dict] = None, 
         full_url: Optional[str] = None
     ) -> Any:
         """Execute HTTP request with rate limiting and retries."""
-        # Rate limiting
-        self._apply_rate_limit()
-        
-        # Refresh OAuth token if needed
-        if self.api_config.auth_type == AuthType.OAUTH2:
-            self._refresh_oauth_token()
-        
         url = full_url or f"{self.api_config.base_url}{self.api_config.endpoint}"
         
-        try:
-            if self.api_config.method.upper() == "GET":
-                response = self._session.get(url, params=params or self.api_config.params)
-            elif self.api_config.method.upper() == "POST":
-                response = self._session.post(
-                    url, 
-                    params=params,
-                    json=self.api_config.body
-                )
-            else:
-                raise ExtractionError(f"Unsupported HTTP method: {self.api_config.method}")
+        # httpx replaces the URL's query string with params, and Link
+        # header URLs already carry theirs
+        if params is None and "?" not in url:
+            params = self.api_config.params
+        
+        for retry in range(self.api_config.max_429_retries + 1):
+            await self._apply_rate_limit()
             
-            # Handle rate limit responses
-            if response.status_code == 429:
-                retry_after = int(response.headers.get(self.api_config.retry_after_header, 60))
-                self.logger.warning(f"Rate limited, waiting {retry_after}s")
-                time.sleep(retry_after)
-                return self._make_request(params, full_url)
+            try:
+                response = await self._send(url, params=params)
+            except Exception as e:
+                raise ExtractionError(f"API request failed: {str(e)}") from e
             
+            # Out of 429 retries, raise_for_status below fails the attempt
+            if response.status_code != 429 or retry == self.api_config.max_429_retries:
+                break
+            
+            retry_after = _parse_retry_after(
+                response.headers.get(self.api_config.retry_after_header)
+            )
+            if retry_after is None:
+                retry_after = 60
+            
+            # The rejected request didn't use its rate limit slot
+            self._rate_limiter.refund()
+            self.logger.warning(f"Rate limited, waiting {retry_after}s")
+            await asyncio.sleep(retry_after)
+        
+        try:
             response.raise_for_status()
             
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"{response.http_version} {response.status_code} {url}")
+            
             if full_url and self.api_config.pagination_type == PaginationType.LINK:
                 return {
-                    "body": response.json(),
+                    "body": self._parse_json(response),
                     "headers": dict(response.headers),
                 }
             
-            return response.json()
+            return self._parse_json(response)
             
         except Exception as e:
-            raise ExtractionError(f"API request failed: {str(e)}")
+            raise ExtractionError(f"API request failed: {str(e)}") from e
     
-    def _apply_rate_limit(self) -> None:
-        """Enforce rate limiting between requests."""
-        min_interval = 1.0 / self.api_config.requests_per_second
-        elapsed = time.time() - self._last_request_time
+    @staticmethod
+    def _http_error(error: BaseException) -> Any:
+        """The httpx.HTTPStatusError behind a failed attempt, if any."""
+        import httpx
         
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
+        while error is not None:
+            if isinstance(error, httpx.HTTPStatusError):
+                return error
+            error = error.__cause__
+        return None
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Client errors (bad credentials, missing endpoint) won't fix themselves."""
+        http_error = self._http_error(error)
+        if http_error is None:
+            return True  # Network errors, timeouts
+        status = http_error.response.status_code
+        return status >= 500 or status in (408, 429)
+    
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Honour Retry-After on 5xx responses (e.g. 503 during maintenance)."""
+        http_error = self._http_error(error)
+        if http_error is None:
+            return None
+        return _parse_retry_after(
+            http_error.response.headers.get(self.api_config.retry_after_header)
+        )
+    
+    def _parse_json(self, response: Any) -> Any:
+        """Decode a JSON response body with the configured backend."""
+        if self._native_json:
+            return self._parse_json_native(response.content)
+        if self._orjson is not None:
+            return self._orjson.loads(response.content)
+        return response.json()
+    
+    def _parse_json_native(self, body: bytes) -> Any:
+        """
+        Decode a response with Polars' JSON reader.
+        
+        Returns the response's other top-level fields as a dict, as the
+        other backends would, with the records at data_path already a
+        DataFrame (or [] if there are none).
+        """
+        if body.lstrip().startswith(b"[]"):
+            return []
         
-        self._last_request_time = time.time()
+        top = pl.read_json(body, infer_schema_length=None)
+        if not self.api_config._data_keys:
+            # The whole response is the records (or a single record)
+            return top
+        
+        key = self.api_config._data_keys[0]
+        if top.height != 1 or key not in top.columns:
+            return {}
+        
+        response = top.drop(key).row(0, named=True)
+        dtype = top.schema[key]
+        if isinstance(dtype, pl.Struct):
+            response[key] = top.select(key).unnest(key)
+        elif (
+            isinstance(dtype, pl.List)
+            and isinstance(dtype.inner, pl.Struct)
+            and top[key].list.len()[0] > 0
+        ):
+            response[key] = top.select(pl.col(key).explode()).unnest(key)
+        else:
+            response[key] = []
+        return response
     
-    def _extract_data_from_response(self, response: Dict) -> List[Dict]:
+    async def _apply_rate_limit(self) -> None:
+        """Enforce rate limiting across requests, including concurrent pages."""
+        await self._rate_limiter.acquire()
+    
+    def _extract_data_from_response(
+        self, 
+        response: Dict
+    ) -> Union[List[Dict], pl.DataFrame]:
         """Extract data array from nested JSON response."""
         if self.api_config.response_handler:
             return self.api_config.response_handler(response)
         
-        data = self._get_nested_value(response, self.api_config.data_path)
+        data = self._get_data(response)
         
-        if isinstance(data, list):
+        if isinstance(data, pl.DataFrame):
+            return data if data.height else []
+        elif isinstance(data, list):
             return data
         elif isinstance(data, dict):
             return [data]
         else:
             return []
     
-    def _get_nested_value(self, data: Dict, path: Optional[str]) -> Any:
-        """Get value from nested dictionary using dot notation path."""
-        if not path:
-            return data
-        
-        keys = path.split(".")
-        value = data
-        
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                return None
-        
-        return value
-    
     def _parse_link_header(self, headers: Dict) -> Optional[str]:
         """Parse Link header to find 'next' URL."""
         link_header = headers.get("Link", headers.get("link", ""))
@@ -438,22 +980,34 @@ class APIExtractor(BaseExtractor):
         if not link_header:
             return None
         
-        # Parse RFC 5988 Link header
-        for link in link_header.split(","):
-            parts = link.strip().split(";")
-            if len(parts) >= 2:
-                url = parts[0].strip().strip("<>")
-                rel = parts[1].strip()
-                if 'rel="next"' in rel or "rel=next" in rel:
-                    return url
-        
-        return None
+        match = _LINK_NEXT_RE.search(link_header)
+        return match.group(1) if match else None
     
     def _disconnect(self) -> None:
+        """Close HTTP session."""
+        asyncio.run(self._disconnect_async())
+    
+    async def _disconnect_async(self) -> None:
         """Close HTTP session."""
         if self._session:
-            self._session.close()
+            await self._session.aclose()
+            self._session = None
             self.logger.info("API session closed")
+    
+    _AUTH_SETUP: Dict[AuthType, Callable[["APIExtractor"], None]] = {
+        AuthType.API_KEY: _setup_api_key,
+        AuthType.BASIC: _setup_basic,
+        AuthType.BEARER: _setup_bearer,
+        AuthType.OAUTH2: _setup_oauth2,
+    }
+    
+    _PAGINATORS: Dict[PaginationType, Callable[..., AsyncIterator[pl.DataFrame]]] = {
+        PaginationType.NONE: _paginate_none,
+        PaginationType.OFFSET: _paginate_offset,
+        PaginationType.PAGE: _paginate_page,
+        PaginationType.CURSOR: _paginate_cursor,
+        PaginationType.LINK: _paginate_link,
+    }
 
 
 # Convenience factory functions
@@ -11,12 +11,21 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, NoReturn, Optional, Union
+import asyncio
+import contextlib
 import hashlib
+import importlib.util
 import logging
+import random
+import sys
+import time
 
 import polars as pl
 
+# Parquet codecs that take a compression level
+_LEVELED_CODECS = {"zstd", "gzip", "brotli"}
+
 
 @dataclass
 class ExtractionMetadata:
@@ -30,6 +39,7 @@ class ExtractionMetadata:
     status: str = "pending"
     error_message: Optional[str] = None
     checksum: Optional[str] = None
+    checksum_algorithm: Optional[str] = None
 
 
 @dataclass
@@ -41,10 +51,26 @@ class ExtractorConfig:
     batch_size: int = 100_000
     timeout_seconds: int = 300
     retry_attempts: int = 3
-    retry_delay_seconds: int = 5
+    retry_delay_seconds: int = 5  # First backoff; doubles per attempt
+    retry_backoff_cap: float = 60.0
+    retry_jitter: float = 1.0  # Up to this many random seconds added
     add_metadata: bool = True
     add_row_hash: bool = True
     hash_columns: List[str] = field(default_factory=list)
+    # "md5": stable hex digests, comparable across runs and library versions.
+    # "native": Polars' vectorized hash kernel, much faster but its values
+    # may change between Polars versions; fine when dedup is within a run.
+    row_hash_method: str = "md5"
+    # Bronze file checksum: "blake3" (SIMD, multi-threaded; optional
+    # package, falls back to sha256) or any hashlib algorithm name
+    checksum_algo: str = "blake3"
+    # Bronze Parquet compression: snappy, gzip, lz4, zstd; the level only
+    # applies to zstd, gzip and brotli and is ignored for the others
+    compression: str = "zstd"
+    compression_level: Optional[int] = 3
+    # Write pages to Bronze as they arrive (extractors that page through
+    # their source); extract() then returns a LazyFrame over the file
+    stream_to_bronze: bool = False
     extra_config: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -63,17 +89,29 @@ class BaseExtractor(ABC):
     - _connect(): Establish connection to source
     - _extract(): Perform the actual extraction
     - _disconnect(): Clean up connection
+    
+    Extractors with async I/O may also override _extract_async() (and
+    _disconnect_async()) and are then driven through extract_async().
     """
     
     def __init__(self, config: ExtractorConfig):
         self.config = config
         self.logger = logging.getLogger(f"extractor.{config.source_name}")
+        extract_timestamp = datetime.utcnow()
         self.metadata = ExtractionMetadata(
             source_system=config.source_name,
-            extract_timestamp=datetime.utcnow(),
-            extract_date=datetime.utcnow().strftime("%Y-%m-%d"),
+            extract_timestamp=extract_timestamp,
+            extract_date=extract_timestamp.strftime("%Y-%m-%d"),
         )
         self._connection = None
+        self._streamed_file: Optional[Path] = None
+        
+        # Fixed for the extractor's lifetime; built once, reused per page
+        self._meta_exprs = [
+            pl.lit(self.metadata.source_system).alias("_source_system"),
+            pl.lit(self.metadata.extract_timestamp).alias("_extract_timestamp"),
+            pl.lit(self.metadata.extract_date).alias("_extract_date"),
+        ]
     
     @abstractmethod
     def _connect(self) -> None:
@@ -103,19 +141,21 @@ class BaseExtractor(ABC):
         """Clean up connection resources."""
         pass
     
-    def extract(self) -> pl.DataFrame:
+    def extract(self) -> Union[pl.DataFrame, pl.LazyFrame]:
         """
         Main extraction method with retry logic and metadata handling.
         
         Returns:
-            pl.DataFrame: Extracted data with metadata columns
+            pl.DataFrame: Extracted data with metadata columns (a
+            LazyFrame over the Bronze file if streamed to it)
             
         Raises:
             ExtractionError: If extraction fails after all retries
         """
-        start_time = datetime.utcnow()
+        start_time = time.monotonic()
         attempt = 0
         last_error = None
+        self._streamed_file = None  # Not a file from an earlier run
         
         while attempt < self.config.retry_attempts:
             attempt += 1
@@ -134,27 +174,57 @@ class BaseExtractor(ABC):
                 # Disconnect
                 self._disconnect()
                 
-                # Add metadata columns
-                if self.config.add_metadata:
-                    df = self._add_metadata(df)
+                return self._finalize(df, start_time)
+                
+            except Exception as e:
+                last_error = e
+                self.logger.warning(
+                    f"Extraction attempt {attempt} failed: {str(e)}"
+                )
                 
-                # Add row hash for deduplication
-                if self.config.add_row_hash:
-                    df = self._add_row_hash(df)
+                with contextlib.suppress(Exception):
+                    self._disconnect()
                 
-                # Update metadata
-                self.metadata.record_count = len(df)
-                self.metadata.status = "success"
-                self.metadata.duration_seconds = (
-                    datetime.utcnow() - start_time
-                ).total_seconds()
+                if not self._is_retryable(e):
+                    break
                 
+                if attempt < self.config.retry_attempts:
+                    time.sleep(self._retry_delay(attempt, e))
+        
+        self._fail(last_error, start_time, attempt)
+    
+    async def extract_async(self) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """
+        Async counterpart of extract(), with the same retry logic.
+        
+        Lets extractors doing async I/O overlap their requests, and can
+        be awaited from an already running event loop.
+        
+        Returns:
+            pl.DataFrame: Extracted data with metadata columns (a
+            LazyFrame over the Bronze file if streamed to it)
+            
+        Raises:
+            ExtractionError: If extraction fails after all retries
+        """
+        start_time = time.monotonic()
+        attempt = 0
+        last_error = None
+        self._streamed_file = None  # Not a file from an earlier run
+        
+        while attempt < self.config.retry_attempts:
+            attempt += 1
+            try:
                 self.logger.info(
-                    f"Extraction complete: {len(df):,} records in "
-                    f"{self.metadata.duration_seconds:.2f}s"
+                    f"Extraction attempt {attempt}/{self.config.retry_attempts} "
+                    f"for {self.config.source_name}"
                 )
                 
-                return df
+                self._connect()
+                df = await self._extract_async()
+                await self._disconnect_async()
+                
+                return self._finalize(df, start_time)
                 
             except Exception as e:
                 last_error = e
@@ -162,95 +232,298 @@ class BaseExtractor(ABC):
                     f"Extraction attempt {attempt} failed: {str(e)}"
                 )
                 
-                if attempt < self.config.retry_attempts:
-                    import time
-                    time.sleep(self.config.retry_delay_seconds * attempt)
+                with contextlib.suppress(Exception):
+                    await self._disconnect_async()
                 
-                try:
-                    self._disconnect()
-                except Exception:
-                    pass
+                if not self._is_retryable(e):
+                    break
+                
+                if attempt < self.config.retry_attempts:
+                    await asyncio.sleep(self._retry_delay(attempt, e))
+        
+        self._fail(last_error, start_time, attempt)
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Whether a failed attempt may succeed on retry (default: always)."""
+        return True
+    
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Seconds the source asked us to wait before retrying, if it said."""
+        return None
+    
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Delay before the next attempt.
+        
+        The source's requested delay if given, otherwise capped exponential
+        backoff with jitter so parallel extractors don't retry in lockstep.
+        """
+        delay = self._retry_after(error)
+        if delay is not None:
+            return delay
+        
+        backoff = self.config.retry_delay_seconds * 2 ** (attempt - 1)
+        return min(self.config.retry_backoff_cap, backoff) + random.uniform(
+            0, self.config.retry_jitter
+        )
+    
+    async def _extract_async(self) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Perform the extraction; runs the synchronous _extract() by default."""
+        return self._extract()
+    
+    async def _disconnect_async(self) -> None:
+        """Clean up connection resources; runs _disconnect() by default."""
+        self._disconnect()
+    
+    def _finalize(
+        self, 
+        df: Union[pl.DataFrame, pl.LazyFrame], 
+        start_time: float
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Add metadata and row hash columns and record a successful run."""
+        # Streamed extractions added the columns and counted rows per page
+        if isinstance(df, pl.DataFrame):
+            df = self._add_columns(df)
+            self.metadata.record_count = len(df)
+        
+        # Update metadata
+        self.metadata.status = "success"
+        self.metadata.duration_seconds = time.monotonic() - start_time
         
-        # All retries exhausted
+        self.logger.info(
+            f"Extraction complete: {self.metadata.record_count:,} records in "
+            f"{self.metadata.duration_seconds:.2f}s"
+        )
+        
+        return df
+    
+    def _fail(
+        self, 
+        last_error: Optional[Exception], 
+        start_time: float, 
+        attempts: int
+    ) -> NoReturn:
+        """Record a failed run after all retries and raise ExtractionError."""
         self.metadata.status = "failed"
         self.metadata.error_message = str(last_error)
-        self.metadata.duration_seconds = (
-            datetime.utcnow() - start_time
-        ).total_seconds()
+        self.metadata.duration_seconds = time.monotonic() - start_time
         
         self.logger.error(
-            f"Extraction failed after {self.config.retry_attempts} attempts: "
+            f"Extraction failed after {attempts} attempts: "
             f"{str(last_error)}"
         )
         raise ExtractionError(
             f"Extraction failed for {self.config.source_name}: {str(last_error)}"
         )
     
+    def _add_columns(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Add the configured metadata and row hash columns."""
+        # Add metadata columns
+        if self.config.add_metadata:
+            df = self._add_metadata(df)
+        
+        # Add row hash for deduplication
+        if self.config.add_row_hash:
+            df = self._add_row_hash(df)
+        
+        return df
+    
     def _add_metadata(self, df: pl.DataFrame) -> pl.DataFrame:
         """Add standard metadata columns to extracted data."""
+        # file_name may be set during extraction (e.g. RPA downloads)
         return df.with_columns([
-            pl.lit(self.metadata.source_system).alias("_source_system"),
-            pl.lit(self.metadata.extract_timestamp).alias("_extract_timestamp"),
-            pl.lit(self.metadata.extract_date).alias("_extract_date"),
-            pl.lit(self.metadata.file_name).alias("_file_name"),
+            *self._meta_exprs,
+            pl.lit(self.metadata.file_name, dtype=pl.Utf8).alias("_file_name"),
         ])
     
     def _add_row_hash(self, df: pl.DataFrame) -> pl.DataFrame:
-        """Add MD5 hash column for row-level deduplication."""
+        """Add hash column for row-level deduplication (see row_hash_method)."""
         hash_cols = self.config.hash_columns or df.columns[:3]
         
-        # Concatenate hash columns and compute MD5
+        if self.config.row_hash_method == "native":
+            # Hashes straight from the column buffers (nulls included),
+            # without building a concatenated string column
+            return df.with_columns(
+                df.select(hash_cols).hash_rows(seed=0).cast(pl.Utf8).alias("_row_hash")
+            )
+        
+        # Concatenate hash columns
         hash_expr = pl.concat_str(
             [pl.col(c).cast(pl.Utf8).fill_null("") for c in hash_cols],
             separator="|"
         )
         
+        # MD5 over the whole column in one pass rather than a per-row UDF
+        keys = df.select(hash_expr).to_series().to_list()
         return df.with_columns(
-            hash_expr.map_elements(
-                lambda x: hashlib.md5(x.encode()).hexdigest(),
-                return_dtype=pl.Utf8
-            ).alias("_row_hash")
+            pl.Series(
+                "_row_hash",
+                [hashlib.md5(key.encode()).hexdigest() for key in keys],
+                dtype=pl.Utf8,
+            )
         )
     
-    def write_to_bronze(self, df: pl.DataFrame) -> Path:
+    def write_to_bronze(self, df: Union[pl.DataFrame, pl.LazyFrame]) -> Path:
         """
         Write extracted data to Bronze layer with date partitioning.
         
         Args:
-            df: DataFrame to write
+            df: DataFrame to write, or the LazyFrame returned by a
+                streamed extraction (already written)
             
         Returns:
             Path: Path where data was written
         """
-        # Build partition path
-        partition_path = (
-            self.config.bronze_path 
-            / self.config.target_table 
-            / f"extract_date={self.metadata.extract_date}"
-        )
-        partition_path.mkdir(parents=True, exist_ok=True)
+        if isinstance(df, pl.LazyFrame) and self._streamed_file is not None:
+            return self._streamed_file
         
         # Write as Parquet
-        output_file = partition_path / "data.parquet"
+        output_file = self._bronze_file()
         df.write_parquet(
             output_file,
-            compression="snappy",
+            compression=self.config.compression,
+            compression_level=self.config.compression_level,
             statistics=True,
         )
         
-        # Compute checksum
-        self.metadata.checksum = self._compute_file_checksum(output_file)
+        self._record_checksum(output_file)
         
         self.logger.info(f"Written {len(df):,} records to {output_file}")
         return output_file
     
-    def _compute_file_checksum(self, file_path: Path) -> str:
-        """Compute MD5 checksum of written file."""
-        md5 = hashlib.md5()
+    async def _stream_to_bronze(
+        self, 
+        pages: AsyncIterator[pl.DataFrame]
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """
+        Write pages to the Bronze file as they arrive.
+        
+        Only one page is held in memory at a time. The first page fixes
+        the file's columns and types: later pages are cast to them, with
+        missing columns null and extra columns dropped.
+        
+        Returns:
+            pl.LazyFrame: Scan of the written file (an empty DataFrame
+            if no page arrived)
+        """
+        import pyarrow.parquet as pq
+        
+        output_file = self._bronze_file()
+        writer = None
+        schema = None
+        dropped = set()
+        record_count = 0
+        
+        try:
+            async for page in pages:
+                if schema is None:
+                    schema = page.schema
+                else:
+                    page = self._conform_page(page, schema, dropped)
+                
+                table = self._add_columns(page).to_arrow()
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        output_file,
+                        table.schema,
+                        compression=self.config.compression,
+                        # pyarrow rejects a level for codecs without one
+                        compression_level=(
+                            self.config.compression_level
+                            if self.config.compression in _LEVELED_CODECS
+                            else None
+                        ),
+                    )
+                writer.write_table(table)
+                record_count += page.height
+        except BaseException:
+            # Don't leave a partial file for the next attempt or a reader
+            if writer is not None:
+                writer.close()
+            output_file.unlink(missing_ok=True)
+            raise
+        
+        if writer is None:
+            # Nothing was streamed; finalized and written like any empty extraction
+            self.logger.warning("No data to write to Bronze")
+            return pl.DataFrame()
+        
+        writer.close()
+        self._record_checksum(output_file)
+        self.metadata.record_count = record_count
+        self._streamed_file = output_file
+        
+        self.logger.info(f"Streamed {record_count:,} records to {output_file}")
+        return pl.scan_parquet(output_file)
+    
+    def _conform_page(
+        self, 
+        page: pl.DataFrame, 
+        schema: pl.Schema, 
+        dropped: set
+    ) -> pl.DataFrame:
+        """Cast a page to the streamed file's schema."""
+        if page.schema == schema:
+            return page
+        
+        # Warn once per column, not on every page
+        extra = [
+            name for name in page.columns
+            if name not in schema and name not in dropped
+        ]
+        if extra:
+            dropped.update(extra)
+            self.logger.warning(f"Dropping columns missing from the first page: {extra}")
+        
+        return page.select([
+            pl.col(name).cast(dtype) if name in page.schema
+            else pl.lit(None, dtype=dtype).alias(name)
+            for name, dtype in schema.items()
+        ])
+    
+    def _bronze_file(self) -> Path:
+        """Bronze Parquet file for this extraction, creating its partition."""
+        partition_path = (
+            self.config.bronze_path 
+            / self.config.target_table 
+            / f"extract_date={self.metadata.extract_date}"
+        )
+        partition_path.mkdir(parents=True, exist_ok=True)
+        return partition_path / "data.parquet"
+    
+    def _record_checksum(self, output_file: Path) -> None:
+        """Checksum the written file into the extraction metadata."""
+        self.metadata.checksum_algorithm = self._checksum_algorithm()
+        self.metadata.checksum = self._compute_file_checksum(
+            output_file, self.metadata.checksum_algorithm
+        )
+    
+    def _checksum_algorithm(self) -> str:
+        """Configured checksum algorithm, or sha256 if blake3 is unavailable."""
+        algo = self.config.checksum_algo
+        if algo == "blake3" and importlib.util.find_spec("blake3") is None:
+            self.logger.debug("blake3 is not installed, using sha256 checksums")
+            return "sha256"
+        return algo
+    
+    def _compute_file_checksum(self, file_path: Path, algo: str = "md5") -> str:
+        """Compute checksum of written file."""
+        if algo == "blake3":
+            import blake3
+            
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()
+        
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                md5.update(chunk)
-        return md5.hexdigest()
+            if sys.version_info >= (3, 11):
+                # Hashes with large reads, outside the Python loop
+                return hashlib.file_digest(f, algo).hexdigest()
+            
+            hasher = hashlib.new(algo)
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
     
     def get_metadata(self) -> Dict[str, Any]:
         """Return extraction metadata as dictionary."""
@@ -264,6 +537,7 @@ class BaseExtractor(ABC):
             "status": self.metadata.status,
             "error_message": self.metadata.error_message,
             "checksum": self.metadata.checksum,
+            "checksum_algorithm": self.metadata.checksum_algorithm,
         }
 
 
@@ -7,17 +7,55 @@ Supports both full and incremental extraction patterns.
 Author: Godson Kurishinkal
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+import datetime
+import decimal
 import logging
+import queue
+import threading
 
 import polars as pl
 
 from .base_extractor import BaseExtractor, ExtractorConfig, ExtractionError
 
 
+# URI schemes for building connection_uri from the ODBC driver name
+_URI_SCHEMES = {
+    "sql server": "mssql",
+    "oracle": "oracle",
+    "postgres": "postgresql",
+}
+
+# sqlglot dialects for injecting incremental filters into custom queries
+_SQL_DIALECTS = {
+    "sql server": "tsql",
+    "oracle": "oracle",
+    "postgres": "postgres",
+}
+
+# Python types of partition_on bounds that can be split into ranges
+# (datetime.datetime is a datetime.date)
+_PARTITION_TYPES = (int, float, decimal.Decimal, datetime.date)
+
+# Polars dtypes for the Python types pyodbc reports in cursor.description
+_TYPE_CODE_DTYPES = {
+    str: pl.Utf8,
+    int: pl.Int64,
+    float: pl.Float64,
+    bool: pl.Boolean,
+    bytes: pl.Binary,
+    bytearray: pl.Binary,
+    datetime.datetime: pl.Datetime,
+    datetime.date: pl.Date,
+    datetime.time: pl.Time,
+}
+
+
 @dataclass
 class DatabaseConfig(ExtractorConfig):
     """Configuration for database extraction."""
@@ -41,8 +79,25 @@ class DatabaseConfig(ExtractorConfig):
     last_extracted_value: Optional[str] = None
     
     # Performance settings
+    # Rows per fetch; 10k-50k balances round trips against memory
     fetch_size: int = 10_000
+    # Cursor arraysize: rows the driver fetches per round trip
+    # (defaults to fetch_size)
+    arraysize: Optional[int] = None
     enable_fast_executemany: bool = True
+    # Idle pyodbc connections kept per server/database/user for reuse
+    # across extractors and helper calls (0 disables pooling)
+    pool_size: int = 5
+    # "pyodbc" fetches rows as Python objects; "connectorx" and "adbc"
+    # read straight into Arrow buffers (optional packages)
+    reader: str = "pyodbc"
+    connection_uri: Optional[str] = None  # Built from the settings above if unset
+    # Split reads on a numeric or date/datetime column into partition_num
+    # ranges read in parallel (pyodbc: one connection per range).
+    # partition_range gives the (min, max) to split; queried if unset.
+    partition_on: Optional[str] = None
+    partition_num: int = 4
+    partition_range: Optional[Tuple[Any, Any]] = None
 
 
 class DatabaseExtractor(BaseExtractor):
@@ -50,7 +105,7 @@ class DatabaseExtractor(BaseExtractor):
     Extractor for relational databases.
     
     Supports:
-    - SQL Server, Oracle, PostgreSQL via pyodbc
+    - SQL Server, Oracle, PostgreSQL via pyodbc, connectorx or ADBC
     - Full and incremental extraction
     - Custom SQL queries or table-based extraction
     - Chunked reading for large tables
@@ -72,6 +127,10 @@ class DatabaseExtractor(BaseExtractor):
         extractor.write_to_bronze(df)
     """
     
+    # Idle pyodbc connections keyed by (driver, host, port, database, username)
+    _pools: Dict[Tuple[Any, ...], "queue.Queue[Any]"] = {}
+    _pools_lock = threading.Lock()
+    
     def __init__(self, config: DatabaseConfig):
         super().__init__(config)
         self.db_config = config
@@ -79,24 +138,23 @@ class DatabaseExtractor(BaseExtractor):
     
     def _connect(self) -> None:
         """Establish database connection via pyodbc."""
-        import pyodbc
+        if self.db_config.reader != "pyodbc":
+            # connectorx and ADBC connect per query in _extract
+            return
         
-        connection_string = (
-            f"DRIVER={{{self.db_config.driver}}};"
-            f"SERVER={self.db_config.host},{self.db_config.port};"
-            f"DATABASE={self.db_config.database};"
-            f"UID={self.db_config.username};"
-            f"PWD={self.db_config.password};"
-            "TrustServerCertificate=yes;"
-        )
+        self._connect_pyodbc()
+    
+    def _connect_pyodbc(self) -> None:
+        """
+        Take a pooled pyodbc connection whatever the reader.
+        
+        The metadata helpers (test_connection, get_table_schema,
+        get_row_count) bind parameters, so they always go through pyodbc.
+        """
+        import pyodbc
         
         try:
-            self._connection = pyodbc.connect(
-                connection_string,
-                timeout=self.config.timeout_seconds,
-            )
-            self._connection.setdecoding(pyodbc.SQL_CHAR, encoding='utf-8')
-            self._connection.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-8')
+            self._connection = self._acquire_connection()
             
             if self.db_config.enable_fast_executemany:
                 self._cursor = self._connection.cursor()
@@ -109,59 +167,326 @@ class DatabaseExtractor(BaseExtractor):
         except pyodbc.Error as e:
             raise ConnectionError(f"Database connection failed: {str(e)}")
     
+    def _pool(self) -> "queue.Queue[Any]":
+        """Idle connection pool shared by extractors with the same login."""
+        key = (
+            self.db_config.driver,
+            self.db_config.host,
+            self.db_config.port,
+            self.db_config.database,
+            self.db_config.username,
+        )
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = queue.Queue(maxsize=self.db_config.pool_size)
+            return pool
+    
+    def _acquire_connection(self) -> Any:
+        """Take an idle pooled connection, or open a new one."""
+        if self.db_config.pool_size > 0:
+            try:
+                return self._pool().get_nowait()
+            except queue.Empty:
+                pass
+        return self._open_connection()
+    
+    def _release_connection(self, connection: Any) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        if self.db_config.pool_size > 0:
+            try:
+                # Ends any open transaction; raises if the connection is dead
+                connection.rollback()
+                self._pool().put_nowait(connection)
+                return
+            except queue.Full:
+                pass
+            except Exception as e:
+                self.logger.debug(f"Discarding pooled connection: {str(e)}")
+        connection.close()
+    
+    def _open_connection(self) -> Any:
+        """Open a new pyodbc connection."""
+        import pyodbc
+        
+        connection_string = (
+            f"DRIVER={{{self.db_config.driver}}};"
+            f"SERVER={self.db_config.host},{self.db_config.port};"
+            f"DATABASE={self.db_config.database};"
+            f"UID={self.db_config.username};"
+            f"PWD={self.db_config.password};"
+            "TrustServerCertificate=yes;"
+        )
+        
+        connection = pyodbc.connect(
+            connection_string,
+            timeout=self.config.timeout_seconds,
+        )
+        connection.setdecoding(pyodbc.SQL_CHAR, encoding='utf-8')
+        connection.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-8')
+        return connection
+    
     def _extract(self) -> pl.DataFrame:
         """Execute query and return results as Polars DataFrame."""
-        query = self._build_query()
+        query, params = self._build_query()
         
         self.logger.info(f"Executing query: {query[:200]}...")
         
+        if self.db_config.reader != "pyodbc":
+            return self._extract_arrow(query)
+        
         try:
-            # Execute query
-            cursor = self._connection.cursor()
+            if self.db_config.partition_on:
+                df = self._extract_partitioned(query, params)
+            else:
+                df = self._fetch_frame(self._connection, query, params)
+        except Exception as e:
+            raise ExtractionError(f"Query execution failed: {str(e)}")
+        
+        if df.is_empty():
+            self.logger.warning("Query returned no results")
+        return df
+    
+    def _fetch_frame(
+        self, 
+        connection: Any, 
+        query: str, 
+        params: Sequence[Any] = ()
+    ) -> pl.DataFrame:
+        """Execute a query on a connection and fetch the result in chunks."""
+        # arraysize lets the driver fetch rows in batches rather than one
+        # round trip per row
+        cursor = connection.cursor()
+        cursor.arraysize = self.db_config.arraysize or self.db_config.fetch_size
+        if params:
+            cursor.execute(query, params)
+        else:
             cursor.execute(query)
-            
-            # Get column names
-            columns = [desc[0] for desc in cursor.description]
-            
-            # Fetch in chunks for memory efficiency
-            all_rows = []
+        
+        # Get column names and the types the driver reports
+        columns = [desc[0] for desc in cursor.description]
+        dtypes = self._description_dtypes(cursor.description)
+        
+        # Fetch in chunks for memory efficiency; each chunk becomes a frame
+        # right away, so at most two chunks are Python objects at once.
+        # pyodbc releases the GIL in fetchmany, so the next chunk is fetched
+        # on a worker thread while this one is converted.
+        frames = []
+        row_count = 0
+        fetch_size = self.db_config.fetch_size
+        with ThreadPoolExecutor(max_workers=1) as fetcher:
+            pending = fetcher.submit(cursor.fetchmany, fetch_size)
             while True:
-                rows = cursor.fetchmany(self.db_config.fetch_size)
+                rows = pending.result()
                 if not rows:
                     break
-                all_rows.extend(rows)
+                pending = fetcher.submit(cursor.fetchmany, fetch_size)
+                frames.append(self._chunk_frame(rows, columns, dtypes))
+                row_count += len(rows)
+                del rows
                 
-                if len(all_rows) % 100_000 == 0:
-                    self.logger.info(f"Fetched {len(all_rows):,} rows...")
-            
+                if row_count % 100_000 == 0:
+                    self.logger.info(f"Fetched {row_count:,} rows...")
+        
+        cursor.close()
+        
+        if not frames:
+            return pl.DataFrame(schema={
+                col: dtype or pl.Utf8 for col, dtype in zip(columns, dtypes, strict=True)
+            })
+        
+        # Inferred columns may differ by chunk (e.g. all null in one)
+        return pl.concat(frames, how="vertical_relaxed", rechunk=True)
+    
+    def _extract_partitioned(self, query: str, params: Sequence[Any] = ()) -> pl.DataFrame:
+        """
+        Read partition_on ranges in parallel, one connection per range.
+        
+        pyodbc releases the GIL while the driver executes and fetches, so
+        the threads overlap their database round trips.
+        """
+        predicates = self._partition_predicates(query, params)
+        if len(predicates) <= 1:
+            return self._fetch_frame(self._connection, query, params)
+        
+        def fetch(predicate: Tuple[str, Tuple[Any, ...]]) -> pl.DataFrame:
+            condition, bounds = predicate
+            connection = self._open_connection()
+            try:
+                return self._fetch_frame(
+                    connection,
+                    f"SELECT * FROM ({query}) base_query WHERE {condition}",
+                    (*params, *bounds),
+                )
+            finally:
+                connection.close()
+        
+        self.logger.info(f"Reading {len(predicates)} partitions on {self.db_config.partition_on}")
+        with ThreadPoolExecutor(max_workers=len(predicates)) as pool:
+            frames = list(pool.map(fetch, predicates))
+        
+        # Empty partitions carry placeholder dtypes for inferred columns
+        non_empty = [frame for frame in frames if not frame.is_empty()]
+        if not non_empty:
+            return frames[0]
+        return pl.concat(non_empty, how="vertical_relaxed", rechunk=True)
+    
+    def _partition_predicates(
+        self, 
+        query: str, 
+        params: Sequence[Any] = ()
+    ) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """
+        WHERE predicates splitting the query into partition_num ranges.
+        
+        The outer ranges are open-ended and the first also takes NULL keys,
+        so every row lands in exactly one partition even if partition_range
+        is narrower than the data. Bounds are bound as parameters, so date
+        and datetime keys compare as their own type.
+        
+        Returns:
+            (predicate, bound parameters) per partition
+        """
+        column = self.db_config.partition_on
+        if self.db_config.partition_range:
+            low, high = self.db_config.partition_range
+        else:
+            cursor = self._connection.cursor()
+            bounds_query = f"SELECT MIN({column}), MAX({column}) FROM ({query}) base_query"
+            if params:
+                cursor.execute(bounds_query, params)
+            else:
+                cursor.execute(bounds_query)
+            low, high = cursor.fetchone()
             cursor.close()
-            
-            # Convert to Polars DataFrame
-            if not all_rows:
-                self.logger.warning("Query returned no results")
-                return pl.DataFrame(schema={col: pl.Utf8 for col in columns})
-            
-            df = pl.DataFrame(
-                data=all_rows,
-                schema=columns,
-                orient="row",
+        
+        if low is None or high is None:
+            return []
+        if not all(isinstance(value, _PARTITION_TYPES) for value in (low, high)):
+            raise ExtractionError(
+                f"partition_on column {column} must be numeric or date/datetime, "
+                f"got {type(low).__name__}"
+            )
+        if high <= low:
+            return []
+        
+        n = self.db_config.partition_num
+        if isinstance(low, int) and isinstance(high, int):
+            n = min(n, high - low + 1)
+            step = -(-(high - low + 1) // n)  # Ceiling division
+        else:
+            step = (high - low) / n
+        
+        # Date steps shorter than a day repeat a bound; drop the duplicates
+        bounds = list(dict.fromkeys(low + step * i for i in range(1, n)))
+        if not bounds:
+            return []
+        
+        predicates = [(f"({column} < ? OR {column} IS NULL)", (bounds[0],))]
+        for start, end in zip(bounds, bounds[1:], strict=False):
+            predicates.append((f"{column} >= ? AND {column} < ?", (start, end)))
+        predicates.append((f"{column} >= ?", (bounds[-1],)))
+        return predicates
+    
+    @staticmethod
+    def _chunk_frame(
+        rows: Sequence[Sequence[Any]], 
+        columns: List[str], 
+        dtypes: List[Optional[Any]]
+    ) -> pl.DataFrame:
+        """
+        Build a frame from one fetched chunk, column by column.
+        
+        Known dtypes skip Polars' inference pass over the values; other
+        columns are widened to a common supertype (e.g. int and float).
+        """
+        return pl.DataFrame([
+            pl.Series(
+                col,
+                list(map(itemgetter(i), rows)),
+                dtype=dtype,
+                strict=dtype is not None,
+            )
+            for i, (col, dtype) in enumerate(zip(columns, dtypes, strict=True))
+        ])
+    
+    @staticmethod
+    def _description_dtypes(description: Sequence[Sequence[Any]]) -> List[Optional[Any]]:
+        """Polars dtype per result column from its type code, None to infer."""
+        dtypes = []
+        for desc in description:
+            type_code, precision, scale = desc[1], desc[4], desc[5]
+            if type_code is decimal.Decimal:
+                # Keep the column's exact precision; Polars caps it at 38
+                dtypes.append(
+                    pl.Decimal(precision, scale or 0)
+                    if precision and precision <= 38 else None
+                )
+            else:
+                dtypes.append(_TYPE_CODE_DTYPES.get(type_code))
+        return dtypes
+    
+    def _extract_arrow(self, query: str) -> pl.DataFrame:
+        """
+        Read the query result straight into Arrow buffers.
+        
+        No Python object is created per value and no rows are transposed
+        into columns; with partition_on, connectorx splits the query into
+        partition_num ranges read in parallel.
+        """
+        reader = self.db_config.reader
+        if reader not in ("connectorx", "adbc"):
+            raise ExtractionError(f"Unsupported reader: {reader}")
+        
+        partitioned = reader == "connectorx" and self.db_config.partition_on
+        try:
+            df = pl.read_database_uri(
+                query,
+                self._connection_uri(),
+                engine=reader,
+                partition_on=self.db_config.partition_on if partitioned else None,
+                partition_num=self.db_config.partition_num if partitioned else None,
             )
-            
-            return df
-            
         except Exception as e:
             raise ExtractionError(f"Query execution failed: {str(e)}")
+        
+        if df.is_empty():
+            self.logger.warning("Query returned no results")
+        return df
     
-    def _build_query(self) -> str:
-        """Build SQL query based on configuration."""
+    def _connection_uri(self) -> str:
+        """connection_uri, or one built from the driver name and settings."""
+        if self.db_config.connection_uri:
+            return self.db_config.connection_uri
+        
+        driver = self.db_config.driver.lower()
+        scheme = next(
+            (scheme for name, scheme in _URI_SCHEMES.items() if name in driver),
+            None,
+        )
+        if scheme is None:
+            raise ExtractionError(
+                f"Set connection_uri: no URI scheme known for driver {self.db_config.driver}"
+            )
+        
+        return (
+            f"{scheme}://{quote(self.db_config.username, safe='')}:"
+            f"{quote(self.db_config.password, safe='')}@"
+            f"{self.db_config.host}:{self.db_config.port}/{self.db_config.database}"
+        )
+    
+    def _build_query(self) -> Tuple[str, Tuple[Any, ...]]:
+        """Build SQL query and its bound parameters based on configuration."""
+        incremental = self.db_config.incremental and self.db_config.last_extracted_value
+        
         if self.db_config.query:
             query = self.db_config.query
             
             # Handle incremental extraction
-            if self.db_config.incremental and self.db_config.last_extracted_value:
-                query = self._add_incremental_filter(query)
+            if incremental:
+                return self._add_incremental_filter(query)
             
-            return query
+            return query, ()
         
         # Build query from table/columns
         if not self.db_config.table_name:
@@ -171,45 +496,126 @@ class DatabaseExtractor(BaseExtractor):
         query = f"SELECT {columns} FROM {self.db_config.table_name}"
         
         conditions = []
+        params: Tuple[Any, ...] = ()
         if self.db_config.where_clause:
             conditions.append(self.db_config.where_clause)
         
-        if self.db_config.incremental and self.db_config.last_extracted_value:
-            conditions.append(
-                f"{self.db_config.incremental_column} > '{self.db_config.last_extracted_value}'"
-            )
+        if incremental:
+            value_sql, params = self._incremental_value()
+            conditions.append(f"{self.db_config.incremental_column} > {value_sql}")
         
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        return query
+        return query, params
     
-    def _add_incremental_filter(self, query: str) -> str:
+    def _incremental_value(self) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        SQL for last_extracted_value and the parameters it binds.
+        
+        pyodbc binds it as a parameter, so the plan is reused across runs;
+        the Arrow readers take no parameters and get an escaped literal.
+        """
+        value = self.db_config.last_extracted_value
+        if self.db_config.reader == "pyodbc":
+            return "?", (value,)
+        return "'" + str(value).replace("'", "''") + "'", ()
+    
+    def _add_incremental_filter(self, query: str) -> Tuple[str, Tuple[Any, ...]]:
         """Add incremental filter to existing query."""
-        # Simple approach: wrap in subquery
-        # In production, use a smarter SQL parser
+        value_sql, params = self._incremental_value()
+        
+        # Filtering inside the query lets the server use an index on the
+        # column; a derived table often blocks that pushdown
+        injected = self._inject_where(query, value_sql)
+        if injected is not None:
+            return injected, params
+        
+        # Fall back to wrapping in a subquery
         return f"""
         SELECT * FROM (
             {query}
         ) base_query
-        WHERE {self.db_config.incremental_column} > '{self.db_config.last_extracted_value}'
+        WHERE {self.db_config.incremental_column} > {value_sql}
+        """, params
+    
+    def _inject_where(self, query: str, value_sql: str) -> Optional[str]:
         """
+        AND the incremental predicate into a simple SELECT's WHERE clause.
+        
+        Returns None, so the caller wraps the query instead, when sqlglot is
+        not installed, the driver has no known dialect, the query does not
+        parse, or filtering its source rows could differ from filtering its
+        output (grouping, DISTINCT, LIMIT/TOP/ROWNUM, set operations, or a
+        column it does not select plainly).
+        """
+        try:
+            import sqlglot
+            from sqlglot import exp
+        except ImportError:
+            return None
+        
+        driver = self.db_config.driver.lower()
+        dialect = next(
+            (dialect for name, dialect in _SQL_DIALECTS.items() if name in driver),
+            None,
+        )
+        if dialect is None:
+            return None
+        try:
+            tree = sqlglot.parse_one(query, read=dialect)
+        except sqlglot.errors.SqlglotError:
+            return None
+        
+        if not isinstance(tree, exp.Select) or any(
+            tree.args.get(arg)
+            for arg in ("group", "having", "distinct", "limit", "offset", "fetch", "qualify")
+        ):
+            return None
+        if tree.find(exp.AggFunc, exp.Window):
+            return None
+        # Oracle's ROWNUM is numbered after WHERE, so a new predicate renumbers rows
+        if any(column.name.upper() == "ROWNUM" for column in tree.find_all(exp.Column)):
+            return None
+        
+        # Filter on the source column behind the output column
+        target = self.db_config.incremental_column.lower()
+        column = None
+        for projection in tree.expressions:
+            source = projection.unalias()
+            if isinstance(source, exp.Star):
+                # Unqualified name is only unambiguous over a single table
+                if not tree.args.get("joins"):
+                    column = exp.column(self.db_config.incremental_column)
+            elif projection.alias_or_name.lower() == target:
+                column = source if isinstance(source, exp.Column) else None
+                break
+        if column is None:
+            return None
+        
+        predicate = exp.GT(
+            this=column.copy(),
+            expression=sqlglot.parse_one(value_sql, read=dialect),
+        )
+        return tree.where(predicate, copy=False).sql(dialect=dialect)
     
     def _disconnect(self) -> None:
         """Close database connection."""
         try:
             if self._cursor:
                 self._cursor.close()
+                self._cursor = None
             if self._connection:
-                self._connection.close()
-            self.logger.info("Database connection closed")
+                self._release_connection(self._connection)
+                self._connection = None
+            self.logger.info("Database connection released")
         except Exception as e:
             self.logger.warning(f"Error closing connection: {str(e)}")
     
     def test_connection(self) -> bool:
-        """Test database connectivity."""
+        """Test database connectivity (over pyodbc, whatever the reader)."""
         try:
-            self._connect()
+            self._connect_pyodbc()
             cursor = self._connection.cursor()
             cursor.execute("SELECT 1")
             cursor.close()
@@ -221,7 +627,7 @@ class DatabaseExtractor(BaseExtractor):
     
     def get_table_schema(self, table_name: str) -> pl.DataFrame:
         """Retrieve schema information for a table."""
-        query = f"""
+        query = """
         SELECT 
             COLUMN_NAME,
             DATA_TYPE,
@@ -229,36 +635,31 @@ class DatabaseExtractor(BaseExtractor):
             NUMERIC_PRECISION,
             IS_NULLABLE
         FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_NAME = '{table_name}'
+        WHERE TABLE_NAME = ?
         ORDER BY ORDINAL_POSITION
         """
         
-        self._connect()
-        cursor = self._connection.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        cursor.close()
+        self._connect_pyodbc()
+        # Same column-wise, description-typed path as _extract
+        df = self._fetch_frame(self._connection, query, (table_name,))
         self._disconnect()
         
-        return pl.DataFrame(data=rows, schema=columns, orient="row")
+        return df
     
     def get_row_count(self, table_name: str) -> int:
         """Get approximate row count for a table."""
         # Use fast count method for SQL Server
-        query = f"""
+        query = """
         SELECT SUM(p.rows) AS row_count
         FROM sys.partitions p
         JOIN sys.tables t ON p.object_id = t.object_id
-        WHERE t.name = '{table_name}'
+        WHERE t.name = ?
         AND p.index_id IN (0, 1)
         """
         
-        self._connect()
+        self._connect_pyodbc()
         cursor = self._connection.cursor()
-        cursor.execute(query)
+        cursor.execute(query, (table_name,))
         result = cursor.fetchone()
         cursor.close()
         self._disconnect()
@@ -7,13 +7,19 @@ Handles navigation, form filling, file downloads, and data capture.
 Author: Godson Kurishinkal
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import base64
+import fnmatch
+import json
 import logging
 import os
 import shutil
+import sys
 import time
 
 import polars as pl
@@ -21,6 +27,34 @@ import polars as pl
 from .base_extractor import BaseExtractor, ExtractorConfig, ExtractionError
 
 
+# Action handler: called with the extractor, step selector and step value
+_StepHandler = Callable[["RPAExtractor", Optional[str], Optional[str]], None]
+
+
+# Injected before page scripts run when fast_login is on: fills and submits
+# the login form once per tab, and only on the login page
+_AUTOFILL_SCRIPT = """
+(() => {
+  const cfg = %s;
+  if (!location.href.startsWith(cfg.url)) return;
+  if (sessionStorage.getItem("etl_autofill")) return;
+  document.addEventListener("DOMContentLoaded", () => {
+    const fill = (selector, value) => {
+      const el = document.querySelector(selector);
+      if (!el) return false;
+      el.value = value;
+      el.dispatchEvent(new Event("input", {bubbles: true}));
+      return true;
+    };
+    const button = document.querySelector(cfg.button);
+    if (button && fill(cfg.user, cfg.username) && fill(cfg.pass, cfg.password)) {
+      sessionStorage.setItem("etl_autofill", "1");
+      button.click();
+    }
+  });
+})();
+"""
+
 @dataclass
 class RPAConfig(ExtractorConfig):
     """Configuration for RPA extraction."""
@@ -38,6 +72,9 @@ class RPAConfig(ExtractorConfig):
     username: str = ""
     password: str = ""  # Should be loaded from vault
     mfa_handler: Optional[Callable] = None  # Custom MFA handling
+    # Chrome only: fill and submit the form from a script injected over
+    # CDP, so login is one page load instead of several WebDriver calls
+    fast_login: bool = False
     
     # Navigation
     steps: List[Dict[str, Any]] = field(default_factory=list)
@@ -51,9 +88,16 @@ class RPAConfig(ExtractorConfig):
     # File handling
     expected_file_pattern: str = "*.xlsx"
     file_parser: Optional[Callable] = None  # Custom file parser
+    # Columns to keep and a row filter, pushed down into CSV/Parquet scans
+    # (ignored when file_parser is set)
+    projection: List[str] = field(default_factory=list)
+    predicate: Optional[pl.Expr] = None
     
     # Error handling
     screenshot_on_error: bool = True
+    # jpeg is captured over CDP and is several times smaller than png
+    screenshot_format: str = "jpeg"  # jpeg, png
+    screenshot_quality: int = 60  # jpeg only, 0-100
     max_retries_per_step: int = 2
 
 
@@ -107,21 +151,40 @@ class RPAExtractor(BaseExtractor):
         self.rpa_config = config
         self._driver = None
         self._wait = None
+        self._base_url = None  # Cached by _get_base_url
+        
+        # Steps normalized once, each paired with its action handler
+        self._compiled_steps = tuple(self._compile_step(step) for step in config.steps)
+        
+        # Selenium names bound once in _connect (selenium is optional)
+        self._by_css = None
+        self._ec_clickable = None
+        self._ec_present = None
+        self._select = None
     
     def _connect(self) -> None:
         """Initialize Selenium WebDriver."""
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options as ChromeOptions
         from selenium.webdriver.chrome.service import Service as ChromeService
-        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import Select, WebDriverWait
+        
+        self._base_url = None
+        
+        # Steps run in a retry loop; bind the names they use once here
+        self._by_css = By.CSS_SELECTOR
+        self._ec_clickable = EC.element_to_be_clickable
+        self._ec_present = EC.presence_of_element_located
+        self._select = Select
         
         # Ensure directories exist
         self.rpa_config.download_dir.mkdir(parents=True, exist_ok=True)
         self.rpa_config.screenshot_dir.mkdir(parents=True, exist_ok=True)
         
         # Clear download directory
-        for file in self.rpa_config.download_dir.glob("*"):
-            file.unlink()
+        self._clear_download_dir()
         
         # Configure Chrome options
         options = ChromeOptions()
@@ -159,6 +222,21 @@ class RPAExtractor(BaseExtractor):
         except Exception as e:
             raise ConnectionError(f"Failed to initialize WebDriver: {str(e)}")
     
+    def _clear_download_dir(self) -> None:
+        """Delete files left in the download directory by earlier runs."""
+        with os.scandir(self.rpa_config.download_dir) as entries:
+            paths = [entry.path for entry in entries if entry.is_file()]
+        
+        if len(paths) < 64:
+            for path in paths:
+                os.unlink(path)
+            return
+        
+        # unlink releases the GIL, so large backlogs delete in parallel
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(os.unlink, paths))
+        self.logger.info(f"Cleared {len(paths):,} stale downloads")
+    
     def _extract(self) -> pl.DataFrame:
         """Execute RPA workflow and extract data."""
         try:
@@ -167,9 +245,10 @@ class RPAExtractor(BaseExtractor):
                 self._perform_login()
             
             # Step 2: Execute navigation steps
-            for i, step in enumerate(self.rpa_config.steps):
-                self.logger.info(f"Executing step {i+1}/{len(self.rpa_config.steps)}: {step}")
-                self._execute_step(step)
+            steps = self._compiled_steps
+            for i, (step, handler) in enumerate(steps):
+                self.logger.info(f"Executing step {i+1}/{len(steps)}: {step}")
+                self._execute_step(step, handler)
             
             # Step 3: Process downloaded file
             downloaded_file = self._wait_for_download()
@@ -188,104 +267,116 @@ class RPAExtractor(BaseExtractor):
     
     def _perform_login(self) -> None:
         """Handle login process including potential MFA."""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support import expected_conditions as EC
-        
         self.logger.info(f"Navigating to login page: {self.rpa_config.login_url}")
+        if self.rpa_config.fast_login:
+            self._autofill_login()
+        else:
+            self._fill_login_form()
+        
+        # Handle MFA if configured
+        if self.rpa_config.mfa_handler:
+            self.logger.info("Handling MFA...")
+            self.rpa_config.mfa_handler(self._driver, self._wait)
+        
+        if not self.rpa_config.fast_login:
+            # Wait for login to complete (page change)
+            time.sleep(2)
+        self.logger.info("Login successful")
+    
+    def _fill_login_form(self) -> None:
+        """Fill and submit the login form through WebDriver calls."""
         self._driver.get(self.rpa_config.login_url)
         
-        # Wait for login form
-        self._wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, self.rpa_config.username_selector))
+        # Wait for login form; the wait returns the username field
+        username_field = self._wait.until(
+            self._ec_present((self._by_css, self.rpa_config.username_selector))
         )
         
+        # Look up the other form elements in one browser round trip
+        # instead of a find_element call each
+        selectors = (
+            self.rpa_config.password_selector,
+            self.rpa_config.login_button_selector,
+        )
+        password_field, login_button = self._driver.execute_script(
+            "return [document.querySelector(arguments[0]),"
+            " document.querySelector(arguments[1])];",
+            *selectors,
+        )
+        for selector, element in zip(selectors, (password_field, login_button), strict=True):
+            if element is None:
+                raise ExtractionError(f"Login form element not found: {selector}")
+        
         # Enter credentials
-        username_field = self._driver.find_element(By.CSS_SELECTOR, self.rpa_config.username_selector)
         username_field.clear()
         username_field.send_keys(self.rpa_config.username)
         
-        password_field = self._driver.find_element(By.CSS_SELECTOR, self.rpa_config.password_selector)
         password_field.clear()
         password_field.send_keys(self.rpa_config.password)
         
         # Click login
-        login_button = self._driver.find_element(By.CSS_SELECTOR, self.rpa_config.login_button_selector)
         login_button.click()
-        
-        # Handle MFA if configured
-        if self.rpa_config.mfa_handler:
-            self.logger.info("Handling MFA...")
-            self.rpa_config.mfa_handler(self._driver, self._wait)
-        
-        # Wait for login to complete (page change)
-        time.sleep(2)
-        self.logger.info("Login successful")
     
-    def _execute_step(self, step: Dict[str, Any]) -> None:
+    def _autofill_login(self) -> None:
+        """Log in with a CDP-injected autofill script and one page load."""
+        config = self.rpa_config
+        payload = json.dumps({
+            "url": config.login_url,
+            "user": config.username_selector,
+            "pass": config.password_selector,
+            "button": config.login_button_selector,
+            "username": config.username,
+            "password": config.password,
+        })
+        script = self._driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": _AUTOFILL_SCRIPT % payload},
+        )
+        try:
+            self._driver.get(config.login_url)
+            # The script submits on load; wait for the login page to go
+            self._wait.until(
+                lambda driver: not driver.current_url.startswith(config.login_url)
+            )
+        finally:
+            # Don't leave credentials injected into later pages
+            self._driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument",
+                {"identifier": script["identifier"]},
+            )
+    
+    def _compile_step(
+        self, 
+        step: Dict[str, Any]
+    ) -> Tuple[RPAStep, Optional[_StepHandler]]:
+        """Normalize a step dict and resolve its action handler."""
+        compiled = RPAStep(
+            action=sys.intern(step.get("action", "").lower()),
+            selector=step.get("selector"),
+            value=step.get("value"),
+            wait_after=step.get("wait_after", 1.0),
+            description=step.get("description", ""),
+        )
+        return compiled, self._ACTIONS.get(compiled.action)
+    
+    def _execute_step(
+        self, 
+        step: RPAStep, 
+        handler: Optional[_StepHandler]
+    ) -> None:
         """Execute a single RPA step with retry logic."""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.support.ui import Select
+        selector = step.selector
+        value = step.value
+        wait_after = step.wait_after
         
-        action = step.get("action", "").lower()
-        selector = step.get("selector")
-        value = step.get("value")
-        wait_after = step.get("wait_after", 1.0)
+        if handler is None:
+            self.logger.warning(f"Unknown action: {step.action}")
         
         attempts = 0
         while attempts < self.rpa_config.max_retries_per_step:
             try:
-                if action == "navigate":
-                    url = value if value.startswith("http") else f"{self._get_base_url()}{value}"
-                    self._driver.get(url)
-                    
-                elif action == "click":
-                    element = self._wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    element.click()
-                    
-                elif action == "type":
-                    element = self._wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    element.clear()
-                    element.send_keys(value)
-                    
-                elif action == "select":
-                    element = self._wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    Select(element).select_by_visible_text(value)
-                    
-                elif action == "wait":
-                    time.sleep(float(value))
-                    
-                elif action == "screenshot":
-                    self._take_screenshot(value or "step")
-                    
-                elif action == "scroll":
-                    if selector:
-                        element = self._driver.find_element(By.CSS_SELECTOR, selector)
-                        self._driver.execute_script("arguments[0].scrollIntoView();", element)
-                    else:
-                        self._driver.execute_script(f"window.scrollBy(0, {value or 500});")
-                        
-                elif action == "wait_for_element":
-                    self._wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    
-                elif action == "wait_for_clickable":
-                    self._wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    
-                elif action == "execute_script":
-                    self._driver.execute_script(value)
-                    
-                else:
-                    self.logger.warning(f"Unknown action: {action}")
+                if handler is not None:
+                    handler(self, selector, value)
                 
                 # Success - apply wait and return
                 if wait_after > 0:
@@ -301,35 +392,95 @@ class RPAExtractor(BaseExtractor):
                     raise
                 time.sleep(2)
     
+    def _action_navigate(self, _selector: Optional[str], value: Optional[str]) -> None:
+        if value.startswith("http"):
+            url = value
+            # The site may have changed; re-read the base on next use
+            self._base_url = None
+        else:
+            url = f"{self._get_base_url()}{value}"
+        self._driver.get(url)
+    
+    def _action_click(self, selector: Optional[str], _value: Optional[str]) -> None:
+        element = self._wait.until(self._ec_clickable((self._by_css, selector)))
+        element.click()
+    
+    def _action_type(self, selector: Optional[str], value: Optional[str]) -> None:
+        element = self._wait.until(self._ec_present((self._by_css, selector)))
+        element.clear()
+        element.send_keys(value)
+    
+    def _action_select(self, selector: Optional[str], value: Optional[str]) -> None:
+        element = self._wait.until(self._ec_present((self._by_css, selector)))
+        self._select(element).select_by_visible_text(value)
+    
+    def _action_wait(self, _selector: Optional[str], value: Optional[str]) -> None:
+        time.sleep(float(value))
+    
+    def _action_screenshot(self, _selector: Optional[str], value: Optional[str]) -> None:
+        self._take_screenshot(value or "step")
+    
+    def _action_scroll(self, selector: Optional[str], value: Optional[str]) -> None:
+        if selector:
+            element = self._driver.find_element(self._by_css, selector)
+            self._driver.execute_script("arguments[0].scrollIntoView();", element)
+        else:
+            self._driver.execute_script(f"window.scrollBy(0, {value or 500});")
+    
+    def _action_wait_for_element(self, selector: Optional[str], _value: Optional[str]) -> None:
+        self._wait.until(self._ec_present((self._by_css, selector)))
+    
+    def _action_wait_for_clickable(self, selector: Optional[str], _value: Optional[str]) -> None:
+        self._wait.until(self._ec_clickable((self._by_css, selector)))
+    
+    def _action_execute_script(self, _selector: Optional[str], value: Optional[str]) -> None:
+        self._driver.execute_script(value)
+    
     def _wait_for_download(self) -> Optional[Path]:
         """Wait for file download to complete."""
-        import glob
+        download_dir = self.rpa_config.download_dir
+        pattern = self.rpa_config.expected_file_pattern
         
         self.logger.info("Waiting for file download...")
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while time.time() - start_time < self.rpa_config.download_wait_timeout:
-            # Check for completed downloads
-            files = list(self.rpa_config.download_dir.glob(self.rpa_config.expected_file_pattern))
-            
-            # Filter out partial downloads
-            completed_files = [
-                f for f in files 
-                if not f.name.endswith(".crdownload") 
-                and not f.name.endswith(".tmp")
-            ]
-            
-            if completed_files:
-                # Return the most recent file
-                latest_file = max(completed_files, key=lambda x: x.stat().st_mtime)
-                self.logger.info(f"Download complete: {latest_file.name}")
-                return latest_file
+        # Poll quickly at first so small files are picked up promptly,
+        # backing off to every 2 seconds for long downloads
+        poll_interval = 0.25
+        while time.monotonic() - start_time < self.rpa_config.download_wait_timeout:
+            latest = self._latest_download(download_dir, pattern)
+            if latest is not None:
+                self.logger.info(f"Download complete: {latest.name}")
+                return latest
             
-            time.sleep(2)
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, 2.0)
         
         self.logger.error("Download timed out")
         return None
     
+    @staticmethod
+    def _latest_download(download_dir: Path, pattern: str) -> Optional[Path]:
+        """Most recently modified completed download, or None."""
+        latest = None
+        latest_mtime = 0.0
+        # scandir entries carry their own stat data, so this is one
+        # directory scan per poll rather than a stat call per file
+        with os.scandir(download_dir) as entries:
+            for entry in entries:
+                if (
+                    not fnmatch.fnmatch(entry.name, pattern)
+                    # Skip partial downloads
+                    or entry.name.endswith((".crdownload", ".tmp"))
+                    or not entry.is_file()
+                ):
+                    continue
+                mtime = entry.stat().st_mtime
+                if latest is None or mtime > latest_mtime:
+                    latest, latest_mtime = entry.name, mtime
+        
+        return download_dir / latest if latest is not None else None
+    
     def _parse_downloaded_file(self, file_path: Path) -> pl.DataFrame:
         """Parse the downloaded file into a DataFrame."""
         if self.rpa_config.file_parser:
@@ -339,31 +490,50 @@ class RPAExtractor(BaseExtractor):
         suffix = file_path.suffix.lower()
         
         if suffix == ".xlsx" or suffix == ".xls":
-            return pl.read_excel(file_path)
+            # calamine (fastexcel) parses in Rust, far faster than openpyxl
+            lf = pl.read_excel(file_path, engine="calamine").lazy()
         elif suffix == ".csv":
-            return pl.read_csv(file_path)
+            lf = pl.scan_csv(file_path)
         elif suffix == ".json":
-            return pl.read_json(file_path)
+            lf = pl.read_json(file_path).lazy()
         elif suffix == ".parquet":
-            return pl.read_parquet(file_path)
+            lf = pl.scan_parquet(file_path)
         else:
             raise ExtractionError(f"Unsupported file format: {suffix}")
+        
+        # Scans push the projection and predicate down to the reader, and
+        # the streaming engine never holds the whole file in memory
+        if self.rpa_config.predicate is not None:
+            lf = lf.filter(self.rpa_config.predicate)
+        if self.rpa_config.projection:
+            lf = lf.select(self.rpa_config.projection)
+        return lf.collect(engine="streaming")
     
     def _take_screenshot(self, name: str) -> Path:
         """Capture screenshot for debugging."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.png"
+        image_format = self.rpa_config.screenshot_format
+        filename = f"{name}_{timestamp}.{'jpg' if image_format == 'jpeg' else 'png'}"
         filepath = self.rpa_config.screenshot_dir / filename
         
-        self._driver.save_screenshot(str(filepath))
+        if image_format == "jpeg":
+            result = self._driver.execute_cdp_cmd(
+                "Page.captureScreenshot",
+                {"format": "jpeg", "quality": self.rpa_config.screenshot_quality},
+            )
+            filepath.write_bytes(base64.b64decode(result["data"]))
+        else:
+            self._driver.save_screenshot(str(filepath))
         self.logger.info(f"Screenshot saved: {filepath}")
         return filepath
     
     def _get_base_url(self) -> str:
-        """Extract base URL from current page."""
-        from urllib.parse import urlparse
-        parsed = urlparse(self._driver.current_url)
-        return f"{parsed.scheme}://{parsed.netloc}"
+        """Base URL of the current site, read from the browser once."""
+        if self._base_url is None:
+            # current_url is a WebDriver round trip
+            parsed = urlparse(self._driver.current_url)
+            self._base_url = f"{parsed.scheme}://{parsed.netloc}"
+        return self._base_url
     
     def _disconnect(self) -> None:
         """Close WebDriver and clean up."""
@@ -373,6 +543,19 @@ class RPAExtractor(BaseExtractor):
                 self.logger.info("WebDriver closed")
             except Exception as e:
                 self.logger.warning(f"Error closing WebDriver: {str(e)}")
+    
+    _ACTIONS: Dict[str, _StepHandler] = {
+        "navigate": _action_navigate,
+        "click": _action_click,
+        "type": _action_type,
+        "select": _action_select,
+        "wait": _action_wait,
+        "screenshot": _action_screenshot,
+        "scroll": _action_scroll,
+        "wait_for_element": _action_wait_for_element,
+        "wait_for_clickable": _action_wait_for_clickable,
+        "execute_script": _action_execute_script,
+    }
 
 
 # Pre-defined step builders for common actions
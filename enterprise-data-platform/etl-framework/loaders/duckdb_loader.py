@@ -7,6 +7,7 @@ Supports in-memory and persistent databases with optional Gold layer views.
 Author: Godson Kurishinkal
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,16 @@ import duckdb
 import polars as pl
 
 
+def _quote_identifier(name: str) -> str:
+    """Quote a table or view name for interpolation into SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    """Quote a string literal where DuckDB cannot bind a parameter (DDL)."""
+    return "'" + value.replace("'", "''") + "'"
+
+
 @dataclass
 class DuckDBConfig:
     """Configuration for DuckDB loader."""
@@ -29,6 +40,9 @@ class DuckDBConfig:
     
     # Extension settings
     load_extensions: List[str] = field(default_factory=lambda: ["parquet", "json"])
+    
+    # Parameterless queries kept as prepared statements (0 disables)
+    prepared_cache_size: int = 256
 
 
 class DuckDBLoader:
@@ -63,6 +77,9 @@ class DuckDBLoader:
         self.logger = logging.getLogger("duckdb.loader")
         self._conn: Optional[duckdb.DuckDBPyConnection] = None
         self._registered_tables: Dict[str, str] = {}
+        # SQL -> prepared statement name, None if it cannot be prepared
+        self._prepared: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._prepared_count = 0
         
         self._connect()
     
@@ -76,7 +93,7 @@ class DuckDBLoader:
         )
         
         # Configure settings
-        self._conn.execute(f"SET memory_limit='{self.config.memory_limit}'")
+        self._conn.execute(f"SET memory_limit={_quote_literal(self.config.memory_limit)}")
         self._conn.execute(f"SET threads={self.config.threads}")
         
         # Load extensions
@@ -112,9 +129,10 @@ class DuckDBLoader:
         
         if create_view:
             # Create a view for cleaner syntax
+            self._clear_prepared()
             self._conn.execute(f"""
-                CREATE OR REPLACE VIEW {table_name} AS 
-                SELECT * FROM read_parquet('{glob_path}', hive_partitioning=true)
+                CREATE OR REPLACE VIEW {_quote_identifier(table_name)} AS 
+                SELECT * FROM read_parquet({_quote_literal(glob_path)}, hive_partitioning=true)
             """)
         
         self._registered_tables[table_name] = glob_path
@@ -128,6 +146,7 @@ class DuckDBLoader:
         """Register a Polars DataFrame as a queryable table."""
         # Convert to Arrow for zero-copy sharing
         arrow_table = df.to_arrow()
+        self._clear_prepared()
         self._conn.register(table_name, arrow_table)
         self.logger.info(f"Registered DataFrame as: {table_name}")
     
@@ -150,7 +169,7 @@ class DuckDBLoader:
             if params:
                 result = self._conn.execute(sql, params)
             else:
-                result = self._conn.execute(sql)
+                result = self._execute_prepared(sql)
             
             # Convert to Polars via Arrow
             arrow_table = result.fetch_arrow_table()
@@ -160,9 +179,54 @@ class DuckDBLoader:
             self.logger.error(f"Query failed: {str(e)}")
             raise QueryError(f"Query failed: {str(e)}")
     
+    def _execute_prepared(self, sql: str) -> duckdb.DuckDBPyConnection:
+        """
+        Execute a parameterless query through a cached prepared statement.
+        
+        The Python API re-parses and re-plans every execute() call; a
+        statement prepared once with PREPARE skips that on repeat queries.
+        Queries with parameters are bound by execute() instead, since
+        EXECUTE cannot take bound parameters.
+        """
+        if self.config.prepared_cache_size <= 0:
+            return self._conn.execute(sql)
+        
+        if sql in self._prepared:
+            self._prepared.move_to_end(sql)
+            name = self._prepared[sql]
+        else:
+            self._prepared_count += 1
+            name = f"_loader_q{self._prepared_count}"
+            try:
+                # Multiple statements, DDL and the like run unprepared
+                if len(self._conn.extract_statements(sql)) == 1:
+                    self._conn.execute(f"PREPARE {name} AS {sql}")
+                else:
+                    name = None
+            except duckdb.Error:
+                name = None
+            self._prepared[sql] = name
+            
+            if len(self._prepared) > self.config.prepared_cache_size:
+                _, evicted = self._prepared.popitem(last=False)
+                if evicted is not None:
+                    self._conn.execute(f"DEALLOCATE {evicted}")
+        
+        if name is None:
+            return self._conn.execute(sql)
+        return self._conn.execute(f"EXECUTE {name}")
+    
+    def _clear_prepared(self) -> None:
+        """Drop cached prepared statements after schema changes."""
+        for name in self._prepared.values():
+            if name is not None:
+                self._conn.execute(f"DEALLOCATE {name}")
+        self._prepared.clear()
+    
     def execute(self, sql: str) -> None:
         """Execute SQL statement without returning results."""
         try:
+            self._clear_prepared()
             self._conn.execute(sql)
         except Exception as e:
             self.logger.error(f"Execute failed: {str(e)}")
@@ -213,11 +277,11 @@ class DuckDBLoader:
     
     def get_table_info(self, table_name: str) -> pl.DataFrame:
         """Get schema information for a table."""
-        return self.query(f"DESCRIBE {table_name}")
+        return self.query(f"DESCRIBE {_quote_identifier(table_name)}")
     
     def get_table_stats(self, table_name: str) -> Dict[str, Any]:
         """Get statistics for a table."""
-        count_result = self.query(f"SELECT COUNT(*) as cnt FROM {table_name}")
+        count_result = self.query(f"SELECT COUNT(*) as cnt FROM {_quote_identifier(table_name)}")
         count = count_result["cnt"][0]
         
         return {
@@ -247,11 +311,9 @@ class DuckDBLoader:
         Returns:
             Path to written file
         """
-        self._conn.execute(f"""
-            COPY ({sql}) 
-            TO '{output_path}' 
-            (FORMAT PARQUET, COMPRESSION {compression})
-        """)
+        # Written by DuckDB's streaming COPY from a relation, so the query
+        # is not spliced into SQL and every DuckDB type is supported
+        self._conn.sql(sql).write_parquet(str(output_path), compression=compression)
         
         self.logger.info(f"Exported query results to {output_path}")
         return output_path
@@ -265,7 +327,7 @@ class DuckDBLoader:
         """Export query results to CSV file."""
         self._conn.execute(f"""
             COPY ({sql}) 
-            TO '{output_path}' 
+            TO {_quote_literal(str(output_path))} 
             (FORMAT CSV, HEADER {header})
         """)
         
@@ -286,10 +348,12 @@ class DuckDBLoader:
             sql: SQL query defining the aggregation
             materialize: If True, create actual table; otherwise create view
         """
+        self._clear_prepared()
+        name = _quote_identifier(table_name)
         if materialize:
-            self._conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS {sql}")
+            self._conn.execute(f"CREATE OR REPLACE TABLE {name} AS {sql}")
         else:
-            self._conn.execute(f"CREATE OR REPLACE VIEW {table_name} AS {sql}")
+            self._conn.execute(f"CREATE OR REPLACE VIEW {name} AS {sql}")
         
         self.logger.info(f"Created aggregate: {table_name} (materialized={materialize})")
     
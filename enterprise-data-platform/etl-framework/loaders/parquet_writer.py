@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 import logging
 import json
+import os
 
 import polars as pl
 
@@ -209,9 +210,22 @@ class ParquetWriter:
     
     def _calculate_write_stats(self, target_dir: Path) -> None:
         """Calculate files and bytes written."""
-        files = list(target_dir.rglob("*.parquet"))
-        self.metadata.files_written = len(files)
-        self.metadata.bytes_written = sum(f.stat().st_size for f in files)
+        def parquet_sizes(directory: str):
+            # DirEntry type checks reuse readdir data; only sizes need a stat
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from parquet_sizes(entry.path)
+                    elif entry.name.endswith(".parquet"):
+                        yield entry.stat().st_size
+        
+        files_written = 0
+        bytes_written = 0
+        for size in parquet_sizes(str(target_dir)):
+            files_written += 1
+            bytes_written += size
+        self.metadata.files_written = files_written
+        self.metadata.bytes_written = bytes_written
     
     def merge(
         self, 
@@ -222,10 +236,10 @@ class ParquetWriter:
         Merge (upsert) new data with existing data.
         
         Performs:
-        1. Read existing data
+        1. Scan existing data lazily
         2. Anti-join to find new records
         3. Update matching records
-        4. Union and write
+        4. Union, stream to a staging directory and swap it in
         
         Args:
             df: New data to merge
@@ -247,33 +261,139 @@ class ParquetWriter:
         
         self.logger.info(f"Merging on columns: {merge_columns}")
         
-        # Read existing data
-        existing_df = pl.read_parquet(target_dir / "**/*.parquet")
-        initial_count = len(existing_df)
+        if self.config.mode == "error":
+            raise WriteError(f"Target already exists: {target_dir}")
         
-        # Create merge key for comparison
-        existing_keys = existing_df.select(merge_columns)
-        new_keys = df.select(merge_columns)
+        start_time = datetime.utcnow()
         
-        # Find records to update (exist in both)
-        updates = df.join(existing_keys, on=merge_columns, how="inner")
+        # Scan existing data; only the rows and columns the joins need are
+        # read. Appended files keep partition values only in their
+        # directory names; read them back with the new data's dtypes.
+        existing_lf = pl.scan_parquet(
+            target_dir / "**/*.parquet",
+            hive_partitioning=True,
+            hive_schema=self._hive_schema(df),
+        )
+        # Only existing keys inside the new keys' ranges can match; the
+        # range filter lets the reader skip row groups by their min/max
+        # statistics
+        existing_keys = existing_lf.filter(
+            self._key_range_filter(df, merge_columns)
+        ).select(merge_columns)
+        new_lf = df.lazy()
         
-        # Find new records (only in new data)
-        inserts = df.join(existing_keys, on=merge_columns, how="anti")
+        # Records to update (exist in both) and new records (only in new
+        # data) are subsets of df; one scan of the existing keys finds both
+        updates, inserts = pl.collect_all([
+            new_lf.join(existing_keys, on=merge_columns, how="semi"),
+            new_lf.join(existing_keys, on=merge_columns, how="anti"),
+        ])
         
         # Find unchanged records (only in existing, not in new)
-        unchanged = existing_df.join(new_keys, on=merge_columns, how="anti")
+        unchanged = existing_lf.join(
+            new_lf.select(merge_columns), on=merge_columns, how="anti"
+        ).select(df.columns)
         
         # Combine: unchanged + updates + inserts
-        merged_df = pl.concat([unchanged, updates, inserts])
+        merged = pl.concat([unchanged, updates.lazy(), inserts.lazy()])
+        
+        # Write merged data
+        output_path = self._write_merged(merged, target_dir)
+        self.metadata.duration_seconds = (
+            datetime.utcnow() - start_time
+        ).total_seconds()
         
+        total = self.metadata.records_written
         self.logger.info(
             f"Merge: {len(inserts)} inserts, {len(updates)} updates, "
-            f"{len(unchanged)} unchanged ({initial_count} -> {len(merged_df)} total)"
+            f"{total - len(df)} unchanged ({total - len(inserts)} -> {total} total)"
         )
         
-        # Write merged data
-        return self.write(merged_df)
+        return output_path
+    
+    def _write_merged(self, merged: pl.LazyFrame, target_dir: Path) -> Path:
+        """
+        Write a merge result beside target_dir, then swap it into place.
+        
+        The merge reads target_dir while it runs, so it cannot be written
+        in place. The swap is two renames, not atomic: a reader between
+        them finds no table. If the second rename fails the old table is
+        moved back.
+        """
+        import shutil
+        
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+        staging_dir = target_dir.with_name(f".{target_dir.name}.merge_{timestamp}")
+        staging_dir.mkdir(parents=True)
+        
+        try:
+            if self.config.partition_by:
+                merged_df = merged.collect(engine="streaming")
+                self._write_partitioned(merged_df, staging_dir)
+                records = len(merged_df)
+                output_path = target_dir
+            else:
+                # Stream straight to the file without materializing it
+                merged.sink_parquet(
+                    staging_dir / "data.parquet",
+                    compression=self.config.compression,
+                    row_group_size=self.config.row_group_size,
+                    statistics=self.config.statistics,
+                )
+                # Row count from the footer, not a data read
+                records = (
+                    pl.scan_parquet(staging_dir / "data.parquet")
+                    .select(pl.len())
+                    .collect()
+                    .item()
+                )
+                output_path = target_dir / "data.parquet"
+            
+            previous_dir = target_dir.with_name(f".{target_dir.name}.old_{timestamp}")
+            target_dir.rename(previous_dir)
+            try:
+                staging_dir.rename(target_dir)
+            except OSError:
+                previous_dir.rename(target_dir)  # Put the old table back
+                raise
+        except Exception as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.metadata.status = "failed"
+            self.metadata.error_message = str(e)
+            self.logger.error(f"Merge write failed: {str(e)}")
+            raise WriteError(f"Merge write failed: {str(e)}")
+        
+        # The merged table is in place; a leftover old copy doesn't fail it
+        try:
+            shutil.rmtree(previous_dir)
+        except OSError as e:
+            self.logger.warning(f"Could not remove previous table {previous_dir}: {e}")
+        
+        self.metadata.records_written = records
+        self.metadata.status = "success"
+        self._calculate_write_stats(target_dir)
+        return output_path
+    
+    @staticmethod
+    def _key_range_filter(df: pl.DataFrame, columns: List[str]) -> pl.Expr:
+        """Filter to rows whose keys fall within df's min/max per column."""
+        bounds = df.select(
+            *[pl.col(col).min().alias(f"{col}_min") for col in columns],
+            *[pl.col(col).max().alias(f"{col}_max") for col in columns],
+        ).row(0, named=True)
+        
+        predicate = pl.lit(True)
+        for col in columns:
+            low, high = bounds[f"{col}_min"], bounds[f"{col}_max"]
+            if low is not None and high is not None:
+                predicate &= pl.col(col).is_between(pl.lit(low), pl.lit(high))
+        return predicate
+    
+    def _hive_schema(self, df: pl.DataFrame) -> Optional[Dict[str, pl.DataType]]:
+        """Partition column dtypes taken from df, None to infer them."""
+        if not self.config.partition_by or not set(self.config.partition_by) <= set(df.columns):
+            return None
+        return {col: df.schema[col] for col in self.config.partition_by}
     
     def append(self, df: pl.DataFrame) -> Path:
         """
@@ -293,21 +413,22 @@ class ParquetWriter:
         # Generate unique file suffix to avoid conflicts
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
         
-        # Write partitioned with unique file names
-        for partition_values, partition_df in df.group_by(self.config.partition_by):
-            # Build partition path
-            partition_path = target_dir
-            for col, val in zip(self.config.partition_by, partition_values):
-                partition_path = partition_path / f"{col}={val}"
-            
-            partition_path.mkdir(parents=True, exist_ok=True)
-            
-            output_file = partition_path / f"data_{timestamp}.parquet"
-            partition_df.write_parquet(
-                output_file,
-                compression=self.config.compression,
-                row_group_size=self.config.row_group_size,
-            )
+        # Write partitioned with unique file names in one pyarrow dataset
+        # write, which splits partitions and writes files on a thread pool.
+        # Partition values live only in the Hive directory names.
+        df.write_parquet(
+            target_dir,
+            compression=self.config.compression,
+            compression_level=self.config.compression_level,
+            row_group_size=self.config.row_group_size,
+            statistics=self.config.statistics,
+            use_pyarrow=True,
+            pyarrow_options={
+                "partition_cols": self.config.partition_by,
+                "basename_template": f"data_{timestamp}_{{i}}.parquet",
+                "existing_data_behavior": "overwrite_or_ignore",
+            },
+        )
         
         self.metadata.records_written = len(df)
         self.logger.info(f"Appended {len(df):,} records to {target_dir}")
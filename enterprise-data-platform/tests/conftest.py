@@ -0,0 +1,34 @@
+"""
+Shared pytest configuration and fixtures.
+"""
+
+import polars as pl
+import pytest
+
+
+@pytest.fixture
+def outlier_df() -> pl.DataFrame:
+    """Numeric column 1..100 with a single extreme value appended."""
+    return pl.DataFrame({
+        "value": [float(i) for i in range(1, 101)] + [1000.0],
+    })
+
+
+@pytest.fixture
+def mock_http(monkeypatch: pytest.MonkeyPatch):
+    """
+    Route every httpx.AsyncClient request to a handler instead of the network.
+    
+    Usage: mock_http(handler), where handler takes an httpx.Request and
+    returns an httpx.Response (sync or async).
+    """
+    httpx = pytest.importorskip("httpx")
+    async_client = httpx.AsyncClient
+    
+    def install(handler):
+        def client(*args, **kwargs):
+            return async_client(*args, transport=httpx.MockTransport(handler), **kwargs)
+        
+        monkeypatch.setattr(httpx, "AsyncClient", client)
+    
+    return install
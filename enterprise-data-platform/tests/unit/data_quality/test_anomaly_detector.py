@@ -0,0 +1,770 @@
+"""
+Unit tests for the 3-tier anomaly detector.
+"""
+
+import dataclasses
+import subprocess
+import sys
+import textwrap
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+import anomaly_detector
+from anomaly_detector import (
+    NUMBA_AVAILABLE,
+    Anomaly,
+    AnomalyDetector,
+    AnomalySeverity,
+    AnomalyType,
+    TierOneValidator,
+    TierThreeVolatilityAnalyzer,
+    TierTwoOutlierDetector,
+)
+
+requires_numba = pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+
+
+class TestAnomaly:
+    """Tests for the Anomaly record."""
+    
+    @pytest.fixture
+    def anomaly(self) -> Anomaly:
+        """Minimal anomaly instance."""
+        return Anomaly(
+            anomaly_id="validation_x",
+            anomaly_type=AnomalyType.VALIDATION,
+            severity=AnomalySeverity.LOW,
+            column="x",
+            detected_at=datetime(2024, 1, 1),
+            description="test",
+            value=None,
+        )
+    
+    def test_slotted_and_frozen(self, anomaly: Anomaly):
+        """Test that anomalies are immutable and carry no per-instance dict."""
+        assert not hasattr(anomaly, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            anomaly.severity = AnomalySeverity.HIGH
+    
+    def test_optional_fields_default_to_none(self, anomaly: Anomaly):
+        """Test that metadata and samples are not allocated by default."""
+        assert anomaly.metadata is None
+        assert anomaly.sample_records is None
+
+class TestTierOneValidator:
+    """Tests for Tier 1 validation checks."""
+    
+    def test_required_columns_null_counts(self):
+        """Test that null counts for all required columns come from one aggregation."""
+        df = pl.DataFrame({
+            "a": [1, None, 3, 4],
+            "b": ["x", "y", "z", "w"],
+            "c": [None, None, None, 1],
+        })
+        validator = TierOneValidator("test").add_required_columns(["a", "b", "c", "d"])
+        
+        anomalies = {a.anomaly_id: a for a in validator.detect(df)}
+        
+        assert set(anomalies) == {"validation_a_nulls", "validation_c_nulls", "validation_d_missing"}
+        assert anomalies["validation_a_nulls"].affected_records == 1
+        assert anomalies["validation_c_nulls"].affected_records == 3
+        assert anomalies["validation_d_missing"].severity is AnomalySeverity.CRITICAL
+        assert anomalies["validation_d_missing"].affected_records == 4
+    
+    def test_required_columns_without_nulls(self):
+        """Test that complete required columns produce no anomalies."""
+        df = pl.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        validator = TierOneValidator("test").add_required_columns(["a", "b"])
+        
+        assert validator.detect(df) == []
+    
+    def test_missing_columns_from_schema(self):
+        """Test that missing required columns are read off the schema, in configuration order."""
+        schema = pl.Schema({"a": pl.Int64, "b": pl.Utf8})
+        
+        assert TierOneValidator("test").missing_columns(schema) == []
+        validator = TierOneValidator("test").add_required_columns(["d", "a", "c", "d"])
+        assert validator.missing_columns(schema) == ["d", "c"]
+    
+    def test_negative_samples_bounded(self):
+        """Test that negative-value samples stop at the first five matches."""
+        df = pl.DataFrame({"qty": [-i for i in range(1, 21)] + [3]})
+        validator = TierOneValidator("test").add_positive_check(["qty"])
+        
+        anomaly = validator.detect(df)[0]
+        
+        assert anomaly.affected_records == 20
+        assert anomaly.metadata["sample_values"] == [-1, -2, -3, -4, -5]
+    
+    def test_business_rule_exprs_evaluated_together(self):
+        """Test that expression rules report their own violation counts."""
+        df = pl.DataFrame({"order": [1, 2, 3], "ship": [2, 1, 0]})
+        validator = (
+            TierOneValidator("test")
+            .add_business_rule_expr("ship_after_order", pl.col("ship") >= pl.col("order"))
+            .add_business_rule_expr("ship_positive", pl.col("ship") > 0, "Ship must be positive")
+            .add_business_rule_expr("order_positive", pl.col("order") > 0)
+        )
+        
+        anomalies = {a.anomaly_id: a for a in validator.detect(df)}
+        
+        assert set(anomalies) == {"validation_ship_after_order", "validation_ship_positive"}
+        assert anomalies["validation_ship_after_order"].affected_records == 2
+        assert anomalies["validation_ship_positive"].affected_records == 1
+        assert anomalies["validation_ship_positive"].description == "Ship must be positive"
+    
+    def test_broken_business_rule_expr_isolated(self, caplog: pytest.LogCaptureFixture):
+        """Test that one failing expression rule does not drop the others."""
+        df = pl.DataFrame({"qty": [1, -2, -3]})
+        validator = (
+            TierOneValidator("test")
+            .add_business_rule_expr("qty_positive", pl.col("qty") > 0)
+            .add_business_rule_expr("broken", pl.col("no_such_column") > 0)
+        )
+        
+        anomalies = validator.detect(df)
+        
+        assert [(a.anomaly_id, a.affected_records) for a in anomalies] == [
+            ("validation_qty_positive", 2),
+        ]
+        assert "Business rule broken failed" in caplog.text
+    
+    def test_callable_business_rule_still_supported(self):
+        """Test that callable rules keep working next to expression rules."""
+        df = pl.DataFrame({"qty": [1, -2, 3]})
+        validator = (
+            TierOneValidator("test")
+            .add_business_rule("callable", lambda frame: frame["qty"] > 0)
+            .add_business_rule_expr("expr", pl.col("qty") > 0)
+        )
+        
+        anomalies = validator.detect(df)
+        
+        assert [a.anomaly_id for a in anomalies] == ["validation_callable", "validation_expr"]
+    
+    def test_negative_counts_across_columns(self):
+        """Test that negative counts for several columns come from one aggregation."""
+        df = pl.DataFrame({"a": [-1, 2, -3], "b": [1, 2, 3], "c": [-1.5, 0.0, 1.0]})
+        validator = TierOneValidator("test").add_positive_check(["a", "b", "c", "missing"])
+        
+        anomalies = {a.column: a for a in validator.detect(df)}
+        
+        assert set(anomalies) == {"a", "c"}
+        assert anomalies["a"].affected_records == 2
+        assert anomalies["a"].value == -1
+        assert anomalies["c"].affected_records == 1
+    
+    def test_future_date_counts(self):
+        """Test that future dates are counted per column against today."""
+        today = date.today()
+        df = pl.DataFrame({
+            "shipped": [today - timedelta(days=1), today + timedelta(days=30)],
+            "ordered": [today - timedelta(days=3), today - timedelta(days=2)],
+        })
+        validator = TierOneValidator("test").add_non_future_date(["shipped", "ordered"])
+        
+        anomalies = validator.detect(df)
+        
+        assert [(a.anomaly_id, a.affected_records) for a in anomalies] == [
+            ("validation_shipped_future", 1),
+        ]
+    
+    def test_rules_stored_as_method_and_args(self):
+        """Test that built-in rules are stored as dispatchable (method, args) pairs."""
+        validator = (
+            TierOneValidator("test")
+            .add_required_columns(["a"])
+            .add_positive_check(["b"])
+        )
+        
+        assert validator.rules == {
+            "required_columns": ("_check_required", (["a"],)),
+            "positive_values": ("_check_positive", (["b"],)),
+        }
+    
+    def test_failing_rule_does_not_stop_others(self, caplog: pytest.LogCaptureFixture):
+        """Test that an exception in one rule is logged and later rules still run."""
+        df = pl.DataFrame({"name": ["a", "b"], "id": [1, None]})
+        validator = (
+            TierOneValidator("test")
+            .add_positive_check(["name"])
+            .add_required_columns(["id"])
+        )
+        
+        anomalies = validator.detect(df)
+        
+        assert [a.anomaly_id for a in anomalies] == ["validation_id_nulls"]
+        assert "Rule positive_values failed" in caplog.text
+    
+    @pytest.mark.parametrize(
+        ("null_count", "severity"),
+        [
+            (1, AnomalySeverity.MEDIUM),
+            (5, AnomalySeverity.HIGH),
+            (30, AnomalySeverity.CRITICAL),
+        ],
+    )
+    def test_null_ratio_severity(self, null_count: int, severity: AnomalySeverity):
+        """Test that null severity follows the null ratio over the row count."""
+        df = pl.DataFrame({"a": [None] * null_count + [1] * (200 - null_count)}, schema={"a": pl.Int64})
+        validator = TierOneValidator("test").add_required_columns(["a"])
+        
+        anomaly = validator.detect(df)[0]
+        
+        assert anomaly.severity is severity
+        assert f"({null_count / 200:.2%})" in anomaly.description
+    
+    def test_future_datetimes_and_non_date_columns(self):
+        """Test that Datetime columns are compared to today and other dtypes skipped."""
+        now = datetime.utcnow()
+        df = pl.DataFrame({
+            "created": [now - timedelta(days=1), now + timedelta(days=2)],
+            "label": ["2999-01-01", "2999-01-02"],
+        })
+        validator = TierOneValidator("test").add_non_future_date(["created", "label"])
+        
+        anomalies = validator.detect(df, detected_at=now)
+        
+        assert [(a.column, a.affected_records) for a in anomalies] == [("created", 1)]
+    
+    @pytest.mark.parametrize("time_zone", [None, "UTC"])
+    def test_earlier_today_is_not_future(self, time_zone):
+        """Test that timestamps from earlier on the detection day are not counted as future."""
+        detected_at = datetime(2024, 5, 10, 0, 5)
+        df = pl.DataFrame({
+            "created": [
+                datetime(2024, 5, 10, 0, 1),
+                datetime(2024, 5, 9, 23, 0),
+                datetime(2024, 5, 11, 8, 0),
+            ],
+        }).with_columns(pl.col("created").dt.replace_time_zone(time_zone))
+        validator = TierOneValidator("test").add_non_future_date(["created"])
+        
+        anomalies = validator.detect(df, detected_at=detected_at)
+        
+        assert [(a.column, a.affected_records) for a in anomalies] == [("created", 1)]
+    
+    def test_negative_value_is_first_sample(self):
+        """Test that the reported value is the first negative row's value."""
+        df = pl.DataFrame({"amount": [3.5, -0.25, 1.0, -7.0]})
+        validator = TierOneValidator("test").add_positive_check(["amount"])
+        
+        anomaly = validator.detect(df)[0]
+        
+        assert anomaly.value == -0.25
+        assert anomaly.value == anomaly.metadata["sample_values"][0]
+        assert anomaly.metadata["sample_values"] == [-0.25, -7.0]
+
+class TestTierTwoOutlierDetector:
+    """Tests for Tier 2 statistical outlier detection."""
+    
+    @pytest.mark.parametrize("method", ["iqr", "zscore", "mad", "percentile"])
+    def test_fused_statistics_flag_extreme_value(self, outlier_df: pl.DataFrame, method: str):
+        """Test that each method flags the extreme value from the fused aggregation."""
+        detector = TierTwoOutlierDetector("test")
+        getattr(detector, f"add_{method}_check")("value")
+        
+        anomalies = detector.detect(outlier_df)
+        
+        assert [a.anomaly_id for a in anomalies] == [f"outlier_{method}_value"]
+        assert anomalies[0].anomaly_type is AnomalyType.OUTLIER
+        assert anomalies[0].affected_records >= 1
+    
+    def test_fused_statistics_match_direct_computation(self, outlier_df: pl.DataFrame):
+        """Test that fused IQR bounds equal separately computed quantiles."""
+        detector = TierTwoOutlierDetector("test").add_iqr_check("value")
+        
+        anomaly = detector.detect(outlier_df)[0]
+        
+        q1 = outlier_df["value"].quantile(0.25)
+        q3 = outlier_df["value"].quantile(0.75)
+        assert anomaly.metadata["q1"] == q1
+        assert anomaly.metadata["q3"] == q3
+        assert anomaly.expected_range == (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    
+    def test_multiple_columns_detected_together(self, outlier_df: pl.DataFrame):
+        """Test that statistics for several columns are gathered in one detect call."""
+        df = outlier_df.with_columns(other=pl.col("value") * -1)
+        detector = (
+            TierTwoOutlierDetector("test")
+            .add_zscore_check("value")
+            .add_mad_check("other")
+        )
+        
+        anomalies = detector.detect(df)
+        
+        assert {a.anomaly_id for a in anomalies} == {"outlier_zscore_value", "outlier_mad_other"}
+    
+    def test_no_anomalies_for_uniform_data(self):
+        """Test that constant data produces no outliers."""
+        df = pl.DataFrame({"value": [5.0] * 20})
+        detector = (
+            TierTwoOutlierDetector("test")
+            .add_zscore_check("value")
+        )
+        
+        assert detector.detect(df) == []
+    
+    
+    @requires_numba
+    @pytest.mark.parametrize("method", ["zscore", "mad"])
+    def test_numba_kernels_match_polars(self, method: str):
+        """Test that the numba Z-score/MAD kernels agree with the Polars path."""
+        df = pl.DataFrame({
+            "value": [float(i % 17) for i in range(500)] + [250.0, -90.0, None],
+        })
+        polars_detector = TierTwoOutlierDetector("test")
+        numba_detector = TierTwoOutlierDetector("test", use_numba=True)
+        for detector in (polars_detector, numba_detector):
+            getattr(detector, f"add_{method}_check")("value", 2.0)
+        
+        expected = polars_detector.detect(df)[0]
+        actual = numba_detector.detect(df)[0]
+        
+        assert actual.affected_records == expected.affected_records
+        assert actual.deviation_score == pytest.approx(expected.deviation_score)
+        assert actual.metadata == pytest.approx(expected.metadata)
+    
+    def test_use_numba_requires_numba(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that use_numba=True fails fast when numba is not installed."""
+        monkeypatch.setattr(anomaly_detector, "NUMBA_AVAILABLE", False)
+        
+        with pytest.raises(ImportError, match="numba"):
+            TierTwoOutlierDetector("test", use_numba=True)
+    
+    def test_outlier_samples_bounded(self):
+        """Test that IQR samples stop at the first ten outliers, in row order."""
+        df = pl.DataFrame({"value": [1.0] * 50 + [100.0 + i for i in range(15)]})
+        detector = TierTwoOutlierDetector("test").add_iqr_check("value")
+        
+        anomaly = detector.detect(df)[0]
+        
+        assert anomaly.affected_records == 15
+        assert anomaly.metadata["sample_outliers"] == [100.0 + i for i in range(10)]
+        assert anomaly.value == 100.0
+    
+    def test_columns_reported_in_configuration_order(self, outlier_df: pl.DataFrame):
+        """Test that per-column results keep the order checks were added in."""
+        df = outlier_df.with_columns(
+            b=pl.col("value") * 2,
+            c=pl.col("value") * 3,
+        )
+        detector = (
+            TierTwoOutlierDetector("test")
+            .add_iqr_check("c")
+            .add_zscore_check("value")
+            .add_percentile_check("b")
+        )
+        
+        anomalies = detector.detect(df)
+        
+        assert [a.column for a in anomalies] == ["c", "value", "b"]
+    
+    def test_sample_queries_run_concurrently(self, outlier_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that per-column sample queries overlap on worker threads."""
+        df = outlier_df.with_columns(b=pl.col("value") * 2)
+        detector = TierTwoOutlierDetector("test").add_iqr_check("value").add_iqr_check("b")
+        barrier = threading.Barrier(2, timeout=5)
+        detect_iqr = TierTwoOutlierDetector._detect_iqr
+        
+        def meeting_detect_iqr(self, *args, **kwargs):
+            barrier.wait()  # Only returns once both columns are in flight
+            return detect_iqr(self, *args, **kwargs)
+        
+        monkeypatch.setattr(TierTwoOutlierDetector, "_detect_iqr", meeting_detect_iqr)
+        monkeypatch.setattr(anomaly_detector.os, "cpu_count", lambda: 2)
+        
+        anomalies = detector.detect(df)
+        
+        assert [a.column for a in anomalies] == ["value", "b"]
+    
+    @requires_numba
+    def test_numba_kernels_run_on_calling_thread(self, outlier_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that numba kernels are never launched from pool workers."""
+        df = outlier_df.with_columns(b=pl.col("value") * 2, c=pl.col("value") * 3)
+        detector = (
+            TierTwoOutlierDetector("test", use_numba=True)
+            .add_zscore_check("value")
+            .add_mad_check("b")
+            .add_iqr_check("c")
+        )
+        threads = []
+        kernel_counts = TierTwoOutlierDetector._kernel_counts
+        
+        def recording_kernel_counts(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return kernel_counts(self, *args, **kwargs)
+        
+        monkeypatch.setattr(TierTwoOutlierDetector, "_kernel_counts", recording_kernel_counts)
+        
+        anomalies = detector.detect(df)
+        
+        assert threads == [threading.get_ident()] * 2
+        assert [a.column for a in anomalies] == ["value", "b", "c"]
+    
+    @requires_numba
+    @pytest.mark.slow
+    def test_numba_detection_exits_cleanly(self):
+        """Test that a process running several numba checks exits without hanging."""
+        script = textwrap.dedent("""
+            import polars as pl
+            from anomaly_detector import AnomalyDetector
+            
+            df = pl.DataFrame({f"c{i}": [float(j % 7) for j in range(1000)] + [99.0] for i in range(4)})
+            detector = AnomalyDetector("test", use_numba=True)
+            for i in range(4):
+                detector.tier2.add_zscore_check(f"c{i}")
+            detector.tier3.add_rolling_average_check("c0", window_size=5)
+            print(detector.detect(df).total_anomalies)
+        """)
+        
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=120,
+            cwd=Path(anomaly_detector.__file__).parent,
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert int(result.stdout) >= 4
+    
+    def test_percentile_bounds_from_single_quantile_expression(self, outlier_df: pl.DataFrame):
+        """Test that both percentile bounds come from one list-valued quantile."""
+        detector = TierTwoOutlierDetector("test").add_percentile_check("value", lower=0.05, upper=0.95)
+        
+        assert len(detector.aggregations(["value"])) == 1
+        anomaly = detector.detect(outlier_df)[0]
+        
+        assert anomaly.expected_range == (
+            outlier_df["value"].quantile(0.05),
+            outlier_df["value"].quantile(0.95),
+        )
+    
+    def test_all_null_column_has_no_bounds(self):
+        """Test that undefined quantiles skip the column instead of failing."""
+        df = pl.DataFrame({"value": [None, None]}, schema={"value": pl.Float64})
+        detector = TierTwoOutlierDetector("test").add_iqr_check("value")
+        
+        assert detector.detect(df) == []
+    
+    def test_values_on_bounds_are_not_outliers(self):
+        """Test that the outlier mask treats both bounds as inclusive and skips nulls."""
+        df = pl.DataFrame({"value": [0.0, 1.0, 2.0, 3.0, 4.0, None, -10.0]})
+        detector = TierTwoOutlierDetector("test")
+        
+        mask = df.select(detector._outside_bounds("value", (0.0, 4.0))).to_series()
+        
+        assert mask.to_list() == [False, False, False, False, False, None, True]
+        assert mask.sum() == 1
+    
+    def test_mad_cutoff_matches_modified_zscore(self):
+        """Test that the folded MAD cutoff counts the same rows as the modified Z-score."""
+        values = [float((i * 37) % 101) for i in range(300)] + [400.0, -250.0, 180.0]
+        df = pl.DataFrame({"value": values})
+        detector = TierTwoOutlierDetector("test").add_mad_check("value", threshold=2.0)
+        
+        anomaly = detector.detect(df)[0]
+        
+        median = anomaly.metadata["median"]
+        mad = anomaly.metadata["mad"]
+        expected = sum(abs(0.6745 * (v - median) / mad) > 2.0 for v in values)
+        assert anomaly.affected_records == expected
+
+class TestTierThreeVolatilityAnalyzer:
+    """Tests for Tier 3 volatility analysis."""
+    
+    @pytest.fixture
+    def historical_df(self) -> pl.DataFrame:
+        """Previous period with a total of 100."""
+        return pl.DataFrame({"sales": [40.0, 60.0]})
+    
+    def test_spike_detected(self, historical_df: pl.DataFrame):
+        """Test that a sum more than threshold_pct above history is a spike."""
+        df = pl.DataFrame({"sales": [150.0, 160.0]})
+        analyzer = TierThreeVolatilityAnalyzer("test").add_spike_detection("sales", threshold_pct=200)
+        
+        anomalies = analyzer.detect(df, historical_df)
+        
+        assert [a.anomaly_id for a in anomalies] == ["volatility_spike_sales"]
+        assert anomalies[0].deviation_score == pytest.approx(210.0)
+    
+    def test_drop_detected(self, historical_df: pl.DataFrame):
+        """Test that a sum falling below drop threshold is a drop."""
+        df = pl.DataFrame({"sales": [10.0, 20.0]})
+        analyzer = TierThreeVolatilityAnalyzer("test").add_drop_detection("sales", threshold_pct=50)
+        
+        anomalies = analyzer.detect(df, historical_df)
+        
+        assert [a.anomaly_id for a in anomalies] == ["volatility_drop_sales"]
+        assert anomalies[0].deviation_score == pytest.approx(70.0)
+    
+    def test_change_detection_checks_both_directions(self, historical_df: pl.DataFrame):
+        """Test that one change check reports spikes and drops from one sum."""
+        analyzer = TierThreeVolatilityAnalyzer("test").add_change_detection("sales")
+        
+        spike = analyzer.detect(pl.DataFrame({"sales": [400.0]}), historical_df)
+        drop = analyzer.detect(pl.DataFrame({"sales": [20.0]}), historical_df)
+        steady = analyzer.detect(pl.DataFrame({"sales": [110.0]}), historical_df)
+        
+        assert [a.anomaly_id for a in spike] == ["volatility_spike_sales"]
+        assert [a.anomaly_id for a in drop] == ["volatility_drop_sales"]
+        assert steady == []
+    
+    def test_sums_shared_between_spike_and_drop(self, historical_df: pl.DataFrame):
+        """Test that spike and drop checks on one column need a single sum."""
+        analyzer = (
+            TierThreeVolatilityAnalyzer("test")
+            .add_spike_detection("sales")
+            .add_drop_detection("sales")
+        )
+        
+        assert len(analyzer.aggregations(["sales"])) == 1
+    
+    def test_no_change_checks_without_history(self):
+        """Test that spike/drop checks are skipped without historical data."""
+        analyzer = TierThreeVolatilityAnalyzer("test").add_change_detection("sales")
+        
+        assert analyzer.detect(pl.DataFrame({"sales": [1.0]})) == []
+    
+    @pytest.fixture
+    def series_df(self) -> pl.DataFrame:
+        """Daily series with two jumps, stored out of date order."""
+        values = [10.0 + (i % 3) for i in range(30)]
+        values[12] = 40.0
+        values[25] = -20.0
+        start = date(2024, 1, 1)
+        return pl.DataFrame({
+            "date": [start + timedelta(days=i) for i in range(30)],
+            "value": values,
+        }).reverse()
+    
+    def test_rolling_deviation_detected(self, series_df: pl.DataFrame):
+        """Test that values far from the previous window's mean are flagged."""
+        analyzer = TierThreeVolatilityAnalyzer("test").add_rolling_average_check("value", window_size=5)
+        
+        anomaly = analyzer.detect(series_df)[0]
+        
+        assert anomaly.anomaly_id == "volatility_rolling_value"
+        assert anomaly.metadata["sample_values"][:2] == [40.0, -20.0]
+        assert anomaly.metadata["sample_dates"][:2] == [date(2024, 1, 13), date(2024, 1, 26)]
+    
+    @requires_numba
+    def test_rolling_numba_kernel_matches_polars(self, series_df: pl.DataFrame):
+        """Test that the numba online-variance kernel flags the same rows."""
+        polars_analyzer = TierThreeVolatilityAnalyzer("test")
+        numba_analyzer = TierThreeVolatilityAnalyzer("test", use_numba=True)
+        for analyzer in (polars_analyzer, numba_analyzer):
+            analyzer.add_rolling_average_check("value", window_size=5)
+        
+        expected = polars_analyzer.detect(series_df)[0]
+        actual = numba_analyzer.detect(series_df)[0]
+        
+        assert actual.affected_records == expected.affected_records
+        assert actual.metadata == expected.metadata
+    
+    def test_rolling_kernel_only_with_use_numba(self, series_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that the numba kernel is not used unless use_numba=True."""
+        def fail(*args):
+            raise AssertionError("numba kernel called")
+        
+        monkeypatch.setattr(anomaly_detector, "_rolling_z_outliers", fail, raising=False)
+        analyzer = TierThreeVolatilityAnalyzer("test").add_rolling_average_check("value", window_size=5)
+        
+        assert len(analyzer.detect(series_df)) == 1
+    
+    def test_rolling_use_numba_requires_numba(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that use_numba=True fails fast when numba is not installed."""
+        monkeypatch.setattr(anomaly_detector, "NUMBA_AVAILABLE", False)
+        
+        with pytest.raises(ImportError, match="numba"):
+            TierThreeVolatilityAnalyzer("test", use_numba=True)
+
+class TestAnomalyDetector:
+    """Tests for the unified AnomalyDetector."""
+    
+    def test_report_counts_outliers(self, outlier_df: pl.DataFrame):
+        """Test that Tier 2 anomalies show up in the report."""
+        detector = AnomalyDetector("test")
+        detector.tier2.add_iqr_check("value", severity=AnomalySeverity.HIGH)
+        
+        report = detector.detect(outlier_df)
+        
+        assert report.total_records == outlier_df.height
+        assert report.anomalies_by_type[AnomalyType.OUTLIER] == 1
+        assert report.anomalies_by_severity[AnomalySeverity.HIGH] == 1
+    
+    def test_report_counts_every_type_and_severity(self):
+        """Test that report counters include zero entries and drive the health score."""
+        df = pl.DataFrame({"id": [1, None, 3], "qty": [-1, 2, -3]})
+        detector = AnomalyDetector("test")
+        detector.tier1.add_required_columns(["id", "missing"])
+        detector.tier1.add_positive_check(["qty"])
+        
+        report = detector.detect(df)
+        
+        assert set(report.anomalies_by_type) == set(AnomalyType)
+        assert set(report.anomalies_by_severity) == set(AnomalySeverity)
+        assert report.anomalies_by_type[AnomalyType.VALIDATION] == 3
+        assert report.anomalies_by_type[AnomalyType.OUTLIER] == 0
+        # missing column and >10% nulls are CRITICAL, negatives are HIGH
+        assert report.anomalies_by_severity[AnomalySeverity.CRITICAL] == 2
+        assert report.anomalies_by_severity[AnomalySeverity.HIGH] == 1
+        assert report.health_score == 0
+    
+    def test_health_score_penalty_by_severity(self, outlier_df: pl.DataFrame):
+        """Test that the health score subtracts the severity weight per anomaly."""
+        detector = AnomalyDetector("test")
+        detector.tier2.add_iqr_check("value", severity=AnomalySeverity.MEDIUM)
+        
+        report = detector.detect(outlier_df)
+        
+        assert report.health_score == 95
+    
+    def test_collect_stats_batches_current_and_historical(self, outlier_df: pl.DataFrame):
+        """Test that Tier 2 stats and Tier 3 sums come back from one batch."""
+        historical = pl.DataFrame({"value": [1.0, 2.0, 3.0]})
+        detector = AnomalyDetector("test")
+        detector.tier2.add_zscore_check("value")
+        detector.tier3.add_spike_detection("value", threshold_pct=100)
+        
+        current, previous = detector._collect_stats(outlier_df, historical)
+        
+        assert current["value__mean"] == pytest.approx(outlier_df["value"].mean())
+        assert current["value__sum"] == outlier_df["value"].sum()
+        assert previous == {"value__sum": 6.0}
+    
+    def test_collect_stats_without_historical(self, outlier_df: pl.DataFrame):
+        """Test that no historical statistics are returned without historical data."""
+        detector = AnomalyDetector("test")
+        detector.tier3.add_spike_detection("value")
+        
+        current, previous = detector._collect_stats(outlier_df, None)
+        
+        assert current == {"value__sum": outlier_df["value"].sum()}
+        assert previous is None
+    
+    def test_detect_uses_batched_stats_for_all_tiers(self, outlier_df: pl.DataFrame):
+        """Test that one detect call reports Tier 2 and Tier 3 anomalies together."""
+        historical = pl.DataFrame({"value": [1.0, 2.0, 3.0]})
+        detector = AnomalyDetector("test")
+        detector.tier2.add_zscore_check("value")
+        detector.tier3.add_spike_detection("value", threshold_pct=100)
+        
+        report = detector.detect(outlier_df, historical)
+        
+        assert {a.anomaly_id for a in report.anomalies} == {
+            "outlier_zscore_value",
+            "volatility_spike_value",
+        }
+    
+    def test_single_timestamp_per_detect(self, outlier_df: pl.DataFrame):
+        """Test that every anomaly and the report share one detection timestamp."""
+        df = outlier_df.with_columns(qty=pl.col("value") - 50)
+        detector = AnomalyDetector("test")
+        detector.tier1.add_positive_check(["qty"])
+        detector.tier2.add_iqr_check("value")
+        detector.tier3.add_volume_check(expected_min=1000, expected_max=2000)
+        
+        report = detector.detect(df)
+        
+        assert len(report.anomalies) == 3
+        assert {a.detected_at for a in report.anomalies} == {report.detection_timestamp}
+    
+    def test_tier_detect_accepts_timestamp(self, outlier_df: pl.DataFrame):
+        """Test that an explicit detected_at is used for tier anomalies."""
+        detected_at = datetime(2024, 1, 1, 12, 0)
+        detector = TierTwoOutlierDetector("test").add_iqr_check("value")
+        
+        anomalies = detector.detect(outlier_df, detected_at=detected_at)
+        
+        assert anomalies[0].detected_at == detected_at
+    
+    def test_missing_columns_skipped_downstream(self, outlier_df: pl.DataFrame):
+        """Test that Tier 2/3 checks on columns Tier 1 reports missing are skipped."""
+        detector = AnomalyDetector("test")
+        detector.tier1.add_required_columns(["value", "absent"])
+        detector.tier2.add_iqr_check("absent")
+        detector.tier2.add_zscore_check("value")
+        detector.tier3.add_rolling_average_check("absent")
+        
+        report = detector.detect(outlier_df)
+        
+        assert {a.anomaly_id for a in report.anomalies} == {
+            "validation_absent_missing",
+            "outlier_zscore_value",
+        }
+    
+    def test_missing_columns_skipped_when_tier1_rule_fails(self, outlier_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that missing columns are skipped even if the required-column rule itself fails."""
+        detector = AnomalyDetector("test")
+        detector.tier1.add_required_columns(["value", "absent"])
+        detector.tier2.add_zscore_check("value")
+        skipped = []
+        tier2_detect = detector.tier2.detect
+        
+        def recording_detect(df, **kwargs):
+            skipped.append(set(kwargs["skip_columns"]))
+            return tier2_detect(df, **kwargs)
+        
+        def failing_check(*args):
+            raise RuntimeError("boom")
+        
+        monkeypatch.setattr(detector.tier1, "_check_required", failing_check)
+        monkeypatch.setattr(detector.tier2, "detect", recording_detect)
+        
+        detector.detect(outlier_df)
+        
+        assert skipped == [{"absent"}]
+    
+    def test_non_numeric_columns_skipped(self):
+        """Test that Tier 2 ignores configured columns that are not numeric."""
+        df = pl.DataFrame({"name": ["a", "b", "c"]})
+        detector = TierTwoOutlierDetector("test").add_iqr_check("name")
+        
+        assert detector.target_columns(df) == {}
+        assert detector.detect(df) == []
+    
+    def test_report_to_polars(self, outlier_df: pl.DataFrame):
+        """Test that anomalies export as one row each with typed columns."""
+        detector = AnomalyDetector("test")
+        detector.tier2.add_iqr_check("value")
+        detector.tier2.add_zscore_check("other")
+        df = outlier_df.with_columns(other=pl.col("value"))
+        
+        frame = detector.detect(df).to_polars()
+        
+        assert frame.height == 2
+        assert frame["anomaly_id"].to_list() == ["outlier_iqr_value", "outlier_zscore_other"]
+        assert frame["severity"].to_list() == ["medium", "medium"]
+        assert frame.group_by("anomaly_type").len()["len"].to_list() == [2]
+    
+    def test_empty_report_to_polars(self):
+        """Test that a clean report still exports the full schema."""
+        report = AnomalyDetector("test").detect(pl.DataFrame({"value": [1.0]}))
+        
+        frame = report.to_polars()
+        
+        assert frame.height == 0
+        assert frame.schema["detected_at"] == pl.Datetime("us")
+        assert frame.schema["deviation_score"] == pl.Float64
+    
+    def test_streaming_matches_default_engine(self, outlier_df: pl.DataFrame):
+        """Test that the streaming engine yields the same anomalies."""
+        historical = pl.DataFrame({"value": [1.0, 2.0]})
+        reports = []
+        for streaming in (False, True):
+            detector = AnomalyDetector("test", streaming=streaming)
+            detector.tier2.add_iqr_check("value")
+            detector.tier2.add_mad_check("other")
+            detector.tier3.add_spike_detection("value")
+            reports.append(detector.detect(outlier_df.with_columns(other=pl.col("value")), historical))
+        
+        default, streamed = (report.to_polars().drop("detected_at") for report in reports)
+        
+        assert streamed.equals(default)
+        assert default.height == 3
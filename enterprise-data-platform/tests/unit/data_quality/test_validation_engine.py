@@ -0,0 +1,654 @@
+"""
+Unit tests for the validation rules engine.
+"""
+
+import dataclasses
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+import validation_engine
+from validation_engine import (
+    RuleSeverity,
+    RuleType,
+    ValidationEngine,
+    ValidationReport,
+    ValidationResult,
+    ValidationRule,
+)
+
+
+@pytest.fixture
+def orders_df() -> pl.DataFrame:
+    """Small orders frame with one violation per built-in rule."""
+    return pl.DataFrame({
+        "order_id": [1, 2, 2, 4, 5],
+        "sku": ["A-1", "B-2", None, "bad", "C-3"],
+        "qty": [5, -1, 3, 10, 200],
+        "status": ["open", "open", "closed", "lost", "closed"],
+    })
+
+
+def _results(report: ValidationReport) -> dict:
+    """Results of a report keyed by rule name."""
+    return {result.rule_name: result for result in report.results}
+
+
+class TestValidationEngine:
+    """Tests for ValidationEngine rule execution."""
+    
+    @pytest.fixture
+    def engine(self) -> ValidationEngine:
+        """Engine with one rule of each fusable type."""
+        return ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+            ValidationRule("order_unique", RuleType.UNIQUE, column="order_id"),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0, "max": 100}),
+            ValidationRule("sku_pattern", RuleType.PATTERN, column="sku", params={"pattern": r"^[A-Z]-\d$"}),
+            ValidationRule("status_allowed", RuleType.ALLOWED_VALUES, column="status", params={"values": ["open", "closed"]}),
+        ])
+    
+    def test_fused_counts(self, engine: ValidationEngine, orders_df: pl.DataFrame):
+        """Test that every rule's count comes out of the single fused query."""
+        results = _results(engine.validate(orders_df))
+        
+        assert {name: result.invalid_records for name, result in results.items()} == {
+            "sku_not_null": 1,
+            "order_unique": 1,
+            "qty_range": 2,
+            "sku_pattern": 2,
+            "status_allowed": 1,
+        }
+        assert not any(result.passed for result in results.values())
+    
+    def test_fused_counts_match_individual_execution(self, engine: ValidationEngine, orders_df: pl.DataFrame):
+        """Test that fused and per-rule execution produce the same counts."""
+        fused = _results(engine.validate(orders_df))
+        
+        lf = orders_df.lazy()
+        for rule in engine.rules:
+            result = engine._execute_rule(rule, lf, orders_df.schema, orders_df.height)
+            assert result.invalid_records == fused[rule.name].invalid_records
+    
+    def test_fused_failure_falls_back_to_individual_rules(self, orders_df: pl.DataFrame):
+        """Test that one rule failing at runtime does not fail the others."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+            ValidationRule("bad_cast", RuleType.CUSTOM, check_expr=pl.col("sku").cast(pl.Int64) > 0),
+        ])
+        
+        results = _results(engine.validate(orders_df))
+        
+        assert results["sku_not_null"].invalid_records == 1
+        assert results["bad_cast"].message.startswith("Rule execution error")
+        assert results["bad_cast"].severity is RuleSeverity.ERROR
+    
+    def test_execution_time_from_perf_counter(self, orders_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that rule timings are taken from the monotonic ns counter."""
+        ticks = iter([1_000_000, 3_500_000])
+        monkeypatch.setattr(validation_engine.time, "perf_counter_ns", lambda: next(ticks))
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku")
+        )
+        
+        result = engine.validate(orders_df).results[0]
+        
+        assert result.execution_time_ms == 2.5
+    
+    def test_pattern_uses_polars_regex_syntax(self):
+        """Test that PATTERN rules accept Rust regex syntax such as Unicode classes."""
+        df = pl.DataFrame({"name": ["Émile", "zoë", "Ångström", None]})
+        engine = ValidationEngine("people").add_rule(
+            ValidationRule("capitalized", RuleType.PATTERN, column="name", params={"pattern": r"^\p{Lu}"})
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        # The null and the lowercase name do not match
+        assert result.invalid_records == 2
+    
+    def test_invalid_pattern_rejected_when_added(self):
+        """Test that an invalid regex fails at configuration time."""
+        engine = ValidationEngine("people")
+        
+        with pytest.raises(ValueError, match="Invalid pattern for rule broken"):
+            engine.add_rule(ValidationRule("broken", RuleType.PATTERN, column="name", params={"pattern": "(unclosed"}))
+        assert engine.rules == []
+    
+    @pytest.mark.parametrize(
+        ("values", "invalid"),
+        [
+            ([1, 3], 1),
+            ([1, 2.5], 2),  # 2.5 must not match 2
+            ([1, "x"], 2),  # mixed types are widened, not rejected
+        ],
+    )
+    def test_allowed_values_cast_to_column_dtype(self, values: list, invalid: int):
+        """Test that allowed values are matched losslessly against the column dtype."""
+        df = pl.DataFrame({"code": [1, 2, 3]})
+        engine = ValidationEngine("codes").add_rule(
+            ValidationRule("code_allowed", RuleType.ALLOWED_VALUES, column="code", params={"values": values})
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        assert result.invalid_records == invalid
+        assert not result.message.startswith("Rule execution error")
+    
+    def test_referential_against_registered_series(self):
+        """Test that reference data is kept as a Series and used for membership."""
+        df = pl.DataFrame({"sku": ["A", "B", "Z"]})
+        engine = (
+            ValidationEngine("orders")
+            .register_reference_data("skus", pl.DataFrame({"sku": ["A", "B", "B"]}), column="sku")
+            .add_rule(ValidationRule("sku_ref", RuleType.REFERENTIAL, column="sku", params={"reference": "skus"}))
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        assert isinstance(engine._reference_data["skus"], pl.Series)
+        assert result.invalid_records == 1
+    
+    def test_referential_with_different_dtype(self):
+        """Test that reference values match a key column of another integer width."""
+        df = pl.DataFrame({"id": pl.Series([1, 2, 9], dtype=pl.Int32)})
+        engine = (
+            ValidationEngine("orders")
+            .register_reference_data("ids", [1, 2, 3])
+            .add_rule(ValidationRule("id_ref", RuleType.REFERENTIAL, column="id", params={"reference": "ids"}))
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        assert result.invalid_records == 1
+        assert result.message == "1 orphan records"
+    
+    def test_unique_composite_key(self):
+        """Test that UNIQUE counts repeated key combinations, not repeated values."""
+        df = pl.DataFrame({
+            "sku": ["A", "A", "B", "A", None, None],
+            "loc": [1, 2, 1, 1, 3, 3],
+        })
+        engine = ValidationEngine("stock").add_rules([
+            ValidationRule("sku_loc_unique", RuleType.UNIQUE, columns=["sku", "loc"]),
+            ValidationRule("sku_unique", RuleType.UNIQUE, column="sku"),
+        ])
+        
+        results = _results(engine.validate(df))
+        
+        assert results["sku_loc_unique"].invalid_records == 2
+        assert results["sku_loc_unique"].column == "sku, loc"
+        assert results["sku_unique"].invalid_records == 3
+    
+    @pytest.mark.parametrize(("threshold", "passed"), [(0.8, True), (0.95, False)])
+    def test_completeness_over_all_cells(self, orders_df: pl.DataFrame, threshold: float, passed: bool):
+        """Test that completeness counts null cells across every column."""
+        df = orders_df.with_columns(pl.when(pl.col("qty") > 50).then(None).otherwise(pl.col("status")).alias("status"))
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("complete", RuleType.COMPLETENESS, params={"threshold": threshold})
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        # 2 null cells out of 5 rows x 4 columns
+        assert result.message == f"Completeness: 90.00% (threshold: {threshold:.0%})"
+        assert result.passed is passed
+    
+    def test_custom_expression_and_sql_rules(self):
+        """Test that CUSTOM rules given as expressions or SQL run in the fused query."""
+        df = pl.DataFrame({"ordered": [1, 2, 3], "shipped": [2, 1, 3]})
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("expr", RuleType.CUSTOM, check_expr=pl.col("shipped") >= pl.col("ordered")),
+            ValidationRule.from_sql("sql", "shipped > ordered", description="Ships after order"),
+            ValidationRule("callable", RuleType.CUSTOM, custom_check=lambda frame: frame["shipped"] > 0),
+        ])
+        
+        results = _results(engine.validate(df))
+        
+        assert results["expr"].invalid_records == 1
+        assert results["sql"].invalid_records == 2
+        assert results["sql"].message == "Ships after order"
+        assert results["callable"].passed
+    
+    def test_custom_rule_without_check_fails(self, orders_df: pl.DataFrame):
+        """Test that a CUSTOM rule with neither form is reported as an error."""
+        engine = ValidationEngine("orders").add_rule(ValidationRule("empty", RuleType.CUSTOM))
+        
+        result = engine.validate(orders_df).results[0]
+        
+        assert not result.passed
+        assert "must have check_expr or custom_check" in result.message
+    
+    def test_fail_fast_skips_after_critical_failure(self, orders_df: pl.DataFrame):
+        """Test that a failing CRITICAL rule skips every non-critical rule."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku", severity=RuleSeverity.CRITICAL),
+        ])
+        
+        report = engine.validate(orders_df, fail_fast=True)
+        results = _results(report)
+        
+        assert [result.rule_name for result in report.results] == ["qty_range", "sku_not_null"]
+        assert results["qty_range"].skipped
+        assert not results["sku_not_null"].skipped
+        assert (report.passed_rules, report.failed_rules, report.critical_failures) == (0, 1, 1)
+    
+    def test_fail_fast_runs_everything_when_critical_rules_pass(self, orders_df: pl.DataFrame):
+        """Test that fail_fast only changes the outcome after a critical failure."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+            ValidationRule("id_not_null", RuleType.NOT_NULL, column="order_id", severity=RuleSeverity.CRITICAL),
+        ])
+        
+        report = engine.validate(orders_df, fail_fast=True)
+        
+        assert not any(result.skipped for result in report.results)
+        assert report.error_failures == 1
+    
+    def test_quality_score_weighted_by_severity(self, orders_df: pl.DataFrame):
+        """Test that the quality score weights each rule's valid ratio by severity."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("id_not_null", RuleType.NOT_NULL, column="order_id", severity=RuleSeverity.CRITICAL),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0, "max": 100}),
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku", severity=RuleSeverity.WARNING),
+        ])
+        
+        report = engine.validate(orders_df)
+        
+        assert report.overall_quality_score == pytest.approx((10 * 1.0 + 5 * 0.6 + 2 * 0.8) / 17)
+        assert (report.passed_rules, report.error_failures, report.warning_failures) == (1, 1, 1)
+    
+    def test_quality_score_without_rules(self, orders_df: pl.DataFrame):
+        """Test that an engine without rules scores a perfect 1.0."""
+        report = ValidationEngine("orders").validate(orders_df)
+        
+        assert report.overall_quality_score == 1.0
+        assert report.total_rules == 0
+    
+    def test_report_timestamp_is_naive_utc(self, orders_df: pl.DataFrame):
+        """Test that the report timestamp is naive UTC, comparable with the other pipeline timestamps."""
+        before = datetime.utcnow()
+        
+        report = ValidationEngine("orders").validate(orders_df)
+        
+        assert report.validation_timestamp.tzinfo is None
+        assert before <= report.validation_timestamp <= datetime.utcnow()
+    
+    def test_total_records_shared_by_all_rules(self, orders_df: pl.DataFrame):
+        """Test that every result reports the frame's row count."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+        ])
+        
+        report = engine.validate(orders_df)
+        
+        assert report.total_records == 5
+        assert [result.total_records for result in report.results] == [5, 5]
+        assert [result.valid_records for result in report.results] == [4, 4]
+    
+    def test_empty_frame_percentages(self):
+        """Test that an empty frame reports 0% invalid rather than dividing by zero."""
+        df = pl.DataFrame({"sku": []}, schema={"sku": pl.String})
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku")
+        )
+        
+        result = engine.validate(df).results[0]
+        
+        assert result.passed
+        assert result.invalid_percentage == 0.0
+    
+    @pytest.mark.parametrize(
+        ("params", "invalid"),
+        [
+            ({"max": 10}, 1),
+            ({"min": 0}, 1),
+            ({"min": 0, "max": 10}, 2),
+            ({}, 0),
+        ],
+    )
+    def test_range_counts_are_native_ints(self, orders_df: pl.DataFrame, params: dict, invalid: int):
+        """Test that range rules count one- and two-sided bounds as Python ints."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params=params)
+        )
+        
+        result = engine.validate(orders_df).results[0]
+        
+        assert type(result.invalid_records) is int
+        assert type(result.valid_records) is int
+        assert result.invalid_records == invalid
+    
+    def test_invalid_samples_only_for_failing_rules(self, orders_df: pl.DataFrame):
+        """Test that allowed-value samples are gathered only when the rule fails."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("status_strict", RuleType.ALLOWED_VALUES, column="status", params={"values": ["open"]}),
+            ValidationRule("status_all", RuleType.ALLOWED_VALUES, column="status", params={"values": ["open", "closed", "lost"]}),
+        ])
+        
+        results = _results(engine.validate(orders_df))
+        
+        assert sorted(results["status_strict"].sample_invalid) == ["closed", "lost"]
+        assert results["status_all"].sample_invalid is None
+    
+    def test_compiled_validation_matches_validate(self, engine: ValidationEngine, orders_df: pl.DataFrame):
+        """Test that the compiled function reproduces validate() results."""
+        validate_batch = engine.compile()
+        
+        compiled = validate_batch(orders_df)
+        direct = engine.validate(orders_df)
+        
+        assert [r.invalid_records for r in compiled.results] == [r.invalid_records for r in direct.results]
+        assert compiled.overall_quality_score == direct.overall_quality_score
+    
+    def test_compiled_function_cached_until_rules_change(self, engine: ValidationEngine, orders_df: pl.DataFrame):
+        """Test that compile() is cached and invalidated by new rules or references."""
+        validate_batch = engine.compile()
+        assert engine.compile() is validate_batch
+        
+        engine.add_rule(ValidationRule("qty_not_null", RuleType.NOT_NULL, column="qty"))
+        recompiled = engine.compile()
+        assert recompiled is not validate_batch
+        assert len(recompiled(orders_df).results) == 6
+        
+        engine.register_reference_data("skus", ["A-1"])
+        assert engine.compile() is not recompiled
+    
+    def test_dispatch_table_covers_rule_types(self):
+        """Test that every implemented rule type has a check in the lookup table."""
+        handled = set(ValidationEngine._DISPATCH) | {RuleType.COMPLETENESS}
+        
+        assert handled == set(RuleType) - {RuleType.FRESHNESS}
+    
+    def test_unhandled_rule_type_reported(self, orders_df: pl.DataFrame):
+        """Test that a rule type without a check fails with an explicit message."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("fresh", RuleType.FRESHNESS, column="order_id")
+        )
+        
+        result = engine.validate(orders_df).results[0]
+        
+        assert not result.passed
+        assert "Unknown rule type" in result.message
+    
+    def test_lazy_scan_matches_eager_frame(self, engine: ValidationEngine, orders_df: pl.DataFrame, tmp_path: Path):
+        """Test that a scanned LazyFrame validates the same as the eager frame."""
+        path = tmp_path / "orders.parquet"
+        orders_df.write_parquet(path)
+        
+        lazy = engine.validate(pl.scan_parquet(path))
+        eager = engine.validate(orders_df)
+        
+        assert lazy.total_records == 5
+        assert [r.invalid_records for r in lazy.results] == [r.invalid_records for r in eager.results]
+    
+    def test_callable_rules_run_concurrently_in_rule_order(self, orders_df: pl.DataFrame):
+        """Test that pooled callable rules keep rule order and isolate errors."""
+        def broken(frame: pl.DataFrame) -> pl.Series:
+            raise RuntimeError("boom")
+        
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("qty_positive", RuleType.CUSTOM, custom_check=lambda frame: frame["qty"] > 0),
+            ValidationRule("broken", RuleType.CUSTOM, custom_check=broken),
+            ValidationRule("id_positive", RuleType.CUSTOM, custom_check=lambda frame: frame["order_id"] > 0),
+        ])
+        
+        report = engine.validate(orders_df)
+        
+        assert [r.rule_name for r in report.results] == ["qty_positive", "broken", "id_positive"]
+        assert [r.invalid_records for r in report.results] == [1, 5, 0]
+        assert report.results[1].message == "Rule execution error: boom"
+    
+    def test_rule_failure_logged_with_traceback(self, orders_df: pl.DataFrame, caplog: pytest.LogCaptureFixture):
+        """Test that failing rules are logged lazily, with the exception, on the table's logger."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("broken", RuleType.CUSTOM, custom_check=lambda frame: frame["missing"] > 0)
+        )
+        
+        engine.validate(orders_df)
+        
+        record = next(r for r in caplog.records if r.levelname == "ERROR")
+        assert record.name == "validation.orders"
+        assert record.msg == "Rule execution failed: %s - %s"
+        assert record.args[0] == "broken"
+        assert record.exc_info is not None
+    
+    @pytest.mark.parametrize(
+        "values",
+        [
+            {"A", "B"},
+            ["A", "B", "A"],
+            pl.Series(["B", "A", "B"]),
+        ],
+    )
+    def test_reference_data_deduplicated_on_registration(self, values):
+        """Test that reference data of any supported type is stored as unique values."""
+        engine = ValidationEngine("orders").register_reference_data("skus", values)
+        
+        assert sorted(engine._reference_data["skus"].to_list()) == ["A", "B"]
+    
+    def test_reference_dataframe_requires_column(self):
+        """Test that a DataFrame reference without a column is rejected."""
+        engine = ValidationEngine("orders")
+        
+        with pytest.raises(ValueError, match="Column must be specified"):
+            engine.register_reference_data("skus", pl.DataFrame({"sku": ["A"]}))
+    
+    def test_check_feasibility_against_schema(self):
+        """Test that rules are reviewed against a schema without data."""
+        engine = (
+            ValidationEngine("orders")
+            .add_rules([
+                ValidationRule("missing", RuleType.NOT_NULL, column="absent"),
+                ValidationRule("range_on_text", RuleType.RANGE, column="sku", params={"min": 0}),
+                ValidationRule("pattern_on_int", RuleType.PATTERN, column="qty", params={"pattern": "x"}),
+                ValidationRule("no_ref", RuleType.REFERENTIAL, column="sku", params={"reference": "skus"}),
+                ValidationRule("ok", RuleType.NOT_NULL, column="sku"),
+            ])
+        )
+        
+        problems = engine.check_feasibility({"sku": pl.String, "qty": pl.Int64})
+        
+        assert problems == [
+            "missing: missing column(s) absent",
+            "range_on_text: range check on non-numeric column sku (String)",
+            "pattern_on_int: pattern check on non-string column qty (Int64)",
+            "no_ref: reference data not registered: skus",
+        ]
+    
+    def test_infeasible_rules_fail_at_their_severity(self, orders_df: pl.DataFrame):
+        """Test that an infeasible rule is reported as a failure at its own severity."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("missing", RuleType.NOT_NULL, column="absent", severity=RuleSeverity.WARNING),
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+        ])
+        
+        report = engine.validate(orders_df)
+        result = _results(report)["missing"]
+        
+        assert result.severity is RuleSeverity.WARNING
+        assert result.message == "Rule infeasible: missing column(s) absent"
+        assert (report.warning_failures, report.critical_failures) == (1, 0)
+    
+    def test_infeasible_critical_rule_halts_fail_fast(self, orders_df: pl.DataFrame):
+        """Test that an infeasible CRITICAL rule counts as a critical failure for fail_fast."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("missing", RuleType.NOT_NULL, column="absent", severity=RuleSeverity.CRITICAL),
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+        ])
+        
+        report = engine.validate(orders_df, fail_fast=True)
+        
+        assert _results(report)["sku_not_null"].skipped
+        assert report.critical_failures == 1
+    
+    def test_schema_resolved_once_per_validate(self, engine: ValidationEngine, orders_df: pl.DataFrame, monkeypatch: pytest.MonkeyPatch):
+        """Test that the frame schema is resolved once, not per rule."""
+        calls = []
+        collect_schema = pl.LazyFrame.collect_schema
+        
+        def counting_collect_schema(lf: pl.LazyFrame) -> pl.Schema:
+            calls.append(lf)
+            return collect_schema(lf)
+        
+        monkeypatch.setattr(pl.LazyFrame, "collect_schema", counting_collect_schema)
+        engine.add_rule(ValidationRule("complete", RuleType.COMPLETENESS))
+        
+        engine.validate(orders_df)
+        
+        assert len(calls) == 1
+    
+    def test_completeness_uses_passed_schema(self, orders_df: pl.DataFrame):
+        """Test that completeness counts cells from the schema it is given."""
+        engine = ValidationEngine("orders")
+        rule = ValidationRule("complete", RuleType.COMPLETENESS, params={"threshold": 0.9})
+        lf = orders_df.lazy()
+        
+        result = engine._execute_rule(rule, lf, orders_df.schema, orders_df.height)
+        
+        # 1 null cell out of 5 rows x 4 columns
+        assert result.message == "Completeness: 95.00% (threshold: 90%)"
+    
+    def test_rules_from_config_values(self, orders_df: pl.DataFrame):
+        """Test that enum members looked up by value dispatch and count by identity."""
+        config = {"name": "sku_not_null", "type": "not_null", "column": "sku", "severity": "critical"}
+        engine = ValidationEngine("orders").add_rule(ValidationRule(
+            config["name"],
+            RuleType(config["type"]),
+            column=config["column"],
+            severity=RuleSeverity(config["severity"]),
+        ))
+        
+        report = engine.validate(orders_df, fail_fast=True)
+        
+        assert report.results[0].invalid_records == 1
+        assert report.critical_failures == 1
+    
+    def test_projection_limited_to_rule_columns(self, engine: ValidationEngine, orders_df: pl.DataFrame):
+        """Test that queries read only the columns the rules reference, in schema order."""
+        engine.add_rule(ValidationRule("expr", RuleType.CUSTOM, check_expr=pl.col("order_id") > 0))
+        
+        projection = engine._projection(orders_df.schema, list(range(len(engine.rules))))
+        
+        assert projection == ["order_id", "sku", "qty", "status"]
+        assert engine._projection(orders_df.schema, [0, 2]) == ["sku", "qty"]
+    
+    def test_projection_disabled_for_rules_reading_any_column(self, orders_df: pl.DataFrame):
+        """Test that completeness and callable rules keep every column."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku"),
+            ValidationRule("complete", RuleType.COMPLETENESS),
+            ValidationRule("callable", RuleType.CUSTOM, custom_check=lambda frame: frame["qty"] > 0),
+        ])
+        
+        assert engine._projection(orders_df.schema, [0]) == ["sku"]
+        assert engine._projection(orders_df.schema, [0, 1]) is None
+        assert engine._projection(orders_df.schema, [2]) is None
+
+
+class TestQuarantine:
+    """Tests for row-level quarantine."""
+    
+    def test_validate_and_split(self, orders_df: pl.DataFrame):
+        """Test that rows violating hard rules are split off and soft rules ignored."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku", severity=RuleSeverity.CRITICAL),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+            ValidationRule("status_allowed", RuleType.ALLOWED_VALUES, column="status", params={"values": ["open"]}, severity=RuleSeverity.WARNING),
+        ])
+        
+        clean, quarantined, report = engine.validate_and_split(orders_df)
+        
+        assert quarantined["order_id"].to_list() == [2, 2]
+        assert clean["order_id"].to_list() == [1, 4, 5]
+        assert report.quarantine_rules == ["sku_not_null", "qty_range"]
+        # Bit 0: sku_not_null, bit 1: qty_range
+        assert report.quarantine_bits.to_series().to_list() == [0, 2, 1, 0, 0]
+    
+    def test_unique_quarantines_repeats_only(self, orders_df: pl.DataFrame):
+        """Test that only repeated keys, not their first occurrence, are quarantined."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("order_unique", RuleType.UNIQUE, column="order_id")
+        )
+        
+        _, quarantined, _ = engine.validate_and_split(orders_df)
+        
+        assert quarantined["sku"].to_list() == [None]
+    
+    def test_lanes_beyond_64_rules(self):
+        """Test that more than 64 hard rules are packed into several bit lanes."""
+        df = pl.DataFrame({"value": list(range(70))})
+        engine = ValidationEngine("wide").add_rules([
+            ValidationRule(f"not_{i}", RuleType.CUSTOM, check_expr=pl.col("value") != i)
+            for i in range(70)
+        ])
+        
+        clean, quarantined, report = engine.validate_and_split(df)
+        
+        assert report.quarantine_bits.width == 2
+        assert quarantined.height == 70
+        assert clean.height == 0
+        assert report.quarantine_bits.row(69) == (0, 1 << 5)
+    
+    def test_fail_fast_skipped_rules_quarantine_nothing(self, orders_df: pl.DataFrame):
+        """Test that rules skipped after a critical failure leave their rows clean."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku", severity=RuleSeverity.CRITICAL),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+        ])
+        
+        clean, quarantined, report = engine.validate_and_split(orders_df, fail_fast=True)
+        
+        assert _results(report)["qty_range"].skipped
+        assert quarantined["sku"].to_list() == [None]
+        assert clean.height == 4
+        assert report.quarantine_bits.to_series().to_list() == [0, 0, 1, 0, 0]
+    
+    def test_all_rules_skipped_quarantine_nothing(self, orders_df: pl.DataFrame):
+        """Test that an infeasible critical rule halting every phase quarantines nothing."""
+        engine = ValidationEngine("orders").add_rules([
+            ValidationRule("missing", RuleType.NOT_NULL, column="absent", severity=RuleSeverity.CRITICAL),
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku", severity=RuleSeverity.CRITICAL),
+            ValidationRule("qty_range", RuleType.RANGE, column="qty", params={"min": 0}),
+        ])
+        
+        clean, quarantined, report = engine.validate_and_split(orders_df, fail_fast=True)
+        
+        assert all(result.skipped for result in report.results[1:])
+        assert quarantined.height == 0
+        assert clean.height == 5
+    
+    def test_no_quarantine_rules(self, orders_df: pl.DataFrame):
+        """Test that without hard row-level rules no row is quarantined."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("complete", RuleType.COMPLETENESS)
+        )
+        
+        clean, quarantined, report = engine.validate_and_split(orders_df)
+        
+        assert clean.height == 5
+        assert quarantined.height == 0
+        assert report.quarantine_rules == []
+
+
+class TestValidationResult:
+    """Tests for the validation result records."""
+    
+    def test_result_slotted_and_frozen(self, orders_df: pl.DataFrame):
+        """Test that results are immutable slotted records."""
+        engine = ValidationEngine("orders").add_rule(
+            ValidationRule("sku_not_null", RuleType.NOT_NULL, column="sku")
+        )
+        
+        report = engine.validate(orders_df)
+        result = report.results[0]
+        
+        assert isinstance(result, ValidationResult)
+        assert not hasattr(result, "__dict__")
+        assert not hasattr(report, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.passed = True
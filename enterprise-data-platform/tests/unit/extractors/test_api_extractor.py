@@ -0,0 +1,619 @@
+"""
+Unit tests for the REST API extractor.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import polars as pl
+import pytest
+
+from extractors import APIConfig, APIExtractor, PaginationType
+from extractors import api_extractor
+from extractors.api_extractor import TokenBucket
+
+
+def _config(tmp_path: Path, **kwargs) -> APIConfig:
+    """API config against a mocked endpoint, without rate limit or retry waits."""
+    settings = {
+        "source_name": "crm",
+        "target_table": "customers",
+        "bronze_path": tmp_path,
+        "base_url": "https://api.test",
+        "endpoint": "/customers",
+        "requests_per_second": 1000.0,
+        "burst_capacity": 1000,
+        "retry_delay_seconds": 0,
+        "retry_jitter": 0.0,
+        **kwargs,
+    }
+    return APIConfig(**settings)
+
+
+def _offset_handler(total: int, report_total: bool = True):
+    """Handler serving records 0..total-1 by offset/limit."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", 100))
+        body = {"data": [{"id": i, "name": f"c{i}"} for i in range(offset, min(offset + limit, total))]}
+        if report_total:
+            body["total"] = total
+        return httpx.Response(200, json=body)
+    
+    return handler
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+    
+    @pytest.fixture
+    def sleeps(self, monkeypatch: pytest.MonkeyPatch) -> list:
+        """Record rate limiter waits instead of sleeping."""
+        waits = []
+        
+        async def sleep(seconds: float) -> None:
+            waits.append(seconds)
+        
+        monkeypatch.setattr(api_extractor.asyncio, "sleep", sleep)
+        return waits
+    
+    def test_burst_then_throttle(self, sleeps: list):
+        """Test that capacity requests pass at once and the next waits for a refill."""
+        bucket = TokenBucket(rate=10.0, capacity=3)
+        
+        async def take(n: int) -> None:
+            for _ in range(n):
+                await bucket.acquire()
+        
+        asyncio.run(take(3))
+        assert sleeps == []
+        
+        asyncio.run(take(1))
+        assert len(sleeps) == 1
+        assert sleeps[0] == pytest.approx(0.1, abs=0.01)
+    
+    def test_refund_returns_token(self, sleeps: list):
+        """Test that a refunded token can be reused without waiting."""
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        
+        async def take_refund_take() -> None:
+            await bucket.acquire()
+            bucket.refund()
+            await bucket.acquire()
+        
+        asyncio.run(take_refund_take())
+        
+        assert sleeps == []
+    
+    def test_refund_capped_at_capacity(self):
+        """Test that refunds never grow the bucket past its capacity."""
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        
+        bucket.refund()
+        
+        assert bucket._tokens == 2
+
+
+class TestAPIExtractor:
+    """Tests for APIExtractor pagination."""
+    
+    @pytest.mark.parametrize("report_total", [True, False])
+    def test_offset_pagination(self, tmp_path: Path, mock_http, report_total: bool):
+        """Test that all offset pages are fetched in order, with or without a total."""
+        mock_http(_offset_handler(450, report_total))
+        extractor = APIExtractor(_config(tmp_path, pagination_type=PaginationType.OFFSET))
+        
+        df = extractor.extract()
+        
+        assert df["id"].to_list() == list(range(450))
+        assert extractor.metadata.record_count == 450
+        assert "_row_hash" in df.columns
+    
+    def test_extract_async_in_running_loop(self, tmp_path: Path, mock_http):
+        """Test that extract_async can be awaited from an existing event loop."""
+        mock_http(_offset_handler(150))
+        extractor = APIExtractor(_config(tmp_path, pagination_type=PaginationType.OFFSET))
+        
+        async def run() -> pl.DataFrame:
+            return await extractor.extract_async()
+        
+        df = asyncio.run(run())
+        
+        assert df.height == 150
+        assert extractor._session is None  # Closed after the extraction
+    
+    @pytest.mark.parametrize("h2_installed", [True, False])
+    def test_pooled_client_with_http2_when_available(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, h2_installed: bool):
+        """Test that one pooled client is created, asking for HTTP/2 only if h2 is installed."""
+        find_spec = api_extractor.importlib.util.find_spec
+        monkeypatch.setattr(
+            api_extractor.importlib.util,
+            "find_spec",
+            lambda name: (object() if h2_installed else None) if name == "h2" else find_spec(name),
+        )
+        created = []
+        async_client = httpx.AsyncClient
+        
+        def client(**kwargs) -> httpx.AsyncClient:
+            created.append(dict(kwargs))
+            kwargs["http2"] = False  # The h2 package itself is not needed here
+            return async_client(**kwargs)
+        
+        monkeypatch.setattr(httpx, "AsyncClient", client)
+        extractor = APIExtractor(_config(tmp_path))
+        
+        extractor._connect()
+        asyncio.run(extractor._disconnect_async())
+        
+        assert len(created) == 1
+        assert created[0]["http2"] is h2_installed
+        assert created[0]["limits"].max_keepalive_connections == 32
+        assert ("h2 is not installed" in caplog.text) is not h2_installed
+    
+    def test_concurrent_oauth_refreshes_deduplicated(self, tmp_path: Path, mock_http):
+        """Test that concurrent requests finding the token expired share one token request."""
+        token_requests = []
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            token_requests.append(request)
+            await asyncio.sleep(0.01)  # Keep the refresh in flight while the others arrive
+            return httpx.Response(200, json={"access_token": "t1", "expires_in": 3600})
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(
+            tmp_path,
+            auth_type=api_extractor.AuthType.OAUTH2,
+            oauth2_token_url="https://auth.test/token",
+            oauth2_client_id="client",
+            oauth2_client_secret="secret",
+        ))
+        
+        async def refresh_concurrently() -> None:
+            extractor._connect()
+            await asyncio.gather(*[extractor._refresh_oauth_token() for _ in range(10)])
+            await extractor._disconnect_async()
+        
+        asyncio.run(refresh_concurrently())
+        
+        assert len(token_requests) == 1
+        assert extractor._oauth_token == "t1"
+    
+    @pytest.mark.parametrize("data_path", ["results.items", ["results", "items"]])
+    def test_nested_data_path(self, tmp_path: Path, data_path):
+        """Test that dotted and list data paths are split once and reach nested records."""
+        config = _config(tmp_path, data_path=data_path)
+        extractor = APIExtractor(config)
+        
+        records = extractor._extract_data_from_response({"results": {"items": [{"id": 1}]}})
+        
+        assert config._data_keys == ("results", "items")
+        assert records == [{"id": 1}]
+    
+    def test_pages_with_differing_columns_combined(self, tmp_path: Path, mock_http):
+        """Test that per-page frames are aligned by name and widened to a common type."""
+        pages = {
+            0: [{"id": 1, "score": 1}, {"id": 2, "score": 2}],
+            2: [{"id": 3, "score": 2.5, "region": "EU"}],
+        }
+        mock_http(lambda request: httpx.Response(
+            200, json={"data": pages.get(int(request.url.params["offset"]), [])}
+        ))
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, page_size=2, total_path=None
+        ))
+        
+        df = extractor.extract()
+        
+        assert df["id"].to_list() == [1, 2, 3]
+        assert df["score"].to_list() == [1.0, 2.0, 2.5]
+        assert df["region"].to_list() == [None, None, "EU"]
+    
+    @pytest.mark.parametrize("link, expected", [
+        ('<https://api.test/c?page=2>; rel="next"', "https://api.test/c?page=2"),
+        ('<https://api.test/c?p=1>; rel="prev", <https://api.test/c?p=3>; rel=next', "https://api.test/c?p=3"),
+        ('<https://api.test/c?ids=1,2>; rel="next"', "https://api.test/c?ids=1,2"),
+        ('<https://api.test/c?p=1>; rel="prev"', None),
+    ])
+    def test_parse_link_header(self, tmp_path: Path, link: str, expected):
+        """Test that the rel=next target is found among other relations and commas."""
+        extractor = APIExtractor(_config(tmp_path))
+        
+        assert extractor._parse_link_header({"link": link}) == expected
+    
+    @pytest.mark.parametrize("json_backend", ["orjson", "stdlib"])
+    def test_json_backends(self, tmp_path: Path, mock_http, json_backend: str):
+        """Test that orjson and stdlib decoding yield the same records."""
+        if json_backend == "orjson":
+            pytest.importorskip("orjson")
+        mock_http(_offset_handler(250))
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, json_backend=json_backend
+        ))
+        
+        df = extractor.extract()
+        
+        assert (extractor._orjson is not None) is (json_backend == "orjson")
+        assert df.select("id", "name").rows() == [(i, f"c{i}") for i in range(250)]
+    
+    def test_concurrent_fetch_bounded_and_ordered(self, tmp_path: Path, mock_http):
+        """Test that pages after a (string) total are fetched concurrently, bounded, in order."""
+        serve_page = _offset_handler(1000)
+        in_flight = 0
+        peak = 0
+        
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later pages answer first, so order must come from the fetcher
+            await asyncio.sleep(0.02 - int(request.url.params["offset"]) / 100_000)
+            in_flight -= 1
+            response = serve_page(request)
+            return httpx.Response(200, json={**response.json(), "total": "1000"})
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, max_concurrency=3
+        ))
+        
+        df = extractor.extract()
+        
+        assert df["id"].to_list() == list(range(1000))
+        assert peak == 3
+    
+    def test_concurrent_fetch_respects_max_pages(self, tmp_path: Path, mock_http):
+        """Test that max_pages caps the pages fetched from a reported total."""
+        requested = []
+        serve_page = _offset_handler(1000)
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(int(request.url.params["offset"]))
+            return serve_page(request)
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, max_pages=4
+        ))
+        
+        df = extractor.extract()
+        
+        assert sorted(requested) == [0, 100, 200, 300]
+        assert df.height == 400
+    
+    def test_post_sends_body(self, tmp_path: Path, mock_http):
+        """Test that POST requests carry the configured JSON body and auth header."""
+        requests = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(
+            tmp_path,
+            method="post",
+            body={"filter": "active"},
+            auth_type=api_extractor.AuthType.API_KEY,
+            api_key="k",
+        ))
+        
+        extractor.extract()
+        
+        assert requests[0].method == "POST"
+        assert requests[0].headers["X-API-Key"] == "k"
+        assert requests[0].read() == b'{"filter":"active"}'
+    
+    def test_unsupported_method_rejected(self, tmp_path: Path, mock_http):
+        """Test that an unsupported HTTP method fails at connect time."""
+        mock_http(lambda request: httpx.Response(200, json={}))
+        extractor = APIExtractor(_config(tmp_path, method="DELETE"))
+        
+        with pytest.raises(api_extractor.ExtractionError, match="Unsupported HTTP method"):
+            extractor._connect()
+        asyncio.run(extractor._disconnect_async())
+    
+    def test_oauth_token_cached_across_runs(self, tmp_path: Path, mock_http):
+        """Test that a persisted token is reused by the next run, and its refresh token once expired."""
+        grants = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/token":
+                grant = dict(httpx.QueryParams(request.read().decode()))
+                grants.append(grant["grant_type"])
+                return httpx.Response(200, json={
+                    "access_token": f"t{len(grants)}", "expires_in": 3600, "refresh_token": "r1",
+                })
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+        
+        mock_http(handler)
+        cache_path = tmp_path / "tokens" / "oauth.json"
+        
+        def run() -> APIExtractor:
+            extractor = APIExtractor(_config(
+                tmp_path,
+                auth_type=api_extractor.AuthType.OAUTH2,
+                oauth2_token_url="https://auth.test/token",
+                oauth2_client_id="client",
+                oauth2_client_secret="secret",
+                token_cache_path=cache_path,
+            ))
+            extractor.extract()
+            return extractor
+        
+        run()
+        assert grants == ["client_credentials"]
+        assert json.loads(cache_path.read_text())["client"]["refresh_token"] == "r1"
+        
+        run()
+        assert grants == ["client_credentials"]  # Cached token still valid
+        
+        cache = json.loads(cache_path.read_text())
+        cache["client"]["expires_at"] = 0.0
+        cache_path.write_text(json.dumps(cache))
+        extractor = run()
+        assert grants == ["client_credentials", "refresh_token"]
+        assert extractor._oauth_token == "t2"
+    
+    def test_stream_to_bronze(self, tmp_path: Path, mock_http):
+        """Test that streamed pages land in the Bronze file and a LazyFrame over it is returned."""
+        mock_http(_offset_handler(450))
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, stream_to_bronze=True
+        ))
+        
+        lf = extractor.extract()
+        
+        assert isinstance(lf, pl.LazyFrame)
+        assert extractor.write_to_bronze(lf) == extractor._streamed_file
+        assert extractor.metadata.record_count == 450
+        assert extractor.metadata.checksum is not None
+        df = lf.collect()
+        assert df["id"].to_list() == list(range(450))
+        assert {"_source_system", "_row_hash"} <= set(df.columns)
+    
+    def test_failed_stream_leaves_no_bronze_file(self, tmp_path: Path, mock_http):
+        """Test that a stream failing mid-way removes its partial Bronze file."""
+        serve_page = _offset_handler(450, report_total=False)
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.params["offset"] == "200":
+                return httpx.Response(404)
+            return serve_page(request)
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, stream_to_bronze=True
+        ))
+        
+        with pytest.raises(api_extractor.ExtractionError):
+            extractor.extract()
+        
+        assert not list(tmp_path.rglob("*.parquet"))
+    
+    @pytest.mark.parametrize("compression", ["snappy", "lz4", "zstd"])
+    def test_stream_with_default_level_for_any_codec(self, tmp_path: Path, mock_http, compression: str):
+        """Test that the default compression level doesn't break streaming with codecs lacking levels."""
+        mock_http(_offset_handler(150))
+        extractor = APIExtractor(_config(
+            tmp_path,
+            pagination_type=PaginationType.OFFSET,
+            stream_to_bronze=True,
+            compression=compression,
+        ))
+        
+        lf = extractor.extract()
+        
+        assert lf.collect().height == 150
+    
+    def test_empty_stream_writes_empty_bronze_file(self, tmp_path: Path, mock_http):
+        """Test that an empty stream is written like an empty extraction, not a stale file."""
+        mock_http(_offset_handler(450))
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, stream_to_bronze=True
+        ))
+        extractor.write_to_bronze(extractor.extract())
+        mock_http(_offset_handler(0))
+        
+        df = extractor.extract()
+        output_file = extractor.write_to_bronze(df)
+        
+        assert isinstance(df, pl.DataFrame)
+        assert extractor._streamed_file is None
+        assert pl.read_parquet(output_file).height == 0
+        assert extractor.metadata.record_count == 0
+    
+    def test_every_pagination_type_dispatched(self):
+        """Test that each pagination type has a paginator in the dispatch table."""
+        assert set(APIExtractor._PAGINATORS) == set(PaginationType)
+    
+    def test_cursor_pagination(self, tmp_path: Path, mock_http):
+        """Test that cursor pages are followed until no next cursor is returned."""
+        pages = {None: ([{"id": 1}], "c2"), "c2": ([{"id": 2}], "c3"), "c3": ([{"id": 3}], None)}
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            data, next_cursor = pages[request.url.params.get("cursor")]
+            return httpx.Response(200, json={"data": data, "next_cursor": next_cursor})
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(tmp_path, pagination_type=PaginationType.CURSOR))
+        
+        assert extractor.extract()["id"].to_list() == [1, 2, 3]
+    
+    @pytest.mark.parametrize("auth, expected", [
+        ({"auth_type": api_extractor.AuthType.NONE}, None),
+        ({"auth_type": api_extractor.AuthType.BEARER, "bearer_token": "tok"}, "Bearer tok"),
+        ({"auth_type": api_extractor.AuthType.BASIC, "username": "u", "password": "p"}, "Basic dTpw"),
+    ])
+    def test_auth_setup_dispatched(self, tmp_path: Path, mock_http, auth: dict, expected):
+        """Test that each auth type sets its Authorization header (or none)."""
+        mock_http(lambda request: httpx.Response(200, json={}))
+        extractor = APIExtractor(_config(tmp_path, **auth))
+        
+        extractor._connect()
+        headers = dict(extractor._session.headers)
+        asyncio.run(extractor._disconnect_async())
+        
+        assert headers.get("authorization") == expected
+    
+    @pytest.mark.parametrize("status, requests_made", [(503, 2), (500, 2), (404, 1), (401, 1)])
+    def test_only_transient_errors_retried(self, tmp_path: Path, mock_http, status: int, requests_made: int):
+        """Test that server errors are retried and client errors fail at once."""
+        calls = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(status)
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+        
+        mock_http(handler)
+        extractor = APIExtractor(_config(tmp_path))
+        
+        if requests_made == 1:
+            with pytest.raises(api_extractor.ExtractionError):
+                extractor.extract()
+        else:
+            assert extractor.extract().height == 1
+        assert len(calls) == requests_made
+    
+    def test_retry_after_on_server_error(self, tmp_path: Path):
+        """Test that a 5xx Retry-After replaces the computed backoff."""
+        extractor = APIExtractor(_config(tmp_path, retry_delay_seconds=30))
+        request = httpx.Request("GET", "https://api.test/customers")
+        
+        def failure(headers: dict) -> api_extractor.ExtractionError:
+            response = httpx.Response(503, headers=headers, request=request)
+            error = api_extractor.ExtractionError("API request failed")
+            error.__cause__ = httpx.HTTPStatusError("503", request=request, response=response)
+            return error
+        
+        assert extractor._retry_delay(1, failure({"Retry-After": "7"})) == 7.0
+        assert extractor._retry_delay(1, failure({})) == 30
+    
+    def test_rate_limited_requests_wait_and_refund(self, tmp_path: Path, mock_http, monkeypatch: pytest.MonkeyPatch):
+        """Test that 429s wait for Retry-After, refund their token, and stop after max_429_retries."""
+        waits = []
+        refunds = []
+        calls = []
+        
+        async def sleep(seconds: float) -> None:
+            waits.append(seconds)
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        
+        monkeypatch.setattr(api_extractor.asyncio, "sleep", sleep)
+        monkeypatch.setattr(TokenBucket, "refund", lambda bucket: refunds.append(bucket))
+        mock_http(handler)
+        extractor = APIExtractor(_config(tmp_path, max_429_retries=2, retry_attempts=1))
+        
+        with pytest.raises(api_extractor.ExtractionError, match="429"):
+            extractor.extract()
+        
+        assert len(calls) == 3
+        assert waits == [2.0, 2.0]
+        assert len(refunds) == 2
+    
+    def test_rate_limited_request_recovers(self, tmp_path: Path, mock_http, monkeypatch: pytest.MonkeyPatch):
+        """Test that a request succeeding after a 429 returns its page."""
+        calls = []
+        
+        async def sleep(seconds: float) -> None:
+            pass
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429)
+            return httpx.Response(200, json={"data": [{"id": 1}]})
+        
+        monkeypatch.setattr(api_extractor.asyncio, "sleep", sleep)
+        mock_http(handler)
+        extractor = APIExtractor(_config(tmp_path, retry_attempts=1))
+        
+        assert extractor.extract().height == 1
+        assert len(calls) == 2
+    
+    def test_sampled_schema_reused_without_losing_data(self, tmp_path: Path, caplog: pytest.LogCaptureFixture):
+        """Test that later pages reuse the sampled schema, and fall back rather than truncate or drop keys."""
+        extractor = APIExtractor(_config(tmp_path, schema_sample_size=2))
+        
+        first = extractor._page_frame([{"id": 1, "score": 2}, {"id": 2, "score": 3}])
+        matching = extractor._page_frame([{"id": 3, "score": 4}, {"id": 4}])
+        fractional = extractor._page_frame([{"id": 5, "score": 1.7}])
+        extra_key = extractor._page_frame([{"id": 6, "score": 1, "region": "EU"}])
+        
+        assert extractor._page_schema == first.schema
+        assert matching.schema == first.schema
+        assert matching["score"].to_list() == [4, None]
+        assert fractional["score"].to_list() == [1.7]
+        assert extra_key["region"].to_list() == ["EU"]
+        assert caplog.text.count("does not match the sampled schema") == 2
+    
+    def test_schema_not_fixed_from_all_null_sample(self, tmp_path: Path):
+        """Test that a sample with an all-null column does not fix the schema."""
+        extractor = APIExtractor(_config(tmp_path, schema_sample_size=1))
+        
+        extractor._page_frame([{"id": 1, "email": None}])
+        
+        assert extractor._page_schema is None
+    
+    def test_polars_json_backend(self, tmp_path: Path, mock_http):
+        """Test that Polars-decoded pages match the records, including the empty last page."""
+        mock_http(_offset_handler(200, report_total=False))
+        extractor = APIExtractor(_config(
+            tmp_path, pagination_type=PaginationType.OFFSET, json_backend="polars"
+        ))
+        
+        df = extractor.extract()
+        
+        assert extractor._native_json
+        assert df.select("id", "name").rows() == [(i, f"c{i}") for i in range(200)]
+    
+    def test_polars_json_backend_top_level_array(self, tmp_path: Path, mock_http):
+        """Test that a bare array response is decoded natively with no data_path."""
+        mock_http(lambda request: httpx.Response(200, json=[{"id": 1}, {"id": 2}]))
+        extractor = APIExtractor(_config(tmp_path, json_backend="polars", data_path=None))
+        
+        assert extractor.extract()["id"].to_list() == [1, 2]
+    
+    def test_polars_json_backend_needs_shallow_path(self, tmp_path: Path, mock_http, caplog: pytest.LogCaptureFixture):
+        """Test that a nested data_path falls back to dict decoding with a warning."""
+        mock_http(lambda request: httpx.Response(200, json={"results": {"items": [{"id": 1}]}}))
+        extractor = APIExtractor(_config(
+            tmp_path, json_backend="polars", data_path="results.items"
+        ))
+        
+        df = extractor.extract()
+        
+        assert not extractor._native_json
+        assert df["id"].to_list() == [1]
+        assert "Polars JSON decoding needs" in caplog.text
+    
+    @pytest.mark.parametrize("response, expected", [
+        ({"a": {"b": {"c": 1}}}, 1),
+        ({"a": {"b": {}}}, None),
+        ({"a": {"b": [1, 2]}}, None),
+        ({"a": "text"}, None),
+        ([{"a": 1}], None),
+    ])
+    def test_compiled_getter(self, response, expected):
+        """Test that compiled getters return None wherever the path breaks off."""
+        get = api_extractor._compile_getter(("a", "b", "c"))
+        
+        assert get(response) == expected
+    
+    def test_compiled_getter_empty_path(self):
+        """Test that an empty path returns the whole response."""
+        response = [{"id": 1}]
+        
+        assert api_extractor._compile_getter(())(response) is response
+    
+    def test_compiled_getter_quotes_keys(self):
+        """Test that keys are embedded as literals, not code."""
+        get = api_extractor._compile_getter(("it's", 'a"b'))
+        
+        assert get({"it's": {'a"b': 5}}) == 5
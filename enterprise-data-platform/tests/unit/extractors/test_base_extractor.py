@@ -0,0 +1,167 @@
+"""
+Unit tests for the shared extractor behaviour in BaseExtractor.
+"""
+
+import hashlib
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+
+from extractors import BaseExtractor, ExtractorConfig
+from extractors import base_extractor
+
+
+class FrameExtractor(BaseExtractor):
+    """Extractor returning a fixed DataFrame."""
+    
+    def __init__(self, config: ExtractorConfig, df: pl.DataFrame):
+        super().__init__(config)
+        self.df = df
+    
+    def _connect(self) -> None:
+        pass
+    
+    def _extract(self) -> pl.DataFrame:
+        return self.df
+    
+    def _disconnect(self) -> None:
+        pass
+
+
+def _config(tmp_path: Path, **kwargs) -> ExtractorConfig:
+    """Extractor config writing Bronze files under tmp_path."""
+    return ExtractorConfig(source_name="erp", target_table="orders", bronze_path=tmp_path, **kwargs)
+
+
+@pytest.fixture
+def orders_df() -> pl.DataFrame:
+    """Orders with a null in a hashed column."""
+    return pl.DataFrame({
+        "order_id": [1, 2, 3],
+        "sku": ["A-1", None, "C-3"],
+        "qty": [5, 7, 9],
+        "note": ["x", "y", "z"],
+    })
+
+
+class TestRowHash:
+    """Tests for the _row_hash column."""
+    
+    def test_md5_row_hash(self, tmp_path: Path, orders_df: pl.DataFrame):
+        """Test that md5 hashes the first three columns joined by '|', nulls as empty."""
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        df = extractor.extract()
+        
+        expected = [
+            hashlib.md5(key.encode()).hexdigest()
+            for key in ["1|A-1|5", "2||7", "3|C-3|9"]
+        ]
+        assert df["_row_hash"].to_list() == expected
+    
+    def test_native_row_hash(self, tmp_path: Path, orders_df: pl.DataFrame):
+        """Test that native hashes depend only on the hash columns and tell nulls apart."""
+        extractor = FrameExtractor(
+            _config(tmp_path, row_hash_method="native", hash_columns=["order_id", "sku"]),
+            orders_df,
+        )
+        changed = orders_df.with_columns(pl.col("qty") * 10, pl.col("sku").fill_null(""))
+        
+        hashes = extractor._add_row_hash(orders_df)["_row_hash"]
+        changed_hashes = extractor._add_row_hash(changed)["_row_hash"]
+        
+        assert hashes.dtype == pl.Utf8
+        assert hashes.n_unique() == 3
+        assert hashes[0] == changed_hashes[0]
+        assert hashes[1] != changed_hashes[1]  # null sku is not the empty string
+
+
+
+class TestMetadata:
+    """Tests for metadata columns and timing."""
+    
+    def test_metadata_columns(self, tmp_path: Path, orders_df: pl.DataFrame):
+        """Test that metadata columns are constant per extractor and _file_name is typed."""
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        first = extractor.extract()
+        extractor.metadata.file_name = "orders.csv"
+        second = extractor.extract()
+        
+        assert first.schema["_file_name"] == pl.Utf8
+        assert first["_file_name"].null_count() == 3
+        assert second["_file_name"].to_list() == ["orders.csv"] * 3
+        assert first["_extract_timestamp"].equals(second["_extract_timestamp"])
+        assert first["_extract_date"][0] == extractor.metadata.extract_date
+    
+    def test_duration_from_monotonic_clock(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, orders_df: pl.DataFrame):
+        """Test that the duration is measured on the monotonic clock."""
+        clock = iter([100.0, 102.5])
+        monkeypatch.setattr(base_extractor, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        extractor.extract()
+        
+        assert extractor.metadata.duration_seconds == 2.5
+        assert extractor.metadata.status == "success"
+
+    
+    def test_retry_delay_backoff(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, orders_df: pl.DataFrame):
+        """Test that retry delays double per attempt up to the cap, plus jitter."""
+        monkeypatch.setattr(base_extractor.random, "uniform", lambda low, high: high)
+        extractor = FrameExtractor(
+            _config(tmp_path, retry_delay_seconds=2, retry_backoff_cap=5.0, retry_jitter=0.5),
+            orders_df,
+        )
+        error = RuntimeError("timeout")
+        
+        delays = [extractor._retry_delay(attempt, error) for attempt in range(1, 5)]
+        
+        assert delays == [2.5, 4.5, 5.5, 5.5]
+
+
+class TestBronzeWrite:
+    """Tests for writing to the Bronze layer."""
+    
+    def test_checksum_falls_back_to_sha256(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, orders_df: pl.DataFrame):
+        """Test that the default blake3 checksum becomes sha256 when blake3 is missing."""
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(
+            base_extractor.importlib.util,
+            "find_spec",
+            lambda name: None if name == "blake3" else find_spec(name),
+        )
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        output_file = extractor.write_to_bronze(extractor.extract())
+        
+        assert extractor.metadata.checksum_algorithm == "sha256"
+        assert extractor.metadata.checksum == hashlib.sha256(output_file.read_bytes()).hexdigest()
+    
+    def test_blake3_checksum(self, tmp_path: Path, orders_df: pl.DataFrame):
+        """Test that blake3 checksums match the blake3 package's digest."""
+        blake3 = pytest.importorskip("blake3")
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        output_file = extractor.write_to_bronze(extractor.extract())
+        
+        assert extractor.metadata.checksum_algorithm == "blake3"
+        assert extractor.metadata.checksum == blake3.blake3(output_file.read_bytes()).hexdigest()
+    
+    def test_bronze_written_with_configured_compression(self, tmp_path: Path, orders_df: pl.DataFrame):
+        """Test that Bronze files use zstd by default, with column statistics."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        extractor = FrameExtractor(_config(tmp_path), orders_df)
+        
+        output_file = extractor.write_to_bronze(extractor.extract())
+        
+        column = pq.ParquetFile(output_file).metadata.row_group(0).column(0)
+        assert output_file.parent.name == f"extract_date={extractor.metadata.extract_date}"
+        assert column.compression == "ZSTD"
+        assert column.statistics.has_min_max
+        assert pl.read_parquet(output_file).drop("_row_hash").equals(
+            extractor._add_metadata(orders_df)
+        )
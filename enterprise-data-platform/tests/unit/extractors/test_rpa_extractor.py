@@ -0,0 +1,425 @@
+"""
+Unit tests for the Selenium-based RPA extractor.
+
+A fake WebDriver stands in for the browser; the extractor is put in the
+state _connect leaves it in, without starting Chrome.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import os
+import sys
+
+import polars as pl
+import pytest
+
+from extractors import RPAConfig, RPAExtractor
+from extractors import rpa_extractor
+
+
+class FakeElement:
+    """WebElement recording the calls made on it."""
+    
+    def __init__(self, name: str, calls: list):
+        self.name = name
+        self.calls = calls
+    
+    def clear(self) -> None:
+        self.calls.append(("clear", self.name))
+    
+    def send_keys(self, value: str) -> None:
+        self.calls.append(("send_keys", self.name, value))
+    
+    def click(self) -> None:
+        self.calls.append(("click", self.name))
+
+
+class FakeDriver:
+    """WebDriver recording navigation, scripts and CDP commands."""
+    
+    def __init__(self, url: str = "https://wms.test/login"):
+        self.url = url
+        self.url_reads = 0
+        self.calls = []
+    
+    @property
+    def current_url(self) -> str:
+        self.url_reads += 1
+        return self.url
+    
+    def get(self, url: str) -> None:
+        self.calls.append(("get", url))
+        self.url = url
+    
+    def execute_script(self, script: str, *args):
+        self.calls.append(("execute_script", script, *args))
+        return [FakeElement(selector, self.calls) for selector in args]
+    
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.calls.append(("cdp", command, params))
+        return {"identifier": "1", "data": "anBlZw=="}
+    
+    def save_screenshot(self, path: str) -> None:
+        self.calls.append(("save_screenshot", path))
+        Path(path).write_bytes(b"png")
+    
+    def quit(self) -> None:
+        pass
+
+
+class FakeWait:
+    """WebDriverWait resolving conditions to elements immediately."""
+    
+    def __init__(self, driver: FakeDriver):
+        self.driver = driver
+    
+    def until(self, condition):
+        if callable(condition):
+            return condition(self.driver)
+        kind, (by, selector) = condition
+        self.driver.calls.append((kind, by, selector))
+        return FakeElement(selector, self.driver.calls)
+
+
+class FakeSelect:
+    """Select wrapper recording the chosen option."""
+    
+    def __init__(self, element: FakeElement):
+        self.element = element
+    
+    def select_by_visible_text(self, text: str) -> None:
+        self.element.calls.append(("select", self.element.name, text))
+
+
+def _connected(extractor: RPAExtractor) -> FakeDriver:
+    """Give the extractor a fake driver and the names _connect binds."""
+    driver = FakeDriver()
+    extractor._driver = driver
+    extractor._wait = FakeWait(driver)
+    extractor._by_css = "css selector"
+    extractor._ec_clickable = lambda locator: ("clickable", locator)
+    extractor._ec_present = lambda locator: ("present", locator)
+    extractor._select = lambda element: FakeSelect(element)
+    return driver
+
+
+def _config(tmp_path: Path, **kwargs) -> RPAConfig:
+    """RPA config with download and screenshot directories under tmp_path."""
+    return RPAConfig(
+        source_name="wms",
+        target_table="stock_movements",
+        bronze_path=tmp_path / "bronze",
+        download_dir=tmp_path / "downloads",
+        screenshot_dir=tmp_path / "screenshots",
+        **kwargs,
+    )
+
+
+class TestRPASteps:
+    """Tests for executing navigation steps."""
+    
+    def test_steps_compiled_once(self, tmp_path: Path):
+        """Test that steps are normalized at construction and paired with their handlers."""
+        extractor = RPAExtractor(_config(tmp_path, steps=[
+            {"action": "CLICK", "selector": "#export"},
+            {"action": "teleport"},
+        ]))
+        
+        (click, click_handler), (unknown, unknown_handler) = extractor._compiled_steps
+        
+        assert click == rpa_extractor.RPAStep(action="click", selector="#export")
+        assert click.action is sys.intern("click")
+        assert click_handler is RPAExtractor._ACTIONS["click"]
+        assert unknown.action == "teleport"
+        assert unknown_handler is None
+    
+    def test_element_steps_use_bound_selenium_names(self, tmp_path: Path):
+        """Test that click, type and select steps locate elements through the names bound at connect."""
+        extractor = RPAExtractor(_config(tmp_path, steps=[
+            {"action": "click", "selector": "#report", "wait_after": 0},
+            {"action": "type", "selector": "#filter", "value": "A-1", "wait_after": 0},
+            {"action": "select", "selector": "#range", "value": "Yesterday", "wait_after": 0},
+        ]))
+        driver = _connected(extractor)
+        
+        for step, handler in extractor._compiled_steps:
+            extractor._execute_step(step, handler)
+        
+        assert driver.calls == [
+            ("clickable", "css selector", "#report"),
+            ("click", "#report"),
+            ("present", "css selector", "#filter"),
+            ("clear", "#filter"),
+            ("send_keys", "#filter", "A-1"),
+            ("present", "css selector", "#range"),
+            ("select", "#range", "Yesterday"),
+        ]
+    
+    def test_actions_dispatched_case_insensitively(self, tmp_path: Path, caplog: pytest.LogCaptureFixture):
+        """Test that action names are matched in any case and unknown actions are skipped with a warning."""
+        extractor = RPAExtractor(_config(tmp_path, steps=[
+            {"action": "Execute_Script", "value": "window.stop();", "wait_after": 0},
+            {"action": "hover", "selector": "#menu", "wait_after": 0},
+        ]))
+        driver = _connected(extractor)
+        
+        for step, handler in extractor._compiled_steps:
+            extractor._execute_step(step, handler)
+        
+        assert driver.calls == [("execute_script", "window.stop();")]
+        assert "Unknown action: hover" in caplog.text
+    
+    def test_failing_step_retried(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that a failing step is retried max_retries_per_step times, then raises."""
+        sleeps = []
+        monkeypatch.setattr(rpa_extractor, "time", SimpleNamespace(sleep=sleeps.append))
+        extractor = RPAExtractor(_config(tmp_path, max_retries_per_step=3, steps=[
+            {"action": "execute_script", "value": "broken()", "wait_after": 0},
+        ]))
+        driver = _connected(extractor)
+        
+        def execute_script(script: str, *args):
+            driver.calls.append(script)
+            raise RuntimeError("javascript error")
+        
+        driver.execute_script = execute_script
+        step, handler = extractor._compiled_steps[0]
+        
+        with pytest.raises(RuntimeError):
+            extractor._execute_step(step, handler)
+        
+        assert driver.calls == ["broken()"] * 3
+        assert sleeps == [2, 2]
+
+    
+    def test_base_url_read_once(self, tmp_path: Path):
+        """Test that relative navigation reads the browser URL once, and again after an absolute one."""
+        extractor = RPAExtractor(_config(tmp_path, steps=[
+            {"action": "navigate", "value": "/reports", "wait_after": 0},
+            {"action": "navigate", "value": "/reports/stock", "wait_after": 0},
+            {"action": "navigate", "value": "https://other.test/start", "wait_after": 0},
+            {"action": "navigate", "value": "/export", "wait_after": 0},
+        ]))
+        driver = _connected(extractor)
+        
+        for step, handler in extractor._compiled_steps:
+            extractor._execute_step(step, handler)
+        
+        assert driver.calls == [
+            ("get", "https://wms.test/reports"),
+            ("get", "https://wms.test/reports/stock"),
+            ("get", "https://other.test/start"),
+            ("get", "https://other.test/export"),
+        ]
+        assert driver.url_reads == 2
+
+
+class TestDownloads:
+    """Tests for download directory handling and file parsing."""
+    
+    @pytest.fixture
+    def downloads(self, tmp_path: Path) -> Path:
+        """Empty download directory."""
+        path = tmp_path / "downloads"
+        path.mkdir()
+        return path
+    
+    def test_latest_completed_download(self, downloads: Path):
+        """Test that the newest matching file is picked, skipping partial downloads."""
+        for name, mtime in [
+            ("old.xlsx", 100), ("new.xlsx", 200), ("newer.xlsx.crdownload", 300),
+            ("report.csv", 400), ("dir.xlsx", None),
+        ]:
+            path = downloads / name
+            if mtime is None:
+                path.mkdir()
+            else:
+                path.write_bytes(b"x")
+                os.utime(path, (mtime, mtime))
+        
+        assert RPAExtractor._latest_download(downloads, "*.xlsx") == downloads / "new.xlsx"
+    
+    def test_wait_for_download_backs_off(self, tmp_path: Path, downloads: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that polling starts fast and backs off to 2s until the file appears."""
+        sleeps = []
+        
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            if len(sleeps) == 6:
+                (downloads / "report.xlsx").write_bytes(b"x")
+        
+        monkeypatch.setattr(rpa_extractor, "time", SimpleNamespace(sleep=sleep, monotonic=lambda: 0.0))
+        extractor = RPAExtractor(_config(tmp_path))
+        
+        assert extractor._wait_for_download() == downloads / "report.xlsx"
+        assert sleeps == [0.25, 0.5, 1.0, 2.0, 2.0, 2.0]
+    
+    def test_no_completed_download(self, tmp_path: Path, downloads: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that only partial downloads time out the wait with no file."""
+        (downloads / "report.xlsx.crdownload").write_bytes(b"x")
+        clock = iter([0.0, 0.0, 1.0, 2.0])
+        monkeypatch.setattr(rpa_extractor, "time", SimpleNamespace(
+            sleep=lambda seconds: None, monotonic=lambda: next(clock)
+        ))
+        extractor = RPAExtractor(_config(tmp_path, download_wait_timeout=2))
+        
+        assert RPAExtractor._latest_download(downloads, "*.xlsx") is None
+        assert extractor._wait_for_download() is None
+    
+    @pytest.mark.parametrize("n_files", [3, 100])
+    def test_clear_download_dir(self, tmp_path: Path, downloads: Path, n_files: int):
+        """Test that stale files are deleted, serially or in parallel, leaving directories."""
+        for i in range(n_files):
+            (downloads / f"stale_{i}.xlsx").write_bytes(b"x")
+        (downloads / "keep").mkdir()
+        extractor = RPAExtractor(_config(tmp_path))
+        
+        extractor._clear_download_dir()
+        
+        assert [path.name for path in downloads.iterdir()] == ["keep"]
+    
+    def test_excel_parsed_with_calamine(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that Excel downloads are read with the calamine engine."""
+        calls = []
+        
+        def read_excel(path, **kwargs) -> pl.DataFrame:
+            calls.append((path, kwargs))
+            return pl.DataFrame({"sku": ["A-1"]})
+        
+        monkeypatch.setattr(pl, "read_excel", read_excel)
+        extractor = RPAExtractor(_config(tmp_path))
+        
+        df = extractor._parse_downloaded_file(tmp_path / "report.XLSX")
+        
+        assert calls == [(tmp_path / "report.XLSX", {"engine": "calamine"})]
+        assert df["sku"].to_list() == ["A-1"]
+    
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet", ".json"])
+    def test_projection_and_predicate_applied(self, tmp_path: Path, suffix: str):
+        """Test that the configured projection and row filter apply to every scanned format."""
+        source = pl.DataFrame({"sku": ["A-1", "B-2", "C-3"], "qty": [5, -1, 7], "site": ["x", "y", "z"]})
+        path = tmp_path / f"report{suffix}"
+        {".csv": source.write_csv, ".parquet": source.write_parquet, ".json": source.write_json}[suffix](path)
+        extractor = RPAExtractor(_config(
+            tmp_path, projection=["sku", "qty"], predicate=pl.col("qty") > 0
+        ))
+        
+        df = extractor._parse_downloaded_file(path)
+        
+        assert df.rows() == [("A-1", 5), ("C-3", 7)]
+    
+    def test_unsupported_download_format(self, tmp_path: Path):
+        """Test that an unknown file extension is rejected."""
+        extractor = RPAExtractor(_config(tmp_path))
+        
+        with pytest.raises(rpa_extractor.ExtractionError, match="Unsupported file format"):
+            extractor._parse_downloaded_file(tmp_path / "report.txt")
+
+
+class TestLogin:
+    """Tests for logging in to the legacy system."""
+    
+    @pytest.fixture
+    def login_config(self, tmp_path: Path) -> RPAConfig:
+        """Config with login form selectors and credentials."""
+        return _config(
+            tmp_path,
+            login_url="https://wms.test/login",
+            username="etl_bot",
+            password="s3cret",
+        )
+    
+    def test_login_form_filled_in_one_lookup(self, login_config: RPAConfig):
+        """Test that the password field and button are found in a single script call."""
+        extractor = RPAExtractor(login_config)
+        driver = _connected(extractor)
+        
+        extractor._fill_login_form()
+        
+        lookups = [call for call in driver.calls if call[0] == "execute_script"]
+        assert lookups == [(
+            "execute_script",
+            "return [document.querySelector(arguments[0]), document.querySelector(arguments[1])];",
+            "#password",
+            "#login-btn",
+        )]
+        assert driver.calls[-5:] == [
+            ("clear", "#username"),
+            ("send_keys", "#username", "etl_bot"),
+            ("clear", "#password"),
+            ("send_keys", "#password", "s3cret"),
+            ("click", "#login-btn"),
+        ]
+    
+    def test_missing_login_element(self, login_config: RPAConfig):
+        """Test that a login form element the page lacks fails clearly."""
+        extractor = RPAExtractor(login_config)
+        driver = _connected(extractor)
+        driver.execute_script = lambda script, *args: [FakeElement(args[0], driver.calls), None]
+        
+        with pytest.raises(rpa_extractor.ExtractionError, match="#login-btn"):
+            extractor._fill_login_form()
+    
+    def test_fast_login_injects_and_removes_autofill(self, login_config: RPAConfig):
+        """Test that fast login injects the autofill script for one page load, then removes it."""
+        extractor = RPAExtractor(login_config)
+        driver = _connected(extractor)
+        results = []
+        
+        def until(condition):
+            driver.url = "https://wms.test/home"  # The injected script submitted the form
+            results.append(condition(driver))
+        
+        extractor._wait.until = until
+        
+        extractor._autofill_login()
+        
+        (_, add, params), get, (_, remove, removed) = driver.calls
+        assert add == "Page.addScriptToEvaluateOnNewDocument"
+        assert '"username": "etl_bot"' in params["source"]
+        assert '"button": "#login-btn"' in params["source"]
+        assert get == ("get", "https://wms.test/login")
+        assert results == [True]
+        assert (remove, removed) == ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": "1"})
+    
+    def test_fast_login_removes_script_on_timeout(self, login_config: RPAConfig):
+        """Test that credentials are not left injected when the login page never goes away."""
+        extractor = RPAExtractor(login_config)
+        driver = _connected(extractor)
+        
+        def until(condition):
+            raise TimeoutError("still on the login page")
+        
+        extractor._wait.until = until
+        
+        with pytest.raises(TimeoutError):
+            extractor._autofill_login()
+        
+        assert driver.calls[-1][1] == "Page.removeScriptToEvaluateOnNewDocument"
+
+
+class TestScreenshots:
+    """Tests for debugging screenshots."""
+    
+    def test_jpeg_captured_over_cdp(self, tmp_path: Path):
+        """Test that jpeg screenshots come from CDP at the configured quality."""
+        extractor = RPAExtractor(_config(tmp_path, screenshot_quality=40))
+        driver = _connected(extractor)
+        extractor.rpa_config.screenshot_dir.mkdir()
+        
+        path = extractor._take_screenshot("error")
+        
+        assert driver.calls == [("cdp", "Page.captureScreenshot", {"format": "jpeg", "quality": 40})]
+        assert path.suffix == ".jpg"
+        assert path.read_bytes() == b"jpeg"
+    
+    def test_png_saved_by_webdriver(self, tmp_path: Path):
+        """Test that png screenshots still go through save_screenshot."""
+        extractor = RPAExtractor(_config(tmp_path, screenshot_format="png"))
+        driver = _connected(extractor)
+        extractor.rpa_config.screenshot_dir.mkdir()
+        
+        path = extractor._take_screenshot("step")
+        
+        assert driver.calls == [("save_screenshot", str(path))]
+        assert path.suffix == ".png"
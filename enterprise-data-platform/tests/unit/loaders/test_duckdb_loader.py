@@ -0,0 +1,134 @@
+"""
+Unit tests for the DuckDB loader.
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from loaders import DuckDBConfig, DuckDBLoader, QueryError
+
+
+@pytest.fixture
+def loader():
+    """In-memory loader with a small sales table."""
+    with DuckDBLoader(DuckDBConfig(load_extensions=[], threads=1)) as loader:
+        loader.execute(
+            "CREATE TABLE sales AS "
+            "SELECT * FROM (VALUES (1, 'EU', 10.0), (2, 'US', 20.0)) t(id, region, amount)"
+        )
+        yield loader
+
+
+class TestQuery:
+    """Tests for running queries."""
+    
+    def test_repeated_query_prepared_once(self, loader: DuckDBLoader):
+        """Test that a repeated parameterless query reuses one prepared statement."""
+        sql = "SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY region"
+        
+        first = loader.query(sql)
+        second = loader.query(sql)
+        
+        assert first.equals(second)
+        assert first.rows() == [("EU", 10.0), ("US", 20.0)]
+        assert len(loader._prepared) == 1
+        assert loader._prepared[sql] is not None
+    
+    def test_prepared_statements_dropped_on_schema_change(self, loader: DuckDBLoader):
+        """Test that a query prepared before execute() sees the replaced table."""
+        sql = "SELECT * FROM sales ORDER BY id"
+        loader.query(sql)
+        
+        loader.execute("CREATE OR REPLACE TABLE sales AS SELECT 3 AS id, 'APAC' AS region")
+        
+        assert loader.query(sql).rows() == [(3, "APAC")]
+    
+    def test_query_with_params(self, loader: DuckDBLoader):
+        """Test that parameterized queries bind their values without being cached."""
+        df = loader.query("SELECT id FROM sales WHERE region = $region", {"region": "US"})
+        
+        assert df["id"].to_list() == [2]
+        assert loader._prepared == {}
+    
+    def test_prepared_cache_bounded(self):
+        """Test that the least recently used statement is evicted past the cache size."""
+        with DuckDBLoader(DuckDBConfig(load_extensions=[], prepared_cache_size=2)) as loader:
+            for value in (1, 2, 1, 3):
+                assert loader.query(f"SELECT {value} AS v")["v"][0] == value
+            
+            assert list(loader._prepared) == ["SELECT 1 AS v", "SELECT 3 AS v"]
+    
+    def test_multiple_statements_run_unprepared(self, loader: DuckDBLoader):
+        """Test that a script of several statements still runs, without a prepared statement."""
+        df = loader.query("CREATE TEMP TABLE t AS SELECT 1 AS v; SELECT v FROM t")
+        
+        assert df["v"].to_list() == [1]
+        assert list(loader._prepared.values()) == [None]
+    
+    def test_query_error(self, loader: DuckDBLoader):
+        """Test that failing queries raise QueryError."""
+        with pytest.raises(QueryError):
+            loader.query("SELECT * FROM missing_table")
+
+
+class TestExport:
+    """Tests for exporting query results."""
+    
+    def test_export_nested_types_to_parquet(self, loader: DuckDBLoader, tmp_path: Path):
+        """Test that LIST, STRUCT and INTERVAL columns export to Parquet with the chosen codec."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output = tmp_path / "export.parquet"
+        
+        loader.export_to_parquet(
+            "SELECT id, [id, id * 2] AS ids, {'region': region} AS info, "
+            "INTERVAL 2 DAY AS lag FROM sales ORDER BY id",
+            output,
+            compression="zstd",
+        )
+        
+        # Polars cannot read Parquet intervals; DuckDB reads the file back
+        rows = loader.query(
+            "SELECT ids, info.region AS region, datepart('day', lag) AS lag_days "
+            f"FROM read_parquet('{output}')"
+        ).rows()
+        assert rows == [([1, 2], "EU", 2), ([2, 4], "US", 2)]
+        assert pq.ParquetFile(output).metadata.row_group(0).column(0).compression == "ZSTD"
+    
+    def test_export_to_csv(self, loader: DuckDBLoader, tmp_path: Path):
+        """Test that CSV exports write a header and the query's rows."""
+        output = tmp_path / "it's here.csv"
+        
+        loader.export_to_csv("SELECT id, region FROM sales ORDER BY id", output)
+        
+        assert output.read_text().splitlines() == ["id,region", "1,EU", "2,US"]
+
+
+class TestIdentifiers:
+    """Tests for table names and paths spliced into SQL."""
+    
+    def test_quoted_table_name_and_path(self, loader: DuckDBLoader, tmp_path: Path):
+        """Test that names and paths with quotes and spaces are registered and queried safely."""
+        table_dir = tmp_path / "it's data" / "region=EU"
+        table_dir.mkdir(parents=True)
+        pl.DataFrame({"id": [1, 2, 3]}).write_parquet(table_dir / "part.parquet")
+        name = 'daily "sales"; DROP TABLE sales'
+        
+        loader.register_parquet_table(name, tmp_path / "it's data")
+        
+        assert loader.get_table_stats(name)["row_count"] == 3
+        assert loader.get_table_info(name)["column_name"].to_list() == ["id", "region"]
+        assert loader.query("SELECT COUNT(*) AS n FROM sales")["n"][0] == 2  # Still there
+    
+    def test_quoted_aggregate_name(self, loader: DuckDBLoader):
+        """Test that aggregate tables and views accept names needing quotes."""
+        loader.create_aggregate_table(
+            "sales by region", "SELECT region, SUM(amount) AS total FROM sales GROUP BY region"
+        )
+        loader.create_aggregate_table(
+            "sales-total", "SELECT SUM(amount) AS total FROM sales", materialize=True
+        )
+        
+        assert loader.query('SELECT total FROM "sales-total"')["total"][0] == 30.0
+        assert loader.get_table_stats("sales by region")["row_count"] == 2
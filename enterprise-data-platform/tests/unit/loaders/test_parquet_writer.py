@@ -0,0 +1,182 @@
+"""
+Unit tests for the lakehouse Parquet writer.
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from loaders import ParquetWriter, ParquetWriterConfig, WriteError
+
+
+def _writer(tmp_path: Path, **kwargs) -> ParquetWriter:
+    """Writer for an inventory table under tmp_path."""
+    return ParquetWriter(ParquetWriterConfig(target_path=tmp_path, table_name="inventory", **kwargs))
+
+
+@pytest.fixture
+def inventory_df() -> pl.DataFrame:
+    """Stock levels across two regions."""
+    return pl.DataFrame({
+        "sku": ["A-1", "B-2", "C-3", "D-4"],
+        "region": ["EU", "EU", "US", "US"],
+        "qty": [5, 7, 9, 11],
+    })
+
+
+
+class TestWrite:
+    """Tests for full writes."""
+    
+    def test_write_stats(self, tmp_path: Path, inventory_df: pl.DataFrame):
+        """Test that file and byte counts cover every Parquet file in nested partitions, and nothing else."""
+        writer = _writer(tmp_path, partition_by=["region", "sku"])
+        writer.write(inventory_df)
+        (tmp_path / "inventory" / "_SUCCESS").write_text("")
+        
+        writer._calculate_write_stats(tmp_path / "inventory")
+        
+        files = list((tmp_path / "inventory").rglob("*.parquet"))
+        assert writer.metadata.files_written == len(files) == 4
+        assert writer.metadata.bytes_written == sum(path.stat().st_size for path in files)
+        assert writer.metadata.records_written == 4
+
+
+class TestAppend:
+    """Tests for appending to a partitioned table."""
+    
+    def test_append_adds_files_per_partition(self, tmp_path: Path, inventory_df: pl.DataFrame):
+        """Test that each append adds new files to the Hive partitions, keeping earlier ones."""
+        writer = _writer(tmp_path, partition_by=["region"])
+        
+        writer.append(inventory_df)
+        writer.append(inventory_df.with_columns(pl.col("qty") + 100))
+        
+        table_dir = tmp_path / "inventory"
+        assert sorted(path.name for path in table_dir.iterdir()) == ["region=EU", "region=US"]
+        assert len(list((table_dir / "region=EU").glob("*.parquet"))) == 2
+        # Partition values live only in the directory names
+        assert "region" not in pl.read_parquet(next(table_dir.rglob("*.parquet"))).columns
+        
+        df = pl.read_parquet(table_dir / "**/*.parquet", hive_partitioning=True)
+        assert df.height == 8
+        assert sorted(df.filter(pl.col("region") == "US")["qty"].to_list()) == [9, 11, 109, 111]
+    
+    def test_append_requires_partitioning(self, tmp_path: Path, inventory_df: pl.DataFrame):
+        """Test that appending to an unpartitioned table is refused."""
+        with pytest.raises(WriteError, match="requires partitioning"):
+            _writer(tmp_path).append(inventory_df)
+
+
+class TestMerge:
+    """Tests for merging (upserting) into an existing table."""
+    
+    @pytest.fixture
+    def changes_df(self) -> pl.DataFrame:
+        """An update to B-2 and a new SKU."""
+        return pl.DataFrame({"sku": ["B-2", "E-5"], "region": ["EU", "EU"], "qty": [70, 13]})
+    
+    def test_merge_single_file(self, tmp_path: Path, inventory_df: pl.DataFrame, changes_df: pl.DataFrame):
+        """Test that a merge updates matches, inserts new keys, and swaps the result in."""
+        writer = _writer(tmp_path)
+        writer.write(inventory_df)
+        
+        output = writer.merge(changes_df, on=["sku"])
+        
+        merged = pl.read_parquet(output).sort("sku")
+        assert merged.select("sku", "qty").rows() == [
+            ("A-1", 5), ("B-2", 70), ("C-3", 9), ("D-4", 11), ("E-5", 13),
+        ]
+        assert writer.metadata.records_written == 5
+        assert writer.metadata.files_written == 1
+        assert [path.name for path in tmp_path.iterdir()] == ["inventory"]  # No staging left
+    
+    def test_merge_appended_partitions(self, tmp_path: Path, inventory_df: pl.DataFrame, changes_df: pl.DataFrame):
+        """Test that appended partitions merge with their values read back from directory names."""
+        writer = _writer(tmp_path, partition_by=["region"])
+        writer.append(inventory_df)
+        
+        writer.merge(changes_df, on=["sku"])
+        
+        merged = pl.read_parquet(tmp_path / "inventory" / "**/*.parquet", hive_partitioning=True)
+        assert merged.sort("sku").select("sku", "region", "qty").rows() == [
+            ("A-1", "EU", 5), ("B-2", "EU", 70), ("C-3", "US", 9), ("D-4", "US", 11), ("E-5", "EU", 13),
+        ]
+    
+    def test_merge_into_missing_table_writes(self, tmp_path: Path, changes_df: pl.DataFrame):
+        """Test that merging into a table that does not exist yet just writes the data."""
+        writer = _writer(tmp_path)
+        
+        output = writer.merge(changes_df, on=["sku"])
+        
+        assert pl.read_parquet(output).equals(changes_df)
+    
+    def test_merge_requires_columns(self, tmp_path: Path, changes_df: pl.DataFrame):
+        """Test that a merge without key columns is refused."""
+        with pytest.raises(WriteError, match="Merge columns not specified"):
+            _writer(tmp_path).merge(changes_df)
+    
+    def test_failed_swap_restores_old_table(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, inventory_df: pl.DataFrame, changes_df: pl.DataFrame):
+        """Test that the old table is put back when moving the merged one into place fails."""
+        writer = _writer(tmp_path)
+        writer.write(inventory_df)
+        rename = Path.rename
+        renames = []
+        
+        def failing_rename(self: Path, target: Path) -> Path:
+            renames.append(self)
+            if len(renames) == 2:
+                raise OSError("rename failed")
+            return rename(self, target)
+        
+        monkeypatch.setattr(Path, "rename", failing_rename)
+        
+        with pytest.raises(WriteError, match="rename failed"):
+            writer.merge(changes_df, on=["sku"])
+        
+        assert pl.read_parquet(tmp_path / "inventory" / "data.parquet").equals(inventory_df)
+        assert [path.name for path in tmp_path.iterdir()] == ["inventory"]
+    
+    def test_failed_cleanup_keeps_merge(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, inventory_df: pl.DataFrame, changes_df: pl.DataFrame):
+        """Test that failing to remove the old table copy does not fail the merge."""
+        writer = _writer(tmp_path)
+        writer.write(inventory_df)
+        
+        def failing_rmtree(path, *args, **kwargs) -> None:
+            raise OSError("rmtree failed")
+        
+        monkeypatch.setattr("shutil.rmtree", failing_rmtree)
+        
+        output = writer.merge(changes_df, on=["sku"])
+        
+        assert writer.metadata.status == "success"
+        assert pl.read_parquet(output).height == 5
+    
+    def test_key_range_filter(self):
+        """Test that the pruning filter keeps keys within the new data's range per column."""
+        new = pl.DataFrame(
+            {"id": [10, 20], "site": ["b", "d"], "batch": [None, None]},
+            schema_overrides={"batch": pl.Int64},
+        )
+        existing = pl.DataFrame({
+            "id": [5, 10, 15, 20, 25, 15],
+            "site": ["c", "c", "c", "c", "c", "e"],
+            "batch": [1, 2, 3, 4, 5, 6],
+        })
+        
+        predicate = ParquetWriter._key_range_filter(new, ["id", "site", "batch"])
+        
+        # batch has no bounds (all null) so it does not filter
+        assert existing.filter(predicate)["id"].to_list() == [10, 15, 20]
+    
+    def test_merge_outside_key_range_untouched(self, tmp_path: Path):
+        """Test that pruning by key range never drops or changes rows outside it."""
+        writer = _writer(tmp_path, row_group_size=10)
+        writer.write(pl.DataFrame({"id": list(range(100)), "qty": [0] * 100}))
+        
+        writer.merge(pl.DataFrame({"id": [40, 41, 500], "qty": [1, 1, 1]}), on=["id"])
+        
+        merged = pl.read_parquet(tmp_path / "inventory" / "data.parquet").sort("id")
+        assert merged["id"].to_list() == [*range(100), 500]
+        assert merged.filter(pl.col("qty") == 1)["id"].to_list() == [40, 41, 500]